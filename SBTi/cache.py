@@ -0,0 +1,275 @@
+"""
+This module provides an opt-in cache for the results of the temperature score, for applications that calculate the same
+portfolio with the same settings over and over again (e.g. a dashboard). A result is stored under a hash of everything
+it depends on: the contents of the input data, the settings and reference data of the temperature score and the version
+of the package. Changing any of these gives a different key, so the cache never has to be invalidated, results that
+aren't used anymore are simply evicted.
+
+The results are kept in memory as pickles, up to a maximum total size, evicting the least recently used results first.
+Optionally, the results are written to a directory as well, so they survive a restart and can be shared between
+processes. The directory isn't limited in size, it's up to the application to clean it up. The results in the
+directory are unpickled when they're read, which can execute arbitrary code, so it must be a trusted directory that only
+the application itself can write to.
+
+    cache = ResultCache(max_size=512 * 2 ** 20, directory="/var/cache/sbti")
+    temperature_score = TemperatureScore(time_frames=..., scopes=..., cache=cache)
+"""
+import collections
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import pandas as pd
+
+# The default maximum total size of the results in memory, in bytes
+DEFAULT_MAX_SIZE = 256 * 2**20
+CACHE_EXTENSION = ".pkl"
+PACKAGE_NAME = "sbti-finance-tool"
+
+T = TypeVar("T")
+
+
+def hash_frame(data: pd.DataFrame) -> str:
+    """
+    Hash the contents of a data frame, i.e. its columns, dtypes, index and values. The values are hashed by pandas, row
+    by row, which is a lot faster than pickling the frame.
+
+    :param data: The data frame to hash
+    :return: The hash of the data frame
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(data.columns.tolist()).encode("utf-8"))
+    digest.update(repr(data.dtypes.astype(str).tolist()).encode("utf-8"))
+    try:
+        rows = pd.util.hash_pandas_object(data, index=True)
+    except TypeError:
+        # Values that can't be factorized (e.g. dictionaries) are hashed one by one
+        rows = pd.util.hash_pandas_object(data, index=True, categorize=False)
+    digest.update(rows.values.tobytes())
+    return digest.hexdigest()
+
+
+def get_constants(config: type) -> Dict[str, Any]:
+    """
+    Get the constants of a config class (including the ones it inherits), i.e. its upper case attributes. The constants
+    of nested config classes (e.g. the columns) are included as well.
+
+    :param config: The config class
+    :return: The constants of the config class, by name
+    """
+    constants = {}
+    for name in dir(config):
+        if name.isupper():
+            value = getattr(config, name)
+            constants[name] = get_constants(value) if isinstance(value, type) else value
+    return constants
+
+
+@functools.lru_cache(maxsize=None)
+def get_package_version() -> Optional[str]:
+    """
+    Get the version of the installed package, so results that were calculated by another version of the package (e.g.
+    in a shared directory) get a different key.
+
+    :return: The version of the package (None if it isn't installed, e.g. when it's used from a checkout)
+    """
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        # Python 3.7 doesn't have importlib.metadata yet
+        import pkg_resources
+
+        try:
+            return pkg_resources.get_distribution(PACKAGE_NAME).version
+        except pkg_resources.DistributionNotFound:
+            return None
+    try:
+        return version(PACKAGE_NAME)
+    except PackageNotFoundError:
+        return None
+
+
+def get_key(*parts: Any) -> str:
+    """
+    Get the key of a result from everything it depends on. Data frames are hashed by their contents (see hash_frame),
+    config classes by their constants (see get_constants) and anything else by its representation.
+
+    :param parts: Everything the result depends on
+    :return: The key of the result
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            text = hash_frame(part)
+        elif isinstance(part, type):
+            text = repr(get_constants(part))
+        else:
+            text = repr(part)
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    A cache of results, which keeps the most recently used results in memory and optionally stores all results in a
+    directory. Every result is pickled when it's stored, so callers always get their own copy of a cached result.
+
+    :param max_size: The maximum total size of the pickled results in memory, in bytes
+    :param directory: The directory to store the results in as well, which must be trusted because the results are
+    unpickled when they're read (None to only keep them in memory)
+    """
+
+    def __init__(
+        self, max_size: int = DEFAULT_MAX_SIZE, directory: Optional[str] = None
+    ):
+        self.max_size = max_size
+        self.directory = directory
+        self.logger = logging.getLogger(__name__)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._results: "collections.OrderedDict[str, bytes]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a result from memory or, if it isn't in memory anymore, from the directory.
+
+        :param key: The key of the result, see get_key
+        :return: A copy of the result (None if it isn't cached)
+        """
+        with self._lock:
+            pickled = self._results.get(key)
+            if pickled is not None:
+                self._results.move_to_end(key)
+        if pickled is None and self.directory is not None:
+            pickled = self._read(key)
+            if pickled is not None:
+                self._store(key, pickled)
+
+        if pickled is not None:
+            try:
+                result = pickle.loads(pickled)
+            except Exception as e:
+                # E.g. a result that was stored by another version of the package
+                self.logger.warning(
+                    "Couldn't load the cached result {}: {}".format(key, e)
+                )
+                with self._lock:
+                    self.size -= len(self._results.pop(key, b""))
+            else:
+                self.hits += 1
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: Any):
+        """
+        Store a result in memory and, if there's a directory, on disk.
+
+        :param key: The key of the result, see get_key
+        :param result: The result to store
+        """
+        pickled = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self._store(key, pickled)
+        if self.directory is not None:
+            self._write(key, pickled)
+
+    def cached(self, key: str, calculate: Callable[[], T]) -> T:
+        """
+        Get a result from the cache, calculating and storing it if it isn't cached yet.
+
+        :param key: The key of the result, see get_key
+        :param calculate: A function that calculates the result
+        :return: The result
+        """
+        result = self.get(key)
+        if result is None:
+            result = calculate()
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        """
+        Remove all results from memory. The results in the directory are kept.
+        """
+        with self._lock:
+            self._results.clear()
+            self.size = 0
+
+    def _store(self, key: str, pickled: bytes):
+        """
+        Store a pickled result in memory, evicting the least recently used results until the results fit. A result
+        that's larger than the maximum size isn't kept in memory at all.
+
+        :param key: The key of the result
+        :param pickled: The pickled result
+        """
+        with self._lock:
+            previous = self._results.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            if len(pickled) > self.max_size:
+                return
+            self._results[key] = pickled
+            self.size += len(pickled)
+            while self.size > self.max_size:
+                _, evicted = self._results.popitem(last=False)
+                self.size -= len(evicted)
+
+    def _get_path(self, key: str) -> str:
+        """
+        Get the path of a result in the directory.
+
+        :param key: The key of the result
+        :return: The path of the result
+        """
+        return os.path.join(self.directory, key + CACHE_EXTENSION)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        """
+        Read a pickled result from the directory.
+
+        :param key: The key of the result
+        :return: The pickled result (None if it isn't in the directory or it can't be read)
+        """
+        path = self._get_path(key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError as e:
+            self.logger.warning(
+                "Couldn't read the cached result {}: {}".format(path, e)
+            )
+            return None
+
+    def _write(self, key: str, pickled: bytes):
+        """
+        Write a pickled result to the directory. The result is written to a temporary file first, so other processes
+        never read a partially written result.
+
+        :param key: The key of the result
+        :param pickled: The pickled result
+        """
+        try:
+            handle, temporary_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(handle, "wb") as f:
+                f.write(pickled)
+            os.replace(temporary_path, self._get_path(key))
+        except OSError as e:
+            self.logger.warning(
+                "Couldn't write the cached result {}: {}".format(key, e)
+            )
@@ -0,0 +1,10 @@
+"""
+Compile the bundled reference data (see SBTi.reference_data) into files that are faster to read than the Excel files.
+
+Usage: python -m SBTi.compile_reference_data
+"""
+from SBTi.reference_data import compile_tables
+
+if __name__ == "__main__":
+    for compiled_path in compile_tables():
+        print("Compiled {}".format(compiled_path))
@@ -101,6 +101,13 @@ class TemperatureScoreConfig(PortfolioAggregationConfig):
 
     DEFAULT_INDUSTRY = "Others"
 
+    # The number of highest contributors (per time frame and scope) that are engaged in the highest contributors
+    # scenario
+    NUMBER_TOP_CONTRIBUTORS = 10
+
+    # The number of hexadecimal characters of the salted hash that anonymized company names are made of
+    ANONYMIZED_HASH_LENGTH = 16
+
     VALUE_TARGET_REFERENCE_ABSOLUTE = "absolute"
     VALUE_TARGET_REFERENCE_INTENSITY = "intensity"
     VALUE_TARGET_REFERENCE_INTENSITY_BASE = "int"
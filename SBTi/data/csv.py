@@ -1,9 +1,13 @@
-from typing import List
+from typing import List, Optional
 from pydantic import ValidationError
+import hashlib
+import io
 import logging
 
 import pandas as pd
+from SBTi import cache
 from SBTi.data.data_provider import DataProvider
+from SBTi.configs import ColumnsConfig
 from SBTi.interfaces import IDataProviderCompany, IDataProviderTarget
 
 
@@ -16,8 +20,17 @@ class CSVProvider(DataProvider):
 
     def __init__(self, path: str, path_targets: str, encoding: str = "utf-8"):
         super().__init__()
-        self.data = pd.read_csv(path, encoding=encoding)
-        self.data_targets = pd.read_csv(path_targets, encoding=encoding)
+        # The files are hashed as they're read, so the data version always belongs to the data in memory
+        with open(path, "rb") as f:
+            content = f.read()
+        with open(path_targets, "rb") as f:
+            content_targets = f.read()
+        self.data = pd.read_csv(io.BytesIO(content), encoding=encoding)
+        self.data_targets = pd.read_csv(io.BytesIO(content_targets), encoding=encoding)
+        self._data_version = cache.get_key(
+            hashlib.sha256(content).hexdigest(),
+            hashlib.sha256(content_targets).hexdigest(),
+        )
 
     def get_targets(self, company_ids: list) -> List[IDataProviderTarget]:
         """
@@ -33,6 +46,18 @@ class CSVProvider(DataProvider):
         ]
         return model_targets
 
+    def get_targets_frame(self, company_ids: list) -> pd.DataFrame:
+        """
+        Get all relevant targets for a list of company ids (ISIN) as a data frame. The rows are not validated, this is
+        done by TargetProtocol.process_frames.
+
+        :param company_ids: A list of company IDs (ISINs)
+        :return: A data frame containing the targets
+        """
+        return self.data_targets[
+            self.data_targets[ColumnsConfig.COMPANY_ID].isin(company_ids)
+        ]
+
     def _target_df_to_model(self, df_targets):
         """
         transforms target Dataframe into list of IDataProviderTarget instances
@@ -71,6 +96,25 @@ class CSVProvider(DataProvider):
         ]
         return model_companies
 
+    def get_company_data_frame(self, company_ids: list) -> pd.DataFrame:
+        """
+        Get all relevant data for a list of company ids (ISIN) as a data frame. The rows are not validated, this is done
+        by TargetProtocol.process_frames.
+
+        :param company_ids: A list of company IDs (ISINs)
+        :return: A data frame containing the company data
+        """
+        return self.data[self.data[ColumnsConfig.COMPANY_ID].isin(company_ids)]
+
+    def get_data_version(self) -> Optional[str]:
+        """
+        Get the version of the data of this provider, i.e. a hash of the contents of the files when they were read. The
+        files are only read once, so the provider has to be created again to pick up changes to the files.
+
+        :return: The version of the data
+        """
+        return self._data_version
+
     def get_sbti_targets(self, companies: list) -> list:
         """
         For each of the companies, get the status of their target (Target set, Committed or No target) as it's known to
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
+
+import pandas as pd
 
 from SBTi.interfaces import IDataProviderCompany, IDataProviderTarget
 
@@ -39,6 +41,44 @@ class DataProvider(ABC):
         """
         raise NotImplementedError
 
+    def get_targets_frame(self, company_ids: List[str]) -> pd.DataFrame:
+        """
+        Get all relevant targets for a list of company ids (ISIN) as a data frame, with the fields of
+        IDataProviderTarget as columns. Data providers that hold their data in a data frame can override this to skip
+        the conversion to models.
+
+        :param company_ids: A list of company IDs (ISINs)
+        :return: A data frame containing the targets
+        """
+        return pd.DataFrame.from_records(
+            [target.dict() for target in self.get_targets(company_ids)],
+            columns=list(IDataProviderTarget.__fields__),
+        )
+
+    def get_company_data_frame(self, company_ids: List[str]) -> pd.DataFrame:
+        """
+        Get all relevant data for a list of company ids (ISIN) as a data frame, with the fields of IDataProviderCompany
+        as columns. Data providers that hold their data in a data frame can override this to skip the conversion to
+        models.
+
+        :param company_ids: A list of company IDs (ISINs)
+        :return: A data frame containing the company data
+        """
+        return pd.DataFrame.from_records(
+            [company.dict() for company in self.get_company_data(company_ids)],
+            columns=list(IDataProviderCompany.__fields__),
+        )
+
+    def get_data_version(self) -> Optional[str]:
+        """
+        Get the version of the data of this provider, which changes whenever the data changes (e.g. a release date or
+        a hash of the contents). Scores that were calculated from the same version of the data can be reused, see
+        SBTi.universe. Data providers that can't tell whether their data changed return None.
+
+        :return: The version of the data (None if it's unknown)
+        """
+        return None
+
     @abstractmethod
     def get_sbti_targets(self, companies: list) -> list:
         """
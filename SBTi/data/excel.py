@@ -1,5 +1,7 @@
-from typing import Type, List
+from typing import Type, List, Optional
 from pydantic import ValidationError
+import hashlib
+import io
 import logging
 
 import pandas as pd
@@ -17,8 +19,12 @@ class ExcelProvider(DataProvider):
 
     def __init__(self, path: str, config: Type[ColumnsConfig] = ColumnsConfig):
         super().__init__()
-        self.data = pd.read_excel(path, sheet_name=None, skiprows=0)
+        # The file is hashed as it's read, so the data version always belongs to the data in memory
+        with open(path, "rb") as f:
+            content = f.read()
+        self.data = pd.read_excel(io.BytesIO(content), sheet_name=None, skiprows=0)
         self.c = config
+        self._data_version = hashlib.sha256(content).hexdigest()
 
     def get_targets(self, company_ids: List[str]) -> List[IDataProviderTarget]:
         """
@@ -34,6 +40,17 @@ class ExcelProvider(DataProvider):
         ]
         return model_targets
 
+    def get_targets_frame(self, company_ids: List[str]) -> pd.DataFrame:
+        """
+        Get all relevant targets for a list of company ids (ISIN) as a data frame. The rows are not validated, this is
+        done by TargetProtocol.process_frames.
+
+        :param company_ids: A list of company IDs (ISINs)
+        :return: A data frame containing the targets
+        """
+        data_targets = self.data["target_data"]
+        return data_targets[data_targets[self.c.COMPANY_ID].isin(company_ids)]
+
     def _target_df_to_model(self, df_targets):
         """
         transforms target Dataframe into list of IDataProviderTarget instances
@@ -73,6 +90,26 @@ class ExcelProvider(DataProvider):
         ]
         return model_companies
 
+    def get_company_data_frame(self, company_ids: List[str]) -> pd.DataFrame:
+        """
+        Get all relevant data for a list of company ids (ISIN) as a data frame. The rows are not validated, this is done
+        by TargetProtocol.process_frames.
+
+        :param company_ids: A list of company IDs (ISINs)
+        :return: A data frame containing the company data
+        """
+        data_company = self.data["fundamental_data"]
+        return data_company[data_company[self.c.COMPANY_ID].isin(company_ids)]
+
+    def get_data_version(self) -> Optional[str]:
+        """
+        Get the version of the data of this provider, i.e. a hash of the contents of the file when it was read. The file
+        is only read once, so the provider has to be created again to pick up changes to the file.
+
+        :return: The version of the data
+        """
+        return self._data_version
+
     def get_sbti_targets(self, companies: list) -> list:
         """
         For each of the companies, get the status of their target (Target set, Committed or No target) as it's known to
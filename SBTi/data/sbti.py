@@ -1,7 +1,8 @@
-from typing import List, Type
+from typing import List, Optional, Type
 
 import pandas as pd
 
+from SBTi import reference_data
 from SBTi.configs import PortfolioCoverageTVPConfig
 from SBTi.interfaces import IDataProviderCompany
 
@@ -15,7 +16,32 @@ class SBTi:
         self, config: Type[PortfolioCoverageTVPConfig] = PortfolioCoverageTVPConfig
     ):
         self.c = config
-        self.targets = pd.read_excel(self.c.FILE_TARGETS)
+        # Whether a company has a validated target, indexed by ISIN. This is shared with other instances through the
+        # reference data cache, so the targets file is only read and indexed once.
+        self.validated: pd.Series = reference_data.get_sbti_validated(self.c)
+        self._targets: Optional[pd.DataFrame] = None
+
+    @property
+    def targets(self) -> pd.DataFrame:
+        """
+        All targets in the SBTi targets file. They're only copied from the reference data cache on first use, after
+        that the same frame is returned. Assigning other targets indexes their validation status again.
+
+        :return: The SBTi targets
+        """
+        if self._targets is None:
+            self._targets = reference_data.get_table(self.c.FILE_TARGETS)
+        return self._targets
+
+    @targets.setter
+    def targets(self, targets: pd.DataFrame):
+        self._targets = targets
+        self.validated = reference_data.index_sbti_validated(
+            targets,
+            self.c.COL_COMPANY_ISIN,
+            self.c.COL_TARGET_STATUS,
+            self.c.VALUE_TARGET_SET,
+        )
 
     def get_sbti_targets(
         self, companies: List[IDataProviderCompany], isin_map: dict
@@ -27,14 +53,12 @@ class SBTi:
         :param isin_map: A map from company id to ISIN
         :return: A list of IDataProviderCompany instances, supplemented with the SBTi information
         """
-        for company in companies:
-            targets = self.targets[
-                self.targets[self.c.COL_COMPANY_ISIN]
-                == isin_map.get(company.company_id)
-            ]
-            if len(targets) > 0:
-                company.sbti_validated = (
-                    self.c.VALUE_TARGET_SET in targets[self.c.COL_TARGET_STATUS].values
-                )
+        validated = pd.Series(
+            [isin_map.get(company.company_id) for company in companies], dtype=object
+        ).map(self.validated)
+        for company, company_validated in zip(companies, validated):
+            # Companies that aren't in the SBTi targets file keep their status
+            if pd.notnull(company_validated):
+                company.sbti_validated = bool(company_validated)
 
         return companies
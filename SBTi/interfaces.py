@@ -1,5 +1,6 @@
+from collections.abc import Sequence
 from enum import Enum
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 
 import pandas as pd
 from pydantic import BaseModel, validator, Field
@@ -16,10 +17,154 @@ class AggregationContribution(BaseModel):
         return getattr(self, item)
 
 
+class AggregationContributions(Sequence):
+    """
+    The contributions of an aggregation, from the highest to the lowest relative contribution. The contributions are
+    kept as a data frame, they're only sorted and parsed into AggregationContribution instances once they're used.
+    Slicing or concatenating the contributions gives a regular list.
+
+    :param contributions: The (unsorted) contributions, one row per company with the fields of an
+    AggregationContribution
+    :param top_n: Only keep the contributions of the n companies with the highest relative contribution (None to keep all
+    contributions)
+    """
+
+    def __init__(self, contributions: pd.DataFrame, top_n: Optional[int] = None):
+        self._frame: Optional[pd.DataFrame] = contributions
+        self._top_n = top_n
+        self._contributions: List[AggregationContribution] = []
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(
+        cls, value
+    ) -> Union["AggregationContributions", List[AggregationContribution]]:
+        """
+        Validate the contributions of an aggregation. Lazy contributions and data frames are kept lazy, any other
+        contributions are parsed into a list of AggregationContribution instances.
+
+        :param value: The contributions, as AggregationContributions, a data frame or a list
+        :return: The contributions
+        """
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, pd.DataFrame):
+            return cls(value)
+        return [
+            AggregationContribution.parse_obj(contribution) for contribution in value
+        ]
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: dict):
+        field_schema.update(type="array", items=AggregationContribution.schema())
+
+    def to_list(self) -> List[AggregationContribution]:
+        """
+        Get the contributions as a list, parsing them on first use. The contributions are sorted by their relative
+        contribution (highest first) and companies with the same contribution by their company id. A top n only sorts
+        the highest contributions (including the ties at the n-th place) instead of all of them.
+
+        :return: The contributions
+        """
+        if self._frame is not None:
+            contributions = self._frame
+            if self._top_n is not None:
+                contributions = contributions.nlargest(
+                    self._top_n, "contribution_relative", keep="all"
+                )
+            contributions = contributions.sort_values(
+                ["contribution_relative", "company_id"], ascending=[False, True]
+            )
+            if self._top_n is not None:
+                contributions = contributions.head(self._top_n)
+            self._contributions = [
+                AggregationContribution.parse_obj(contribution)
+                for contribution in contributions.where(
+                    pd.notnull(contributions), None
+                ).to_dict(orient="records")
+            ]
+            self._frame = None
+        return self._contributions
+
+    def __getitem__(self, item):
+        return self.to_list()[item]
+
+    def __len__(self) -> int:
+        return len(self.to_list())
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __add__(self, other):
+        return self.to_list() + list(other)
+
+    def __radd__(self, other):
+        return list(other) + self.to_list()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (AggregationContributions, list, tuple)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.to_list())
+
+
 class Aggregation(BaseModel):
     score: float
     proportion: float
-    contributions: List[AggregationContribution]
+    contributions: AggregationContributions
+
+    class Config:
+        json_encoders = {
+            AggregationContributions: lambda contributions: [
+                contribution.dict() for contribution in contributions
+            ]
+        }
+
+    @classmethod
+    def from_frame(
+        cls,
+        score: float,
+        proportion: float,
+        contributions: pd.DataFrame,
+        top_n: Optional[int] = None,
+    ) -> "Aggregation":
+        """
+        Create an aggregation with lazy contributions.
+
+        :param score: The aggregated score
+        :param proportion: The proportion of the companies in the aggregation
+        :param contributions: The (unsorted) contributions, one row per company with the fields of an
+        AggregationContribution
+        :param top_n: Only keep the contributions of the n companies with the highest relative contribution (None to keep
+        all contributions)
+        :return: The aggregation
+        """
+        return cls(
+            score=score,
+            proportion=proportion,
+            contributions=AggregationContributions(contributions, top_n),
+        )
+
+    def dict(self, **kwargs) -> dict:
+        """
+        Turn the aggregation into a dictionary, with the lazy contributions parsed into a list of dictionaries like any
+        other list of models.
+        """
+        data = super().dict(**kwargs)
+        if isinstance(data.get("contributions"), AggregationContributions):
+            data["contributions"] = [
+                contribution.dict(
+                    by_alias=kwargs.get("by_alias", False),
+                    exclude_none=kwargs.get("exclude_none", False),
+                )
+                for contribution in data["contributions"]
+            ]
+        return data
 
     def __getitem__(self, item):
         return getattr(self, item)
@@ -94,31 +239,45 @@ class IDataProviderCompany(BaseModel):
 
 
 class SortableEnum(Enum):
+    def __init__(self, *args):
+        # The position of the member in its enum, which defines the sort order
+        self.ordinal = len(self.__class__._member_names_)
+
+    # The members are singletons that are compared by identity, so they can be hashed by identity as well. Enum hashes
+    # the name of the member in Python, which pandas would call for every value it hashes (e.g. in a groupby or isin).
+    __hash__ = object.__hash__
+
     def __str__(self):
         return self.name
 
+    @classmethod
+    def get_dtype(cls) -> pd.CategoricalDtype:
+        """
+        Get a categorical dtype with the members as ordered categories. A column of this dtype still holds the members,
+        but it's filtered, compared, grouped and sorted on integer codes rather than on the members themselves.
+
+        :return: The categorical dtype of the enum
+        """
+        return pd.CategoricalDtype(list(cls), ordered=True)
+
     def __ge__(self, other):
         if self.__class__ is other.__class__:
-            order = list(self.__class__)
-            return order.index(self) >= order.index(other)
+            return self.ordinal >= other.ordinal
         return NotImplemented
 
     def __gt__(self, other):
         if self.__class__ is other.__class__:
-            order = list(self.__class__)
-            return order.index(self) > order.index(other)
+            return self.ordinal > other.ordinal
         return NotImplemented
 
     def __le__(self, other):
         if self.__class__ is other.__class__:
-            order = list(self.__class__)
-            return order.index(self) <= order.index(other)
+            return self.ordinal <= other.ordinal
         return NotImplemented
 
     def __lt__(self, other):
         if self.__class__ is other.__class__:
-            order = list(self.__class__)
-            return order.index(self) < order.index(other)
+            return self.ordinal < other.ordinal
         return NotImplemented
 
 
@@ -1,6 +1,6 @@
 from abc import ABC
 from enum import Enum
-from typing import Type
+from typing import List, Optional, Type
 
 import pandas as pd
 from .configs import PortfolioAggregationConfig, ColumnsConfig
@@ -74,126 +74,192 @@ class PortfolioAggregation(ABC):
         :param column: The column to check
         :return:
         """
-        missing_data = data[pd.isnull(data[column])][self.c.COLS.COMPANY_NAME].unique()
-        if len(missing_data):
+        self._check_columns(data, [column])
+
+    def _check_columns(self, data: pd.DataFrame, columns: List[str]):
+        """
+        Check if certain columns are filled for all companies. If not throw an error that lists all missing values.
+
+        :param data: The data to check
+        :param columns: The columns to check
+        :return:
+        """
+        missing = data[columns].isnull()
+        if not missing.values.any():
+            return
+
+        messages = []
+        for column in missing.columns[missing.any()]:
+            missing_data = data.loc[missing[column], self.c.COLS.COMPANY_NAME].unique()
             if column == self.c.COLS.GHG_SCOPE12 or column == self.c.COLS.GHG_SCOPE3:
-                raise ValueError(
+                messages.append(
                     "A value for {} is needed for all aggregation methods except for TETS. \nSo please try to estimate appropriate values or remove these companies from the aggregation calculation: {}".format(
                         column, ", ".join(missing_data)
                     )
                 )
             else:
-                raise ValueError(
+                messages.append(
                     "The value for {} is missing for the following companies: {}".format(
                         column, ", ".join(missing_data)
                     )
                 )
+        raise ValueError("\n".join(messages))
 
-    def _calculate_aggregate_score(
+    def _calculate_weights(
         self,
         data: pd.DataFrame,
-        input_column: str,
+        portfolio_aggregation_methods: List[PortfolioAggregationMethod],
+    ) -> pd.DataFrame:
+        """
+        Calculate the quantities that the scores are weighted with, for each company and for several aggregation methods
+        at once. The scope masks and the emissions in scope are shared by the methods, so they're only calculated once.
+        The weights of any subset of the companies can be passed to _weigh_scores.
+
+        :param data: The data to run the calculations on
+        :param portfolio_aggregation_methods: The methods to calculate the weights for
+        :return: A data frame with the same index as the data, with the weights of every method
+        """
+        invalid_methods = [
+            method
+            for method in portfolio_aggregation_methods
+            if method != PortfolioAggregationMethod.WATS
+            and method != PortfolioAggregationMethod.TETS
+            and not PortfolioAggregationMethod.is_emissions_based(method)
+        ]
+        if len(invalid_methods) > 0:
+            raise ValueError("The specified portfolio aggregation method is invalid")
+
+        weights = pd.DataFrame(index=data.index)
+        if PortfolioAggregationMethod.WATS in portfolio_aggregation_methods:
+            weights[self.c.COLS.INVESTMENT_VALUE] = data[self.c.COLS.INVESTMENT_VALUE]
+        if portfolio_aggregation_methods == [PortfolioAggregationMethod.WATS]:
+            return weights
+
+        use_S1S2 = (data[self.c.COLS.SCOPE] == EScope.S1S2) | (
+            data[self.c.COLS.SCOPE] == EScope.S1S2S3
+        )
+        use_S3 = (data[self.c.COLS.SCOPE] == EScope.S3) | (
+            data[self.c.COLS.SCOPE] == EScope.S1S2S3
+        )
+        required_columns = []
+        if use_S1S2.any():
+            required_columns.append(self.c.COLS.GHG_SCOPE12)
+        if use_S3.any():
+            required_columns.append(self.c.COLS.GHG_SCOPE3)
+
+        # The value columns of the emissions based methods, these four methods only differ in the way the company is
+        # valued.
+        value_columns = {}
+        for method in portfolio_aggregation_methods:
+            if PortfolioAggregationMethod.is_emissions_based(method):
+                value_columns[method] = PortfolioAggregationMethod.get_value_column(
+                    method, self.c.COLS
+                )
+                if method == PortfolioAggregationMethod.ECOTS:
+                    required_columns += [
+                        self.c.COLS.COMPANY_ENTERPRISE_VALUE,
+                        self.c.COLS.CASH_EQUIVALENTS,
+                    ]
+                else:
+                    required_columns.append(value_columns[method])
+        if len(value_columns) > 0:
+            required_columns.append(self.c.COLS.INVESTMENT_VALUE)
+        self._check_columns(data, list(dict.fromkeys(required_columns)))
+
+        # The emissions in scope of each company
+        weights[EScope.S1S2.value] = use_S1S2 * data[self.c.COLS.GHG_SCOPE12]
+        weights[EScope.S3.value] = use_S3 * data[self.c.COLS.GHG_SCOPE3]
+        if PortfolioAggregationMethod.ECOTS in value_columns:
+            data[self.c.COLS.COMPANY_EV_PLUS_CASH] = (
+                data[self.c.COLS.COMPANY_ENTERPRISE_VALUE]
+                + data[self.c.COLS.CASH_EQUIVALENTS]
+            )
+        # The owned emissions of each company
+        for method, value_column in value_columns.items():
+            weights[method.value] = (
+                data[self.c.COLS.INVESTMENT_VALUE] / data[value_column]
+            ) * (weights[EScope.S1S2.value] + weights[EScope.S3.value])
+        return weights
+
+    def _get_totals(self, values: pd.Series, groups: Optional[pd.Series]):
+        """
+        Sum values over all companies, or over the group of each company.
+
+        :param values: The values to sum
+        :param groups: The group of each company (None to sum over all companies)
+        :return: The total, or a series with the total of the group of each company
+        """
+        if groups is None:
+            return values.sum()
+        return values.groupby(groups).transform("sum")
+
+    def _weigh_scores(
+        self,
+        weights: pd.DataFrame,
+        scores: pd.Series,
         portfolio_aggregation_method: PortfolioAggregationMethod,
+        groups: Optional[pd.Series] = None,
     ) -> pd.Series:
         """
-        Aggregate the scores in a given column based on a certain portfolio aggregation method.
+        Weigh the scores of a set of companies, based on their weights (see _calculate_weights). When the companies are
+        grouped, each group is weighed as if it were a portfolio on its own.
 
-        :param data: The data to run the calculations on
-        :param input_column: The input column (containing the scores)
+        :param weights: The weights of the companies
+        :param scores: The scores of the companies
         :param portfolio_aggregation_method: The method to use
-        :return: The aggregates score
+        :param groups: The group of each company (None to weigh all companies together)
+        :return: The weighted scores
         """
         if portfolio_aggregation_method == PortfolioAggregationMethod.WATS:
-            total_investment_weight = data[self.c.COLS.INVESTMENT_VALUE].sum()
-            try:
-                return data.apply(
-                    lambda row: (row[self.c.COLS.INVESTMENT_VALUE] * row[input_column])
-                    / total_investment_weight,
-                    axis=1,
-                )
-            except ZeroDivisionError:
-                raise ValueError("The portfolio weight is not allowed to be zero")
+            total_investment_weight = self._get_totals(
+                weights[self.c.COLS.INVESTMENT_VALUE], groups
+            )
+            return (
+                weights[self.c.COLS.INVESTMENT_VALUE] * scores
+            ) / total_investment_weight
 
         # Total emissions weighted temperature score (TETS)
         elif portfolio_aggregation_method == PortfolioAggregationMethod.TETS:
-            use_S1S2 = (data[self.c.COLS.SCOPE] == EScope.S1S2) | (
-                data[self.c.COLS.SCOPE] == EScope.S1S2S3
-            )
-            use_S3 = (data[self.c.COLS.SCOPE] == EScope.S3) | (
-                data[self.c.COLS.SCOPE] == EScope.S1S2S3
-            )
-            if use_S3.any():
-                self._check_column(data, self.c.COLS.GHG_SCOPE3)
-            if use_S1S2.any():
-                self._check_column(data, self.c.COLS.GHG_SCOPE12)
             # Calculate the total emissions of all companies
-            emissions = (use_S1S2 * data[self.c.COLS.GHG_SCOPE12]).sum() + (
-                use_S3 * data[self.c.COLS.GHG_SCOPE3]
-            ).sum()
-            try:
-                return (
-                    (
-                        use_S1S2 * data[self.c.COLS.GHG_SCOPE12]
-                        + use_S3 * data[self.c.COLS.GHG_SCOPE3]
-                    )
-                    / emissions
-                    * data[input_column]
-                )
-            except ZeroDivisionError:
-                raise ValueError("The total emissions should be higher than zero")
-
-        elif PortfolioAggregationMethod.is_emissions_based(
-            portfolio_aggregation_method
-        ):
-            # These four methods only differ in the way the company is valued.
-            if portfolio_aggregation_method == PortfolioAggregationMethod.ECOTS:
-                self._check_column(data, self.c.COLS.COMPANY_ENTERPRISE_VALUE)
-                self._check_column(data, self.c.COLS.CASH_EQUIVALENTS)
-                data[self.c.COLS.COMPANY_EV_PLUS_CASH] = (
-                    data[self.c.COLS.COMPANY_ENTERPRISE_VALUE]
-                    + data[self.c.COLS.CASH_EQUIVALENTS]
-                )
-
-            value_column = PortfolioAggregationMethod.get_value_column(
-                portfolio_aggregation_method, self.c.COLS
+            emissions = self._get_totals(
+                weights[EScope.S1S2.value], groups
+            ) + self._get_totals(weights[EScope.S3.value], groups)
+            return (
+                (weights[EScope.S1S2.value] + weights[EScope.S3.value])
+                / emissions
+                * scores
             )
 
-            # Calculate the total owned emissions of all companies
-            try:
-                self._check_column(data, self.c.COLS.INVESTMENT_VALUE)
-                self._check_column(data, value_column)
-                use_S1S2 = (data[self.c.COLS.SCOPE] == EScope.S1S2) | (
-                    data[self.c.COLS.SCOPE] == EScope.S1S2S3
-                )
-                use_S3 = (data[self.c.COLS.SCOPE] == EScope.S3) | (
-                    data[self.c.COLS.SCOPE] == EScope.S1S2S3
-                )
-                if use_S1S2.any():
-                    self._check_column(data, self.c.COLS.GHG_SCOPE12)
-                if use_S3.any():
-                    self._check_column(data, self.c.COLS.GHG_SCOPE3)
-                data[self.c.COLS.OWNED_EMISSIONS] = (
-                    data[self.c.COLS.INVESTMENT_VALUE] / data[value_column]
-                ) * (
-                    use_S1S2 * data[self.c.COLS.GHG_SCOPE12]
-                    + use_S3 * data[self.c.COLS.GHG_SCOPE3]
-                )
-            except ZeroDivisionError:
-                raise ValueError(
-                    "To calculate the aggregation, the {} column may not be zero".format(
-                        value_column
-                    )
-                )
-            owned_emissions = data[self.c.COLS.OWNED_EMISSIONS].sum()
-
-            try:
-                # Calculate the MOTS value per company
-                return data.apply(
-                    lambda row: (row[self.c.COLS.OWNED_EMISSIONS] / owned_emissions)
-                    * row[input_column],
-                    axis=1,
-                )
-            except ZeroDivisionError:
-                raise ValueError("The total owned emissions can not be zero")
         else:
-            raise ValueError("The specified portfolio aggregation method is invalid")
+            # Calculate the total owned emissions of all companies
+            owned_emissions = self._get_totals(
+                weights[portfolio_aggregation_method.value], groups
+            )
+
+            # Calculate the MOTS value per company
+            return (
+                weights[portfolio_aggregation_method.value] / owned_emissions
+            ) * scores
+
+    def _calculate_aggregate_score(
+        self,
+        data: pd.DataFrame,
+        input_column: str,
+        portfolio_aggregation_method: PortfolioAggregationMethod,
+    ) -> pd.Series:
+        """
+        Aggregate the scores in a given column based on a certain portfolio aggregation method.
+
+        :param data: The data to run the calculations on
+        :param input_column: The input column (containing the scores)
+        :param portfolio_aggregation_method: The method to use
+        :return: The aggregates score
+        """
+        weights = self._calculate_weights(data, [portfolio_aggregation_method])
+        if PortfolioAggregationMethod.is_emissions_based(portfolio_aggregation_method):
+            data[self.c.COLS.OWNED_EMISSIONS] = weights[
+                portfolio_aggregation_method.value
+            ]
+        return self._weigh_scores(
+            weights, data[input_column], portfolio_aggregation_method
+        )
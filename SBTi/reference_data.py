@@ -0,0 +1,275 @@
+"""
+This module caches the reference data (the regression model, the SR15 mapping and the SBTi targets) for the whole
+process. The files are only parsed once for each combination of path and modification time, so creating a new
+temperature score or SBTi data provider doesn't have to read them again. Callers always get a copy, so they can't change
+the cached tables.
+
+The Excel files are the source of truth, but parsing them is slow. They can be compiled into pickles next to the Excel
+files (e.g. before building the package). A compiled file stores the content hash of the Excel file it was compiled
+from, and it's only read instead of the Excel file as long as that hash still matches (modification times aren't
+reliable, e.g. a checkout or a copy can make a stale compiled file look more recent):
+
+    python -m SBTi.compile_reference_data
+"""
+import functools
+import hashlib
+import logging
+import os
+import pickle
+from typing import Iterable, List, Optional, Tuple, Type
+
+import pandas as pd
+
+from SBTi.configs import PortfolioCoverageTVPConfig, TemperatureScoreConfig
+
+COMPILED_EXTENSION = ".pkl"
+
+
+def get_compiled_path(path: str) -> str:
+    """
+    Get the path of the compiled version of a reference table.
+
+    :param path: The path to the Excel file
+    :return: The path to the compiled file
+    """
+    return os.path.splitext(path)[0] + COMPILED_EXTENSION
+
+
+def get_source_hash(path: str) -> str:
+    """
+    Get the content hash of an Excel file, which the compiled file is checked against.
+
+    :param path: The path to the Excel file
+    :return: The SHA-256 hash of the file
+    """
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _get_version(path: str) -> Tuple[float, Optional[float]]:
+    """
+    Get the version of a reference table, i.e. the modification times of the Excel file and the compiled file.
+
+    :param path: The path to the Excel file
+    :return: The modification times of the Excel file and the compiled file (None if it hasn't been compiled)
+    """
+    compiled_path = get_compiled_path(path)
+    return (
+        os.path.getmtime(path),
+        os.path.getmtime(compiled_path) if os.path.isfile(compiled_path) else None,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _get_source_hash(path: str, version: Tuple[float, Optional[float]]) -> str:
+    """
+    Get the content hash of a reference table. The version is part of the cache key, so a changed file is hashed again.
+
+    :param path: The path to the Excel file
+    :param version: The modification times of the Excel file and the compiled file
+    :return: The SHA-256 hash of the file
+    """
+    return get_source_hash(path)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_table(path: str, version: Tuple[float, Optional[float]]) -> pd.DataFrame:
+    """
+    Read a reference table, from the compiled file if it was compiled from the current content of the Excel file. The
+    version is part of the cache key, so a changed file is read again.
+
+    :param path: The path to the Excel file
+    :param version: The modification times of the Excel file and the compiled file
+    :return: The table
+    """
+    _, compiled_mtime = version
+    if compiled_mtime is not None:
+        try:
+            with open(get_compiled_path(path), "rb") as f:
+                source_hash, table = pickle.load(f)
+            if source_hash == get_source_hash(path):
+                return table
+            logging.getLogger(__name__).info(
+                "The compiled version of {} is out of date, reading the Excel file instead".format(
+                    path
+                )
+            )
+        except Exception as e:
+            # E.g. a pickle of another pandas version, the Excel file still has the data
+            logging.getLogger(__name__).warning(
+                "Couldn't read the compiled version of {}, reading the Excel file instead: {}".format(
+                    path, e
+                )
+            )
+    return pd.read_excel(path, header=0)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_regression_model(
+    path: str, version: Tuple[float, Optional[float]], model: int, model_column: str
+) -> pd.DataFrame:
+    """
+    Read the regression parameters of a single model.
+
+    :param path: The path to the regression model summary
+    :param version: The modification times of the Excel file and the compiled file
+    :param model: The number of the regression model
+    :param model_column: The name of the column that holds the model number
+    :return: The regression parameters of the model
+    """
+    regression_model = _read_table(path, version)
+    return regression_model[regression_model[model_column] == model]
+
+
+@functools.lru_cache(maxsize=32)
+def _read_sbti_validated(
+    path: str,
+    version: Tuple[float, Optional[float]],
+    isin_column: str,
+    status_column: str,
+    value_target_set: str,
+) -> pd.Series:
+    """
+    Read whether the companies in the SBTi targets file have a validated target.
+
+    :param path: The path to the SBTi targets file
+    :param version: The modification times of the Excel file and the compiled file
+    :param isin_column: The name of the column that holds the ISIN
+    :param status_column: The name of the column that holds the target status
+    :param value_target_set: The target status of a validated target
+    :return: Whether a company has a validated target, indexed by ISIN
+    """
+    return index_sbti_validated(
+        _read_table(path, version), isin_column, status_column, value_target_set
+    )
+
+
+def index_sbti_validated(
+    targets: pd.DataFrame, isin_column: str, status_column: str, value_target_set: str
+) -> pd.Series:
+    """
+    Index whether the companies in a table of SBTi targets have a validated target.
+
+    :param targets: The SBTi targets
+    :param isin_column: The name of the column that holds the ISIN
+    :param status_column: The name of the column that holds the target status
+    :param value_target_set: The target status of a validated target
+    :return: Whether a company has a validated target, indexed by ISIN
+    """
+    return (
+        (targets[status_column] == value_target_set).groupby(targets[isin_column]).any()
+    )
+
+
+def get_table(path: str) -> pd.DataFrame:
+    """
+    Get a reference table from the cache, reading it if it isn't cached yet (or if the file changed).
+
+    :param path: The path to the Excel file
+    :return: A copy of the table
+    """
+    return _read_table(path, _get_version(path)).copy()
+
+
+def get_table_version(path: str) -> str:
+    """
+    Get the version of a reference table, i.e. the content hash of its Excel file, without reading the table. The hash
+    is cached as long as the file doesn't change.
+
+    :param path: The path to the Excel file
+    :return: The SHA-256 hash of the file
+    """
+    return _get_source_hash(path, _get_version(path))
+
+
+def get_regression_model(
+    path: str, model: int, model_column: str = TemperatureScoreConfig.COLS.MODEL
+) -> pd.DataFrame:
+    """
+    Get the regression parameters of a model from the cache, reading them if they aren't cached yet (or if the file
+    changed).
+
+    :param path: The path to the regression model summary
+    :param model: The number of the regression model
+    :param model_column: The name of the column that holds the model number
+    :return: A copy of the regression parameters of the model
+    """
+    return _read_regression_model(path, _get_version(path), model, model_column).copy()
+
+
+def get_sbti_validated(
+    config: Type[PortfolioCoverageTVPConfig] = PortfolioCoverageTVPConfig,
+) -> pd.Series:
+    """
+    Get whether the companies in the SBTi targets file have a validated target (i.e. at least one of their targets has
+    been set), reading the file if it isn't cached yet (or if the file changed).
+
+    :param config: The config that defines the SBTi targets file and its columns
+    :return: A copy of the validation status of the companies, indexed by ISIN
+    """
+    return _read_sbti_validated(
+        config.FILE_TARGETS,
+        _get_version(config.FILE_TARGETS),
+        config.COL_COMPANY_ISIN,
+        config.COL_TARGET_STATUS,
+        config.VALUE_TARGET_SET,
+    ).copy()
+
+
+def preload(
+    config: Type[TemperatureScoreConfig] = TemperatureScoreConfig,
+    models: Optional[Iterable[int]] = None,
+    tvp_config: Type[PortfolioCoverageTVPConfig] = PortfolioCoverageTVPConfig,
+):
+    """
+    Read all reference data up front, e.g. when a server starts, so the first request doesn't have to wait for it.
+
+    :param config: The temperature score config that defines the regression model and SR15 mapping files
+    :param models: The regression models to load (None to only load model 4, the default model)
+    :param tvp_config: The config that defines the SBTi targets file
+    """
+    for model in models if models is not None else [4]:
+        get_regression_model(
+            config.FILE_REGRESSION_MODEL_SUMMARY, model, config.COLS.MODEL
+        )
+    get_table(config.FILE_SR15_MAPPING)
+    get_sbti_validated(tvp_config)
+
+
+def compile_tables(
+    config: Type[TemperatureScoreConfig] = TemperatureScoreConfig,
+    tvp_config: Type[PortfolioCoverageTVPConfig] = PortfolioCoverageTVPConfig,
+) -> List[str]:
+    """
+    Compile the reference tables into pickles, which are faster to read than the Excel files. Each pickle holds the
+    content hash of its Excel file and the table.
+
+    :param config: The temperature score config that defines the regression model and SR15 mapping files
+    :param tvp_config: The config that defines the SBTi targets file
+    :return: The paths of the compiled files
+    """
+    compiled_paths = []
+    for path in [
+        config.FILE_REGRESSION_MODEL_SUMMARY,
+        config.FILE_SR15_MAPPING,
+        tvp_config.FILE_TARGETS,
+    ]:
+        compiled_path = get_compiled_path(path)
+        with open(compiled_path, "wb") as f:
+            pickle.dump(
+                (get_source_hash(path), pd.read_excel(path, header=0)),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        compiled_paths.append(compiled_path)
+    return compiled_paths
+
+
+def clear():
+    """
+    Remove all reference data from the cache.
+    """
+    _get_source_hash.cache_clear()
+    _read_regression_model.cache_clear()
+    _read_sbti_validated.cache_clear()
+    _read_table.cache_clear()
@@ -0,0 +1,178 @@
+"""
+This module packs the results of the temperature score into dense arrays, with the axes company, time frame, scope and
+scenario. Slicing the cube is a matter of indexing, rather than filtering the long data frame of the calculate method
+for every time frame, scope and scenario, and aggregating a portfolio against the cube is a weighted dot product.
+"""
+from typing import Dict, Hashable, List, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from .configs import TemperatureScoreConfig
+from .interfaces import EScope, ETimeFrames
+
+NO_SCENARIO = (None, None)
+
+
+class ScoreCube:
+    """
+    The temperature scores and temperature results (the share of a score that's the fallback score) of a set of
+    companies, indexed by company, time frame, scope and scenario.
+
+    :param company_ids: The company ID of each position on the company axis
+    :param time_frames: The time frame of each position on the time frame axis
+    :param scopes: The scope of each position on the scope axis
+    :param scenarios: The scenario of each position on the scenario axis, labelled like the results of
+    TemperatureScore.calculate_scenarios
+    :param scores: The temperature scores (NaN where a company doesn't have a score)
+    :param results: The temperature results (NaN where a company doesn't have a score)
+    :param mask: Whether a company has a score, i.e. whether it's part of the aggregations
+    """
+
+    def __init__(
+        self,
+        company_ids: pd.Index,
+        time_frames: List[ETimeFrames],
+        scopes: List[EScope],
+        scenarios: List[Hashable],
+        scores: np.ndarray,
+        results: np.ndarray,
+        mask: np.ndarray,
+    ):
+        self.company_ids = company_ids
+        self.time_frames = time_frames
+        self.scopes = scopes
+        self.scenarios = scenarios
+        self.scores = scores
+        self.results = results
+        self.mask = mask
+
+    @classmethod
+    def from_scores(
+        cls,
+        scores: Dict[Hashable, pd.DataFrame],
+        time_frames: List[ETimeFrames],
+        scopes: List[EScope],
+        config: Type[TemperatureScoreConfig] = TemperatureScoreConfig,
+    ) -> "ScoreCube":
+        """
+        Pack the results of the calculate method into a cube. Each company should have (at most) one score per time
+        frame, scope and scenario, scores of other time frames and scopes are left out.
+
+        :param scores: The results of the calculate method, by scenario (e.g. {NO_SCENARIO: scores})
+        :param time_frames: The time frames of the cube
+        :param scopes: The scopes of the cube
+        :param config: The config that defines the columns of the results
+        :return: The score cube
+        """
+        company_ids = pd.Index(
+            pd.unique(
+                np.concatenate(
+                    [
+                        scenario_scores[config.COLS.COMPANY_ID].values
+                        for scenario_scores in scores.values()
+                    ]
+                )
+            )
+        )
+        shape = (len(company_ids), len(time_frames), len(scopes), len(scores))
+        cube_scores = np.full(shape, np.nan)
+        cube_results = np.full(shape, np.nan)
+        mask = np.zeros(shape, dtype=bool)
+        for scenario, scenario_scores in enumerate(scores.values()):
+            companies = company_ids.get_indexer(scenario_scores[config.COLS.COMPANY_ID])
+            scenario_time_frames = (
+                scenario_scores[config.COLS.TIME_FRAME]
+                .astype(pd.CategoricalDtype(time_frames))
+                .cat.codes.values
+            )
+            scenario_scopes = (
+                scenario_scores[config.COLS.SCOPE]
+                .astype(pd.CategoricalDtype(scopes))
+                .cat.codes.values
+            )
+            selected = (scenario_time_frames >= 0) & (scenario_scopes >= 0)
+            position = (
+                companies[selected],
+                scenario_time_frames[selected],
+                scenario_scopes[selected],
+                scenario,
+            )
+            cube_scores[position] = scenario_scores[
+                config.COLS.TEMPERATURE_SCORE
+            ].values[selected]
+            cube_results[position] = scenario_scores[config.TEMPERATURE_RESULTS].values[
+                selected
+            ]
+            mask[position] = True
+        return cls(
+            company_ids,
+            time_frames,
+            scopes,
+            list(scores),
+            cube_scores,
+            cube_results,
+            mask,
+        )
+
+    def get_position(
+        self,
+        time_frame: ETimeFrames,
+        scope: EScope,
+        scenario: Hashable = NO_SCENARIO,
+    ) -> Tuple[int, int, int]:
+        """
+        Get the position of a time frame, scope and scenario on their axes.
+
+        :param time_frame: The time frame
+        :param scope: The scope
+        :param scenario: The scenario, labelled like the results of TemperatureScore.calculate_scenarios
+        :return: The positions on the time frame, scope and scenario axes
+        """
+        return (
+            self.time_frames.index(time_frame),
+            self.scopes.index(scope),
+            self.scenarios.index(scenario),
+        )
+
+    def get_scores(
+        self,
+        time_frame: ETimeFrames,
+        scope: EScope,
+        scenario: Hashable = NO_SCENARIO,
+    ) -> pd.Series:
+        """
+        Get the temperature scores of a time frame, scope and scenario.
+
+        :param time_frame: The time frame
+        :param scope: The scope
+        :param scenario: The scenario, labelled like the results of TemperatureScore.calculate_scenarios
+        :return: The scores of the companies that have a score, indexed by company ID
+        """
+        time_frame, scope, scenario = self.get_position(time_frame, scope, scenario)
+        mask = self.mask[:, time_frame, scope, scenario]
+        return pd.Series(
+            self.scores[mask, time_frame, scope, scenario],
+            index=self.company_ids[mask],
+        )
+
+    def aggregate(self, weights: pd.Series, results: bool = False) -> np.ndarray:
+        """
+        Aggregate the scores of a portfolio, weighing the score of each company by its share of the total weight of the
+        companies that have a score. With the investment values as weights, this is the weighted average temperature
+        score (WATS).
+
+        :param weights: The weight of each company in the portfolio, indexed by company ID. Companies that aren't in
+        the cube are left out.
+        :param results: Whether to aggregate the temperature results instead of the scores, i.e. the influence
+        percentages (as a fraction)
+        :return: The aggregated scores, an array with the dimensions time frame, scope and scenario (NaN if no company
+        in the portfolio has a score)
+        """
+        weights = weights.groupby(level=0).sum().reindex(self.company_ids, fill_value=0)
+        values = np.where(self.mask, self.results if results else self.scores, 0.0)
+        # Like the sums of the aggregate_scores method, missing scores are skipped in the numerator only
+        total_scores = np.einsum("c,ctsn->tsn", weights.values, np.nan_to_num(values))
+        total_weights = np.einsum("c,ctsn->tsn", weights.values, self.mask)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total_weights != 0, total_scores / total_weights, np.nan)
@@ -1,10 +1,14 @@
 import datetime
 import itertools
 
+import numpy as np
 import pandas as pd
-from typing import Type, List, Tuple, Optional
+from typing import Type, List, Tuple, Optional, Dict
 from SBTi.configs import PortfolioAggregationConfig
 import logging
+from enum import Enum
+
+from pydantic import BaseModel
 
 from SBTi.interfaces import (
     IDataProviderTarget,
@@ -19,14 +23,27 @@ class TargetProtocol:
     This class validates the targets, to make sure that only active, useful targets are considered. It then combines the targets with company-related data into a dataframe where there's one row for each of the nine possible target types (short, mid, long * S1+S2, S3, S1+S2+S3). This class follows the procedures outlined by the target protocol that is a part of the "Temperature Rating Methodology" (2020), which has been created by CDP Worldwide and WWF International.
 
     :param config: A Portfolio aggregation config
+    :param vectorized: Whether to prepare and select the targets with column operations on data frames (the default) or
+                    target by target. Both produce the same grid, the target by target implementation is kept as a
+                    reference.
+    :param sparse: Whether to return a sparse grid. A sparse grid only contains the cells of the 9-box grid for which a
+                    target was selected, plus one row per company without a time frame and scope that holds the
+                    company data. The temperature score expands it to the full grid for the time frames and scopes it
+                    calculates.
     """
 
     def __init__(
-        self, config: Type[PortfolioAggregationConfig] = PortfolioAggregationConfig
+        self,
+        config: Type[PortfolioAggregationConfig] = PortfolioAggregationConfig,
+        vectorized: bool = True,
+        sparse: bool = False,
     ):
         self.c = config
+        self.vectorized = vectorized
+        self.sparse = sparse
         self.logger = logging.getLogger(__name__)
         self.s2_targets: List[IDataProviderTarget] = []
+        self.s2_index: Dict[tuple, List[IDataProviderTarget]] = {}
         self.target_data: pd.DataFrame = pd.DataFrame()
         self.company_data: pd.DataFrame = pd.DataFrame()
         self.data: pd.DataFrame = pd.DataFrame()
@@ -41,26 +58,141 @@ class TargetProtocol:
         :param companies: A list of companies
         :return: A data frame that combines the processed data
         """
-        # Create multiindex on company, timeframe and scope for performance later on
-        targets = self.prepare_targets(targets)
-        self.target_data = pd.DataFrame.from_records([c.dict() for c in targets])
+        if self.vectorized:
+            self.target_data = self.prepare_targets_vectorized(
+                pd.DataFrame.from_records(
+                    [target.dict() for target in targets],
+                    columns=list(IDataProviderTarget.__fields__),
+                )
+            )
+        else:
+            targets = self.prepare_targets(targets)
+            self.target_data = pd.DataFrame.from_records([c.dict() for c in targets])
+
+            # Create multiindex on company, timeframe and scope for performance later on
+            self.target_data.index = (
+                self.target_data.reset_index()
+                .set_index(
+                    [self.c.COLS.COMPANY_ID, self.c.COLS.TIME_FRAME, self.c.COLS.SCOPE]
+                )
+                .index
+            )
+            self.target_data = self.target_data.sort_index()
+
+        self.company_data = pd.DataFrame.from_records([c.dict() for c in companies])
+        self.group_targets()
+        return pd.merge(
+            left=self.data, right=self.company_data, how="outer", on=["company_id"]
+        )
+
+    def process_frames(
+        self, target_data: pd.DataFrame, company_data: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Process the targets and companies from data frames, without converting them to models first. The columns should
+        align with the attribute names of the IDataProviderTarget and IDataProviderCompany models. The schema is
+        validated column by column, invalid targets are skipped (as the data providers do), invalid companies raise an
+        error.
 
-        # Create an indexed DF for performance purposes
-        self.target_data.index = (
-            self.target_data.reset_index()
-            .set_index(
-                [self.c.COLS.COMPANY_ID, self.c.COLS.TIME_FRAME, self.c.COLS.SCOPE]
+        :param target_data: A data frame with one target per row
+        :param company_data: A data frame with one company per row
+        :return: A data frame that combines the processed data
+        """
+        target_data, valid_targets = self._validate_frame(
+            target_data, IDataProviderTarget
+        )
+        if not valid_targets.all():
+            self.logger.warning(
+                "%d target(s) are invalid and will be skipped, these belong to the companies: %s"
+                % (
+                    (~valid_targets).sum(),
+                    ", ".join(
+                        target_data.loc[~valid_targets, self.c.COLS.COMPANY_ID]
+                        .astype(str)
+                        .unique()
+                    ),
+                )
             )
-            .index
+        company_data, valid_companies = self._validate_frame(
+            company_data, IDataProviderCompany
         )
-        self.target_data = self.target_data.sort_index()
+        if not valid_companies.all():
+            raise ValueError(
+                "The data of the following companies is invalid: {}".format(
+                    ", ".join(
+                        company_data.loc[~valid_companies, self.c.COLS.COMPANY_ID]
+                        .astype(str)
+                        .unique()
+                    )
+                )
+            )
 
-        self.company_data = pd.DataFrame.from_records([c.dict() for c in companies])
+        self.target_data = self.prepare_targets_vectorized(target_data[valid_targets])
+        self.company_data = company_data.reset_index(drop=True)
         self.group_targets()
         return pd.merge(
             left=self.data, right=self.company_data, how="outer", on=["company_id"]
         )
 
+    def _validate_frame(
+        self, data: pd.DataFrame, model: Type[BaseModel]
+    ) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Validate a data frame against the fields of a model, one column at a time. The values are converted to the type
+        of the field, missing optional columns are added with their default value and other columns are dropped.
+
+        :param data: The data frame to validate
+        :param model: The model that describes a single row
+        :return: The converted data frame and a mask that is True for the rows that are valid
+        """
+        missing_columns = [
+            name
+            for name, field in model.__fields__.items()
+            if field.required and name not in data.columns
+        ]
+        if len(missing_columns) > 0:
+            raise ValueError(
+                "The following columns are missing: {}".format(
+                    ", ".join(missing_columns)
+                )
+            )
+
+        valid = pd.Series(True, index=data.index)
+        columns = {}
+        for name, field in model.__fields__.items():
+            if name not in data.columns:
+                columns[name] = pd.Series([field.default] * len(data), index=data.index)
+                continue
+
+            column = data[name]
+            if issubclass(field.type_, Enum):
+                members = {member.value: member for member in field.type_}
+                members.update({member: member for member in field.type_})
+                converted = column.map(members)
+            elif field.type_ in (int, float):
+                column = column.replace({"": None, "nan": None})
+                converted = pd.to_numeric(column, errors="coerce")
+            elif field.type_ == bool:
+                converted = column.map({True: True, False: False})
+            else:
+                # Like the models, convert every value (NaN included) to a string and only treat None as missing, so
+                # notna can't be used here
+                converted = column.astype(str).where(
+                    column.map(lambda value: value is not None), None
+                )
+
+            # Values that couldn't be converted are invalid
+            valid &= converted.notnull() | column.isnull()
+            if not field.allow_none and converted.isnull().any():
+                if not field.required:
+                    converted = converted.where(converted.notnull(), field.default)
+                elif field.type_ != float:
+                    # Missing floats are accepted as NaN, like the models do
+                    valid &= converted.notnull()
+            columns[name] = converted
+
+        return pd.DataFrame(columns, index=data.index), valid
+
     def validate(self, target: IDataProviderTarget) -> bool:
         """
         Validate a target, meaning it should:
@@ -138,6 +270,23 @@ class TargetProtocol:
         else:
             return target, None
 
+    @staticmethod
+    def _s1_s2_key(target: IDataProviderTarget) -> tuple:
+        """
+        Get the attributes on which an S1 and an S2 target should match to be combined.
+
+        :param target: The target
+        :return: A tuple that can be used as a key in the S2 index
+        """
+        return (
+            target.company_id,
+            target.base_year,
+            target.start_year,
+            target.end_year,
+            target.target_type,
+            target.intensity_metric,
+        )
+
     def _combine_s1_s2(self, target: IDataProviderTarget):
         """
         Check if there is an S2 target that matches this target exactly (if this is a S1 target) and combine them into one target.
@@ -146,16 +295,8 @@ class TargetProtocol:
         :return: The combined target (or the original if no combining was required)
         """
         if target.scope == EScope.S1 and not pd.isnull(target.base_year_ghg_s1):
-            matches = [
-                t
-                for t in self.s2_targets
-                if t.company_id == target.company_id
-                and t.base_year == target.base_year
-                and t.start_year == target.start_year
-                and t.end_year == target.end_year
-                and t.target_type == target.target_type
-                and t.intensity_metric == target.intensity_metric
-            ]
+            # Copy the list, so the sort below doesn't change the order in the index
+            matches = list(self.s2_index.get(self._s1_s2_key(target), []))
             if len(matches) > 0:
                 matches.sort(key=lambda t: t.coverage_s2, reverse=True)
                 s2 = matches[0]
@@ -279,6 +420,10 @@ class TargetProtocol:
                 targets,
             )
         )
+        # Index the S2 targets on the attributes they're matched on, so every S1 target only looks at its own matches
+        self.s2_index = {}
+        for s2_target in self.s2_targets:
+            self.s2_index.setdefault(self._s1_s2_key(s2_target), []).append(s2_target)
 
         targets = list(
             filter(
@@ -289,6 +434,289 @@ class TargetProtocol:
 
         return targets
 
+    def validate_vectorized(self, target_data: pd.DataFrame) -> pd.Series:
+        """
+        Validate all targets in a data frame at once, following the same rules as validate. Like validate, this fills
+        out a missing start year with the base year.
+
+        :param target_data: The targets, one per row
+        :return: A boolean mask that is True for the valid targets
+        """
+        target_type = (
+            target_data[self.c.COLS.TARGET_REFERENCE_NUMBER].astype(str).str.lower()
+        )
+        intensity_metric = target_data[self.c.COLS.INTENSITY_METRIC]
+        # Only absolute targets or intensity targets with a valid intensity metric are allowed.
+        valid_type = target_type.str.contains("abs", regex=False) | (
+            target_type.str.contains("int", regex=False)
+            & intensity_metric.notnull()
+            & (intensity_metric.astype(str).str.lower() != "other")
+        )
+        # The target should not have achieved it's reduction yet.
+        achieved_reduction = target_data[self.c.COLS.ACHIEVED_EMISSIONS]
+        target_process = achieved_reduction.isnull() | (achieved_reduction < 1)
+
+        # The end year should be greater than the start year.
+        start_year = target_data[self.c.COLS.START_YEAR].fillna(
+            target_data[self.c.COLS.BASE_YEAR]
+        )
+        if start_year.notnull().all():
+            start_year = start_year.astype(target_data[self.c.COLS.BASE_YEAR].dtype)
+        target_data[self.c.COLS.START_YEAR] = start_year
+        target_end_year = target_data[self.c.COLS.END_YEAR] > start_year
+
+        # Delete all S1 or S2 targets we can't combine
+        scope = target_data[self.c.COLS.SCOPE]
+        base_year_ghg = (
+            target_data[self.c.COLS.BASEYEAR_GHG_S1].notnull()
+            & target_data[self.c.COLS.BASEYEAR_GHG_S2].notnull()
+        )
+        s1 = (scope != EScope.S1) | (
+            target_data[self.c.COLS.COVERAGE_S1].notnull() & base_year_ghg
+        )
+        s2 = (scope != EScope.S2) | (
+            target_data[self.c.COLS.COVERAGE_S2].notnull() & base_year_ghg
+        )
+        return valid_type & target_process & target_end_year & s1 & s2
+
+    def _split_s1s2s3_vectorized(self, target_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Split all s1s2s3 targets into a s1s2 and a s3 target. The split targets directly follow each other, in the place
+        of the original target.
+
+        :param target_data: The valid targets
+        :return: The targets, with the s1s2s3 targets split
+        """
+        is_s1s2s3 = target_data[self.c.COLS.SCOPE] == EScope.S1S2S3
+        s1s2 = target_data.copy()
+        s3 = target_data[
+            is_s1s2s3 & target_data[self.c.COLS.COVERAGE_S3].notnull()
+        ].copy()
+
+        ghg_s1 = s1s2[self.c.COLS.BASEYEAR_GHG_S1]
+        ghg_s2 = s1s2[self.c.COLS.BASEYEAR_GHG_S2]
+        coverage_s1 = s1s2[self.c.COLS.COVERAGE_S1]
+        coverage_s2 = s1s2[self.c.COLS.COVERAGE_S2]
+        base_year_ghg = ghg_s1.notnull() & ghg_s2.notnull()
+        s1s2.loc[
+            is_s1s2s3 & (base_year_ghg | (coverage_s1 == coverage_s2)),
+            self.c.COLS.SCOPE,
+        ] = EScope.S1S2
+        weighted = is_s1s2s3 & base_year_ghg & (ghg_s1 + ghg_s2 != 0)
+        coverage_percentage = (coverage_s1 * ghg_s1 + coverage_s2 * ghg_s2) / (
+            ghg_s1 + ghg_s2
+        )
+        s1s2.loc[weighted, self.c.COLS.COVERAGE_S1] = coverage_percentage[weighted]
+        s1s2.loc[weighted, self.c.COLS.COVERAGE_S2] = coverage_percentage[weighted]
+        s3[self.c.COLS.SCOPE] = pd.Series(
+            EScope.S3, index=s3.index, dtype=s3[self.c.COLS.SCOPE].dtype
+        )
+
+        return (
+            pd.concat([s1s2, s3], keys=[0, 1], names=["split", "position"])
+            .sort_index(level=["position", "split"], sort_remaining=False)
+            .reset_index(drop=True)
+        )
+
+    def _combine_s1_s2_vectorized(self, target_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Combine every S1 target with the S2 target that matches it exactly and has the highest coverage.
+
+        The target by target implementation converts S2 targets in place while it goes through the list, so an S1 target
+        is combined with the converted coverage and ambition of S2 targets that come before it in the list and with the
+        original values of the ones after it. This is replicated here, to get the same results.
+
+        :param target_data: The split targets
+        :return: The targets, with the S1 targets combined
+        """
+        keys = [
+            self.c.COLS.COMPANY_ID,
+            self.c.COLS.BASE_YEAR,
+            self.c.COLS.START_YEAR,
+            self.c.COLS.END_YEAR,
+            self.c.COLS.TARGET_REFERENCE_NUMBER,
+            self.c.COLS.INTENSITY_METRIC,
+        ]
+        scope = target_data[self.c.COLS.SCOPE]
+        s1_mask = (scope == EScope.S1) & target_data[
+            self.c.COLS.BASEYEAR_GHG_S1
+        ].notnull()
+        s2_mask = (
+            (scope == EScope.S2)
+            & target_data[self.c.COLS.BASEYEAR_GHG_S2].notnull()
+            & target_data[self.c.COLS.COVERAGE_S2].notnull()
+        )
+        if not s1_mask.any() or not s2_mask.any():
+            return target_data
+
+        s1 = target_data.loc[
+            s1_mask,
+            keys
+            + [
+                self.c.COLS.COVERAGE_S1,
+                self.c.COLS.BASEYEAR_GHG_S1,
+                self.c.COLS.REDUCTION_AMBITION,
+            ],
+        ].reset_index()
+        s2 = target_data.loc[
+            s2_mask,
+            keys
+            + [
+                self.c.COLS.COVERAGE_S2,
+                self.c.COLS.BASEYEAR_GHG_S1,
+                self.c.COLS.BASEYEAR_GHG_S2,
+                self.c.COLS.REDUCTION_AMBITION,
+            ],
+        ].reset_index()
+
+        # The values of the S2 targets after _convert_s1_s2 and _boundary_coverage
+        s2_ghg = s2[self.c.COLS.BASEYEAR_GHG_S1] + s2[self.c.COLS.BASEYEAR_GHG_S2]
+        s2_converted_coverage = (
+            s2[self.c.COLS.COVERAGE_S2] * s2[self.c.COLS.BASEYEAR_GHG_S2] / s2_ghg
+        ).where(s2_ghg != 0, s2[self.c.COLS.COVERAGE_S2])
+        s2["converted_coverage"] = s2_converted_coverage
+        s2["converted_ambition"] = s2[self.c.COLS.REDUCTION_AMBITION].where(
+            (s2_ghg == 0) | ~(s2_converted_coverage < 0.95),
+            s2[self.c.COLS.REDUCTION_AMBITION] * s2_converted_coverage,
+        )
+
+        matches = pd.merge(left=s1, right=s2, on=keys, suffixes=("", "_s2"))
+        if matches.empty:
+            return target_data
+        converted = matches["index_s2"] < matches["index"]
+        matches["s2_coverage"] = matches["converted_coverage"].where(
+            converted, matches[self.c.COLS.COVERAGE_S2]
+        )
+        matches["s2_ambition"] = matches["converted_ambition"].where(
+            converted, matches[self.c.COLS.REDUCTION_AMBITION + "_s2"]
+        )
+        # Pick the S2 target with the highest coverage, the first one in the list if there's a tie
+        matches = (
+            matches.sort_values(by=["index", "index_s2"])
+            .sort_values(by="s2_coverage", ascending=False, kind="mergesort")
+            .drop_duplicates(subset="index", keep="first")
+            .set_index("index")
+        )
+
+        ghg_s1 = matches[self.c.COLS.BASEYEAR_GHG_S1]
+        ghg_s2 = matches[self.c.COLS.BASEYEAR_GHG_S2]
+        combined_coverage = (
+            matches[self.c.COLS.COVERAGE_S1] * ghg_s1 + matches["s2_coverage"] * ghg_s2
+        ) / (ghg_s1 + ghg_s2)
+        reduction_ambition = (
+            (
+                matches[self.c.COLS.REDUCTION_AMBITION]
+                * matches[self.c.COLS.COVERAGE_S1]
+                * ghg_s1
+                + matches["s2_ambition"] * matches["s2_coverage"] * ghg_s2
+            )
+            / (ghg_s1 + ghg_s2)
+            / combined_coverage
+        )
+        # The target by target implementation fails on a zero division, leave these targets as they are
+        combine = (ghg_s1 + ghg_s2 != 0) & (combined_coverage != 0)
+        index = matches.index[combine]
+
+        target_data = target_data.copy()
+        target_data.loc[index, self.c.COLS.REDUCTION_AMBITION] = reduction_ambition[
+            combine
+        ]
+        target_data.loc[index, self.c.COLS.COVERAGE_S1] = combined_coverage[combine]
+        target_data.loc[index, self.c.COLS.COVERAGE_S2] = combined_coverage[combine]
+        # We don't need to delete the S2 target as it'll be definition have a lower coverage than the combined
+        # target, therefore it won't be picked for our 9-box grid
+        return target_data
+
+    def _convert_s1_s2_vectorized(self, target_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert all S1 and S2 targets into S1+S2 targets.
+
+        :param target_data: The targets
+        :return: The targets, with the S1 and S2 targets converted
+        """
+        ghg_s1 = target_data[self.c.COLS.BASEYEAR_GHG_S1]
+        ghg_s2 = target_data[self.c.COLS.BASEYEAR_GHG_S2]
+        scope = target_data[self.c.COLS.SCOPE]
+        # In both cases the base_year_ghg s1 + s2 should not be zero
+        s1 = (scope == EScope.S1) & (ghg_s1 + ghg_s2 != 0)
+        s2 = (scope == EScope.S2) & (ghg_s1 + ghg_s2 != 0)
+        coverage = pd.Series(np.nan, index=target_data.index)
+        coverage[s1] = (
+            target_data.loc[s1, self.c.COLS.COVERAGE_S1]
+            * ghg_s1[s1]
+            / (ghg_s1 + ghg_s2)[s1]
+        )
+        coverage[s2] = (
+            target_data.loc[s2, self.c.COLS.COVERAGE_S2]
+            * ghg_s2[s2]
+            / (ghg_s1 + ghg_s2)[s2]
+        )
+        convert = s1 | s2
+        target_data.loc[convert, self.c.COLS.COVERAGE_S1] = coverage[convert]
+        target_data.loc[convert, self.c.COLS.COVERAGE_S2] = coverage[convert]
+        target_data.loc[convert, self.c.COLS.SCOPE] = EScope.S1S2
+        return target_data
+
+    def _boundary_coverage_vectorized(self, target_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Test all targets on boundary coverage, scaling the reduction ambition below the threshold. See
+        _boundary_coverage for the options.
+
+        :param target_data: The targets
+        :return: The targets with a weighted reduction ambition, if so required
+        """
+        scope = target_data[self.c.COLS.SCOPE]
+        coverage_s1 = target_data[self.c.COLS.COVERAGE_S1]
+        coverage_s3 = target_data[self.c.COLS.COVERAGE_S3]
+        target_data[self.c.COLS.REDUCTION_AMBITION] = np.where(
+            (scope == EScope.S1S2) & (coverage_s1 < 0.95),
+            target_data[self.c.COLS.REDUCTION_AMBITION] * coverage_s1,
+            np.where(
+                (scope == EScope.S3) & (coverage_s3 < 0.67),
+                target_data[self.c.COLS.REDUCTION_AMBITION] * coverage_s3,
+                target_data[self.c.COLS.REDUCTION_AMBITION],
+            ),
+        )
+        return target_data
+
+    def _time_frame_vectorized(self, target_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fill out the time frame of all targets, see _time_frame.
+
+        :param target_data: The targets
+        :return: The targets with the time_frame field filled out (if so required)
+        """
+        now = datetime.datetime.now()
+        time_frame = target_data[self.c.COLS.END_YEAR] - now.year
+        target_data[self.c.COLS.TIME_FRAME] = np.select(
+            [time_frame <= 4, time_frame <= 15, time_frame <= 30],
+            [ETimeFrames.SHORT, ETimeFrames.MID, ETimeFrames.LONG],
+            default=target_data[self.c.COLS.TIME_FRAME].astype(object),
+        )
+        return target_data
+
+    def prepare_targets_vectorized(self, target_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Validate and prepare all targets at once. This is the column-wise equivalent of prepare_targets, it returns the
+        same targets as a data frame.
+
+        :param target_data: The targets, one per row, with the fields of IDataProviderTarget as columns
+        :return: The prepared targets
+        """
+        target_data = target_data.copy()
+        # The scopes are compared over and over again, which is a lot faster on the codes of a categorical
+        target_data[self.c.COLS.SCOPE] = target_data[self.c.COLS.SCOPE].astype(
+            EScope.get_dtype()
+        )
+        target_data = target_data[self.validate_vectorized(target_data)]
+        target_data = self._split_s1s2s3_vectorized(target_data)
+        target_data = self._combine_s1_s2_vectorized(target_data)
+        target_data = self._convert_s1_s2_vectorized(target_data)
+        target_data = self._boundary_coverage_vectorized(target_data)
+        target_data = self._time_frame_vectorized(target_data)
+        target_data[self.c.COLS.SCOPE] = target_data[self.c.COLS.SCOPE].astype(object)
+        return target_data
+
     def _find_target(self, row: pd.Series, target_columns: List[str]) -> pd.Series:
         """
         Find the target that corresponds to a given row. If there are multiple targets available, filter them.
@@ -356,6 +784,34 @@ class TargetProtocol:
         empty_columns = [
             column for column in self.target_data.columns if column not in grid_columns
         ]
+        if self.sparse:
+            selected_targets = self._select_targets()
+            # Targets without a time frame don't fit in any of the cells
+            selected_targets = selected_targets[
+                selected_targets[self.c.COLS.COMPANY_ID].isin(companies)
+                & selected_targets[self.c.COLS.TIME_FRAME].notnull()
+            ]
+            # One row per company, without a time frame and scope, marks the cells without a target
+            default_rows = pd.DataFrame({self.c.COLS.COMPANY_ID: companies}).reindex(
+                columns=grid_columns + empty_columns
+            )
+            self.data = pd.concat(
+                [default_rows, selected_targets[grid_columns + empty_columns]],
+                ignore_index=True,
+            )
+            return
+        if self.vectorized:
+            grid = pd.MultiIndex.from_product(
+                [companies, list(ETimeFrames), scopes], names=grid_columns
+            ).to_frame(index=False)
+            self.data = pd.merge(
+                left=grid,
+                right=self._select_targets(),
+                how="left",
+                on=grid_columns,
+            )[grid_columns + empty_columns]
+            return
+
         extended_data = pd.DataFrame(
             list(
                 itertools.product(
@@ -368,3 +824,42 @@ class TargetProtocol:
         self.data = extended_data.apply(
             lambda row: self._find_target(row, target_columns), axis=1
         )
+
+    def _select_targets(self) -> pd.DataFrame:
+        """
+        Select the preferred target for each company, time frame and scope at once. This applies the same preferences as
+        _find_target: higher coverage, later end year and target type 'absolute' over 'intensity'. Ties keep the order
+        in which the targets were prepared.
+
+        :return: A data frame with (at most) one target per company, time frame and scope
+        """
+        grid_columns = [
+            self.c.COLS.COMPANY_ID,
+            self.c.COLS.TIME_FRAME,
+            self.c.COLS.SCOPE,
+        ]
+        if self.target_data.empty:
+            return pd.DataFrame(columns=self.target_data.columns.union(grid_columns))
+
+        target_data = self.target_data.reset_index(drop=True)
+        coverage = target_data[self.c.COLS.COVERAGE_S1].where(
+            target_data[self.c.COLS.SCOPE] != EScope.S3,
+            target_data[self.c.COLS.COVERAGE_S3],
+        )
+        # A stable sort on the preferences, followed by taking the first target of every group, is equivalent to
+        # sorting each group separately.
+        order = (
+            target_data[[self.c.COLS.END_YEAR, self.c.COLS.TARGET_REFERENCE_NUMBER]]
+            .assign(coverage=coverage)
+            .sort_values(
+                by=[
+                    "coverage",
+                    self.c.COLS.END_YEAR,
+                    self.c.COLS.TARGET_REFERENCE_NUMBER,
+                ],
+                ascending=[False, False, True],
+                kind="mergesort",
+            )
+            .index
+        )
+        return target_data.loc[order].drop_duplicates(subset=grid_columns, keep="first")
@@ -1,5 +1,7 @@
+import copy
+import hashlib
 from enum import Enum
-from typing import Optional, Tuple, Type, List
+from typing import Dict, Iterable, Optional, Tuple, Type, List, Union
 
 import pandas as pd
 import numpy as np
@@ -14,10 +16,13 @@ from .interfaces import (
     ScoreAggregationScopes,
     ScoreAggregations,
     PortfolioCompany,
+    IDataProviderTarget,
 )
 from .portfolio_aggregation import PortfolioAggregation, PortfolioAggregationMethod
 from .configs import TemperatureScoreConfig
-from . import data, utils
+from . import cache, data, reference_data, utils
+from .cache import ResultCache
+from .score_cube import NO_SCENARIO, ScoreCube
 
 
 class ScenarioType(Enum):
@@ -164,6 +169,7 @@ class TemperatureScore(PortfolioAggregation):
     :param config: A class defining the constants that are used throughout this class. This parameter is only required
                     if you'd like to overwrite a constant. This can be done by extending the TemperatureScoreConfig
                     class and overwriting one of the parameters.
+    :param cache: A cache for the results of calculate and aggregate_scores (None to always calculate them)
     """
 
     def __init__(
@@ -176,11 +182,15 @@ class TemperatureScore(PortfolioAggregation):
         aggregation_method: PortfolioAggregationMethod = PortfolioAggregationMethod.WATS,
         grouping: Optional[List] = None,
         config: Type[TemperatureScoreConfig] = TemperatureScoreConfig,
+        cache: Optional[ResultCache] = None,
     ):
         super().__init__(config)
         self.model = model
+        self.cache = cache
         self.c: Type[TemperatureScoreConfig] = config
         self.scenario: Optional[Scenario] = scenario
+        # The fallback score before the scenario is applied, see calculate_scenarios
+        self._fallback_score = fallback_score
         self.fallback_score = fallback_score
 
         self.time_frames = time_frames
@@ -194,14 +204,104 @@ class TemperatureScore(PortfolioAggregation):
         if grouping is not None:
             self.grouping = grouping
 
-        # Load the mappings from industry to SR15 goal
-        self.mapping = pd.read_excel(self.c.FILE_SR15_MAPPING, header=0)
-        self.regression_model = pd.read_excel(
-            self.c.FILE_REGRESSION_MODEL_SUMMARY, header=0
+        # The mapping from industry to SR15 goal is only loaded when it's used
+        self._mapping: Optional[pd.DataFrame] = None
+        self.regression_model = reference_data.get_regression_model(
+            self.c.FILE_REGRESSION_MODEL_SUMMARY, self.model, self.c.COLS.MODEL
         )
-        self.regression_model = self.regression_model[
-            self.regression_model[self.c.COLS.MODEL] == self.model
+
+    @property
+    def mapping(self) -> pd.DataFrame:
+        """
+        The mappings from industry to SR15 goal, loaded on first use.
+
+        :return: The SR15 mapping
+        """
+        if self._mapping is None:
+            self._mapping = reference_data.get_table(self.c.FILE_SR15_MAPPING)
+        return self._mapping
+
+    @property
+    def regression_model(self) -> pd.DataFrame:
+        """
+        The regression parameters of the model of this temperature score.
+
+        :return: The regression model
+        """
+        return self._regression_model
+
+    @regression_model.setter
+    def regression_model(self, regression_model: pd.DataFrame):
+        self._regression_model = regression_model
+        # The lookup table is compiled again when it's used
+        self._regression_lookup: Optional[
+            Tuple[pd.Index, pd.Index, np.ndarray, np.ndarray, np.ndarray]
+        ] = None
+
+    def _get_regression_lookup(
+        self,
+    ) -> Tuple[pd.Index, pd.Index, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compile the regression model into a lookup table, so the regression parameters of a target can be found by
+        indexing an array with the codes of its SR15 variable and slope, rather than by filtering or merging the
+        regression model.
+
+        :return: The SR15 variables, the slopes, a (variable x slope) array with the position of the parameters in the
+        regression model and the parameters and intercepts. The position is -1 if there are no parameters and -2 if
+        there's more than one set of parameters. The last row and column of the positions are -1, so an unknown
+        variable or slope (code -1) has no parameters, just like the last parameter and intercept are NaN.
+        """
+        if self._regression_lookup is None:
+            variables = pd.Index(self.regression_model[self.c.COLS.VARIABLE].unique())
+            slopes = pd.Index(self.regression_model[self.c.COLS.SLOPE].unique())
+            variable_codes = variables.get_indexer(
+                self.regression_model[self.c.COLS.VARIABLE]
+            )
+            slope_codes = slopes.get_indexer(self.regression_model[self.c.COLS.SLOPE])
+
+            positions = np.full((len(variables) + 1, len(slopes) + 1), -1)
+            positions[variable_codes, slope_codes] = np.arange(
+                len(self.regression_model)
+            )
+            counts = np.zeros(positions.shape, dtype=int)
+            np.add.at(counts, (variable_codes, slope_codes), 1)
+            positions[counts > 1] = -2
+
+            self._regression_lookup = (
+                variables,
+                slopes,
+                positions,
+                np.append(
+                    self.regression_model[self.c.COLS.PARAM].values.astype(float),
+                    np.nan,
+                ),
+                np.append(
+                    self.regression_model[self.c.COLS.INTERCEPT].values.astype(float),
+                    np.nan,
+                ),
+            )
+        return self._regression_lookup
+
+    def _get_regression_positions(
+        self, sr15_variables: pd.Series, slopes: pd.Series
+    ) -> np.ndarray:
+        """
+        Find the position of the regression parameters of the targets in the regression model.
+
+        :param sr15_variables: The SR15 variables of the targets
+        :param slopes: The slopes of the targets
+        :return: The positions of the regression parameters (-1 if there are none)
+        """
+        variables, slope_index, positions, _, _ = self._get_regression_lookup()
+        positions = positions[
+            variables.get_indexer(sr15_variables), slope_index.get_indexer(slopes)
         ]
+        if (positions == -2).any():
+            # There should never be more than one potential mapping
+            raise ValueError(
+                "There is more than one potential regression parameter for this SR15 goal."
+            )
+        return positions
 
     def get_target_mapping(self, target: pd.Series) -> Optional[str]:
         """
@@ -258,41 +358,68 @@ class TemperatureScore(PortfolioAggregation):
         if pd.isnull(target[self.c.COLS.SR15]):
             return None, None
 
-        regression = self.regression_model[
-            (self.regression_model[self.c.COLS.VARIABLE] == target[self.c.COLS.SR15])
-            & (
-                self.regression_model[self.c.COLS.SLOPE]
-                == self.c.SLOPE_MAP[target[self.c.COLS.TIME_FRAME]]
-            )
-        ]
-        if len(regression) == 0:
+        variables, slopes, positions, params, intercepts = self._get_regression_lookup()
+        try:
+            position = positions[
+                variables.get_loc(target[self.c.COLS.SR15]),
+                slopes.get_loc(self.c.SLOPE_MAP[target[self.c.COLS.TIME_FRAME]]),
+            ]
+        except KeyError:
             return None, None
-        elif len(regression) > 1:
+        if position == -2:
             # There should never be more than one potential mapping
             raise ValueError(
                 "There is more than one potential regression parameter for this SR15 goal."
             )
-        else:
-            return (
-                regression.iloc[0][self.c.COLS.PARAM],
-                regression.iloc[0][self.c.COLS.INTERCEPT],
-            )
+        elif position == -1:
+            return None, None
+        return params[position], intercepts[position]
 
-    def _merge_regression(self, data: pd.DataFrame):
+    def _merge_regression(
+        self, data: pd.DataFrame, models: Optional[List[int]] = None
+    ):
         """
-        Merge the data with the regression parameters from the SBTi model.
+        Merge the data with the regression parameters from the SBTi model. When several models are requested, every
+        target is repeated for each model and the parameters of all models are merged in a single join.
 
         :param data: The data to merge
+        :param models: The regression models to merge (None to only merge the model of this temperature score)
         :return: The data set, amended with the regression parameters
         """
-        data[self.c.COLS.SLOPE] = data.apply(
-            lambda row: self.c.SLOPE_MAP.get(row[self.c.COLS.TIME_FRAME], None), axis=1
+        data[self.c.COLS.SLOPE] = (
+            data[self.c.COLS.TIME_FRAME].map(self.c.SLOPE_MAP).astype(object)
+        )
+        if models is None:
+            # Look up the parameters by their position, missing positions (-1) become empty rows
+            regression = (
+                self.regression_model.drop(columns=[self.c.COLS.SLOPE])
+                .reset_index(drop=True)
+                .reindex(
+                    self._get_regression_positions(
+                        data[self.c.COLS.SR15], data[self.c.COLS.SLOPE]
+                    )
+                )
+            )
+            # Like a merge, the result gets a new index. The data is prepared by _prepare_targets, so its index can be
+            # replaced in place rather than copying the data.
+            data.index = pd.RangeIndex(len(data))
+            for column in regression.columns:
+                data[column] = regression[column].values
+            return data
+
+        regression_model = reference_data.get_table(
+            self.c.FILE_REGRESSION_MODEL_SUMMARY
         )
+        regression_model = regression_model[
+            regression_model[self.c.COLS.MODEL].isin(models)
+        ]
         return pd.merge(
-            left=data,
-            right=self.regression_model,
-            left_on=[self.c.COLS.SLOPE, self.c.COLS.SR15],
-            right_on=[self.c.COLS.SLOPE, self.c.COLS.VARIABLE],
+            left=pd.merge(
+                left=data, right=pd.DataFrame({self.c.COLS.MODEL: models}), how="cross"
+            ),
+            right=regression_model,
+            left_on=[self.c.COLS.MODEL, self.c.COLS.SLOPE, self.c.COLS.SR15],
+            right_on=[self.c.COLS.MODEL, self.c.COLS.SLOPE, self.c.COLS.VARIABLE],
             how="left",
         )
 
@@ -326,6 +453,124 @@ class TemperatureScore(PortfolioAggregation):
                 0,
             )
 
+    def get_target_mappings(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Map all targets onto an SR15 target at once (NaN if not available). This gives the same result as applying
+        get_target_mapping to each row.
+
+        :param data: The targets as a data frame
+        :return: The mapped SR15 targets
+        """
+        # The string operations are only done once for every distinct target type and ISIC code
+        target_types, target_type_values = pd.factorize(
+            data[self.c.COLS.TARGET_REFERENCE_NUMBER]
+        )
+        is_intensity = np.append(
+            pd.Series(target_type_values, dtype=object)
+            .astype(str)
+            .str.strip()
+            .str.lower()
+            .str.startswith(self.c.VALUE_TARGET_REFERENCE_INTENSITY_BASE)
+            .to_numpy(dtype=bool),
+            False,
+        )[target_types]
+        # Only first 3 characters of ISIC code are relevant for the absolute mappings
+        isic_codes, isic_values = pd.factorize(data[self.c.COLS.COMPANY_ISIC])
+        isic = np.append(
+            pd.Series(isic_values, dtype=object).astype(str).str[:3].to_numpy(),
+            "nan",
+        )[isic_codes]
+        intensity_metric = data[self.c.COLS.INTENSITY_METRIC].to_numpy()
+
+        scopes, scope_values = pd.factorize(data[self.c.COLS.SCOPE])
+        mappings = np.full(len(data), np.nan, dtype=object)
+        for i, scope in enumerate(scope_values):
+            intensity_mapping = {
+                metric: sr15
+                for (metric, mapping_scope), sr15 in self.c.INTENSITY_MAPPINGS.items()
+                if mapping_scope == scope
+            }
+            absolute_mapping = {
+                isic_code: sr15
+                for (isic_code, mapping_scope), sr15 in self.c.ABSOLUTE_MAPPINGS.items()
+                if mapping_scope == scope
+            }
+            intensity_targets = (scopes == i) & is_intensity
+            absolute_targets = (scopes == i) & ~is_intensity
+            mappings[intensity_targets] = (
+                pd.Series(intensity_metric[intensity_targets], dtype=object)
+                .map(intensity_mapping)
+                .to_numpy()
+            )
+            mappings[absolute_targets] = (
+                pd.Series(isic[absolute_targets], dtype=object)
+                .map(absolute_mapping)
+                .fillna(self.c.ABSOLUTE_MAPPINGS.get(("other", scope), np.nan))
+                .to_numpy()
+            )
+        return pd.Series(mappings, index=data.index)
+
+    def get_annual_reduction_rates(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Get the annual reduction rates of all targets at once (NaN if not available).
+
+        :param data: The targets as a data frame
+        :return: The annual reduction rates
+        """
+        reduction_ambition = data[self.c.COLS.REDUCTION_AMBITION].astype(float)
+        target_length = data[self.c.COLS.END_YEAR].astype(float) - data[
+            self.c.COLS.BASE_YEAR
+        ].astype(float)
+        if (reduction_ambition.notnull() & (target_length == 0)).any():
+            raise ValueError(
+                "Couldn't calculate the annual reduction rate because the start and target year are the "
+                "same"
+            )
+        return reduction_ambition / target_length
+
+    def _get_target_scores(self, data: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+        """
+        Get the temperature scores that follow from the targets themselves, i.e. before the scores of targets that
+        aren't SBTi validated are blended with the fallback score.
+
+        :param data: The targets as a data frame, merged with the regression parameters
+        :return: The temperature scores and whether a score can't be calculated (and should be the fallback score)
+        """
+        regression_param = data[self.c.COLS.REGRESSION_PARAM].astype(float)
+        regression_intercept = data[self.c.COLS.REGRESSION_INTERCEPT].astype(float)
+        annual_reduction_rate = data[self.c.COLS.ANNUAL_REDUCTION_RATE].astype(float)
+        missing = (
+            regression_param.isnull()
+            | regression_intercept.isnull()
+            | annual_reduction_rate.isnull()
+        )
+
+        ts = np.maximum(
+            regression_param * annual_reduction_rate * 100 + regression_intercept,
+            self.c.TEMPERATURE_FLOOR,
+        )
+        return ts, missing
+
+    def get_scores(self, data: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+        """
+        Get the temperature scores of all targets at once, based on the annual reduction rates and the regression
+        parameters. This gives the same result as applying get_score to each row.
+
+        :param data: The targets as a data frame, merged with the regression parameters
+        :return: The temperature scores and the temperature results (1 if the score is the fallback score, 0 otherwise)
+        """
+        ts, missing = self._get_target_scores(data)
+        # Like an if-statement, a missing value (None) means not validated, whereas NaN does count as validated
+        sbti_validated = data[self.c.COLS.SBTI_VALIDATED].astype(bool)
+        ts = ts.where(
+            sbti_validated,
+            ts * self.c.SBTI_FACTOR + self.fallback_score * (1 - self.c.SBTI_FACTOR),
+        )
+        return (
+            ts.where(~missing, self.fallback_score),
+            pd.Series(np.where(missing, 1, 0), index=data.index),
+        )
+
     def get_ghc_temperature_score(
         self, row: pd.Series, company_data: pd.DataFrame
     ) -> Tuple[float, float]:
@@ -400,73 +645,249 @@ class TemperatureScore(PortfolioAggregation):
             return 1
         return 0
 
-    def _prepare_data(self, data: pd.DataFrame):
+    def _get_grid_scopes(self) -> List[EScope]:
         """
-        Prepare the data such that it can be used to calculate the temperature score.
+        Get the scopes that have to be scored, i.e. the scopes of this temperature score plus the scopes that the S1S2S3
+        scores are combined from.
 
-        :param data: The original data set as a pandas data frame
-        :return: The extended data frame
+        :return: The scopes to score
         """
-        # If scope S1S2S3 is in the list of scopes to calculate, we need to calculate the other two as well
         scopes = self.scopes.copy()
         if EScope.S1S2S3 in self.scopes and EScope.S1S2 not in self.scopes:
             scopes.append(EScope.S1S2)
         if EScope.S1S2S3 in scopes and EScope.S3 not in scopes:
             scopes.append(EScope.S3)
+        return scopes
+
+    def _fill_sparse_grid(
+        self, data: pd.DataFrame, key_columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Fill the empty cells of a sparse grid (see the sparse parameter of the TargetProtocol) once its rows have been
+        scored. The row of a company without a time frame and scope has no target, so it's scored like an empty cell
+        (i.e. it gets the fallback score) and every empty cell of the company is a copy of it. Unlike in the full 9-box
+        grid, the columns that are derived from a target (e.g. the SR15 mapping and the regression parameters) are empty
+        in these cells. The rows are ordered in the same way as in the full 9-box grid.
+
+        :param data: The scored rows of the sparse grid, with categorical time frames and scopes (see _select_grid)
+        :param key_columns: Additional columns that a company is repeated for (e.g. the regression model)
+        :return: The data set with one row per company, time frame and scope
+        """
+        empty = data[self.c.COLS.TIME_FRAME].isnull().values
+        if not empty.any():
+            return data
+
+        scopes = self._get_grid_scopes()
+        cells = [
+            (time_frame, scope)
+            for time_frame in ETimeFrames
+            if time_frame in self.time_frames
+            for scope in [EScope.S1S2, EScope.S3, EScope.S1S2S3]
+            if scope in scopes
+        ]
+        cell_time_frames = np.array([list(ETimeFrames).index(tf) for tf, _ in cells])
+        cell_scopes = np.array([list(EScope).index(scope) for _, scope in cells])
+        # The position of a cell in the grid, by the codes of its time frame and scope
+        cell_positions = np.full((len(ETimeFrames), len(EScope)), -1)
+        cell_positions[cell_time_frames, cell_scopes] = np.arange(len(cells))
+
+        # Every row without a time frame is a company (for every key), which gets a row for each cell. A company that's
+        # in the data more than once (e.g. a company that's held twice) is matched with its targets by occurrence.
+        key_columns = [self.c.COLS.COMPANY_ID] + (key_columns or [])
+        companies = data[empty]
+        company_keys = pd.MultiIndex.from_frame(
+            companies[key_columns].assign(
+                occurrence=companies.groupby(key_columns, sort=False).cumcount()
+            )
+        )
+        targets = data[~empty]
+        target_cells = cell_positions[
+            targets[self.c.COLS.TIME_FRAME].cat.codes.values,
+            targets[self.c.COLS.SCOPE].cat.codes.values,
+        ]
+        target_companies = company_keys.get_indexer(
+            pd.MultiIndex.from_frame(
+                targets[key_columns].assign(
+                    occurrence=targets.groupby(
+                        key_columns + [self.c.COLS.TIME_FRAME, self.c.COLS.SCOPE],
+                        sort=False,
+                        observed=True,
+                    ).cumcount()
+                )
+            )
+        )
+
+        # The position in the data of the row of each cell, the cells with a target take the row of the target
+        positions = np.repeat(np.flatnonzero(empty)[:, np.newaxis], len(cells), axis=1)
+        positions[target_companies, target_cells] = np.flatnonzero(~empty)
+        grid_companies = np.repeat(np.arange(len(companies)), len(cells))
+        grid_cells = np.tile(np.arange(len(cells)), len(companies))
+        order = np.lexsort(
+            (
+                grid_companies,
+                grid_cells,
+                pd.factorize(companies[self.c.COLS.COMPANY_ID])[0][grid_companies],
+            )
+        )
+        grid_cells = grid_cells[order]
+        data = data.take(positions.ravel()[order])
+        data[self.c.COLS.TIME_FRAME] = pd.Categorical.from_codes(
+            cell_time_frames[grid_cells], dtype=ETimeFrames.get_dtype()
+        )
+        data[self.c.COLS.SCOPE] = pd.Categorical.from_codes(
+            cell_scopes[grid_cells], dtype=EScope.get_dtype()
+        )
+        return data.reset_index(drop=True)
+
+    def _select_grid(
+        self,
+        data: pd.DataFrame,
+        time_frames: List[ETimeFrames],
+        scopes: List[EScope],
+    ) -> pd.DataFrame:
+        """
+        Select the rows of the given time frames and scopes. In the selection, the time frames and scopes are encoded as
+        categoricals, so the following filters, comparisons and groupbys work on integer codes rather than on the enum
+        members themselves.
+
+        :param data: The data set
+        :param time_frames: The time frames to select
+        :param scopes: The scopes to select
+        :return: A copy of the selected rows, with categorical time frames and scopes
+        """
+        time_frame = data[self.c.COLS.TIME_FRAME].astype(ETimeFrames.get_dtype())
+        scope = data[self.c.COLS.SCOPE].astype(EScope.get_dtype())
+        selected = np.flatnonzero(scope.isin(scopes) & time_frame.isin(time_frames))
+        data = data.take(selected)
+        data[self.c.COLS.TIME_FRAME] = time_frame.take(selected)
+        data[self.c.COLS.SCOPE] = scope.take(selected)
+        return data
+
+    def _prepare_data(self, data: pd.DataFrame):
+        """
+        Prepare the data such that it can be used to calculate the temperature score.
+
+        :param data: The original data set as a pandas data frame
+        :return: The extended data frame
+        """
+        return self._score_targets(self._prepare_targets(data))
+
+    def _prepare_targets(
+        self, data: pd.DataFrame, models: Optional[List[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Prepare the targets up to the point where they can be scored, i.e. map them to the SR15 variables and merge the
+        regression parameters. This doesn't depend on the scenario, so it can be shared by several scenarios.
 
-        data = data[
-            data[self.c.COLS.SCOPE].isin(scopes)
-            & data[self.c.COLS.TIME_FRAME].isin(self.time_frames)
-        ].copy()
+        :param data: The original data set as a pandas data frame
+        :param models: The regression models to merge (None to only merge the model of this temperature score)
+        :return: The extended data frame
+        """
+        # If scope S1S2S3 is in the list of scopes to calculate, we need to calculate the other two as well
+        scopes = self._get_grid_scopes()
+        # The rows of a sparse grid without a time frame are kept, they're scored to fill the empty cells with (see
+        # _fill_sparse_grid)
+        companies = data[data[self.c.COLS.TIME_FRAME].isnull()]
+        data = self._select_grid(data, self.time_frames, scopes)
+        if not companies.empty:
+            data = pd.concat(
+                [
+                    data,
+                    companies.astype(
+                        {
+                            self.c.COLS.TIME_FRAME: ETimeFrames.get_dtype(),
+                            self.c.COLS.SCOPE: EScope.get_dtype(),
+                        }
+                    ),
+                ]
+            )
 
         data[self.c.COLS.TARGET_REFERENCE_NUMBER] = data[
             self.c.COLS.TARGET_REFERENCE_NUMBER
         ].replace({np.nan: self.c.VALUE_TARGET_REFERENCE_ABSOLUTE})
-        data[self.c.COLS.SR15] = data.apply(
-            lambda row: self.get_target_mapping(row), axis=1
-        )
-        data[self.c.COLS.ANNUAL_REDUCTION_RATE] = data.apply(
-            lambda row: self.get_annual_reduction_rate(row), axis=1
-        )
-        data = self._merge_regression(data)
+        data[self.c.COLS.SR15] = self.get_target_mappings(data)
+        data[self.c.COLS.ANNUAL_REDUCTION_RATE] = self.get_annual_reduction_rates(data)
+        data = self._merge_regression(data, models)
+        return data
+
+    def _score_targets(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score the prepared targets and cap the scores, based on the scenario that's being used.
+
+        :param data: The prepared targets, see _prepare_targets
+        :return: The data frame, with the temperature scores
+        """
         # TODO: Move temperature result to cols
-        data[self.c.COLS.TEMPERATURE_SCORE], data[self.c.TEMPERATURE_RESULTS] = zip(
-            *data.apply(lambda row: self.get_score(row), axis=1)
-        )
+        (
+            data[self.c.COLS.TEMPERATURE_SCORE],
+            data[self.c.TEMPERATURE_RESULTS],
+        ) = self.get_scores(data)
+        data = self._fill_sparse_grid(data)
 
         data = self.cap_scores(data)
         return data
 
-    def _calculate_company_score(self, data):
+    def _calculate_company_score(
+        self,
+        data: pd.DataFrame,
+        score_columns: Optional[List[str]] = None,
+        key_columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
         """
-        Calculate the combined s1s2s3 scores for all companies.
+        Calculate the combined s1s2s3 scores for all companies. The S1S2 and S3 scores of a company are put side by side
+        for each time frame, so the scores can be combined for all companies at once. This gives the same result as
+        applying get_ghc_temperature_score to each row.
 
         :param data: The original data set as a pandas data frame
+        :param score_columns: The columns with scores to combine (None for the temperature score and result)
+        :param key_columns: Additional columns that the scores of a company depend on (e.g. the regression model)
         :return: The data frame, with an updated s1s2s3 temperature score
         """
+        if score_columns is None:
+            score_columns = [self.c.COLS.TEMPERATURE_SCORE, self.c.TEMPERATURE_RESULTS]
+        key_columns = [self.c.COLS.COMPANY_ID, self.c.COLS.TIME_FRAME] + (
+            key_columns or []
+        )
+        value_columns = [self.c.COLS.GHG_SCOPE12, self.c.COLS.GHG_SCOPE3] + score_columns
         # Calculate the GHC
         company_data = (
-            data[
-                [
-                    self.c.COLS.COMPANY_ID,
-                    self.c.COLS.TIME_FRAME,
-                    self.c.COLS.SCOPE,
-                    self.c.COLS.GHG_SCOPE12,
-                    self.c.COLS.GHG_SCOPE3,
-                    self.c.COLS.TEMPERATURE_SCORE,
-                    self.c.TEMPERATURE_RESULTS,
-                ]
-            ]
-            .groupby(
-                [self.c.COLS.COMPANY_ID, self.c.COLS.TIME_FRAME, self.c.COLS.SCOPE]
-            )
+            data[key_columns + [self.c.COLS.SCOPE] + value_columns]
+            .astype({column: float for column in value_columns})
+            .groupby(key_columns + [self.c.COLS.SCOPE], observed=True)
             .mean()
         )
-
-        data[self.c.COLS.TEMPERATURE_SCORE], data[self.c.TEMPERATURE_RESULTS] = zip(
-            *data.apply(
-                lambda row: self.get_ghc_temperature_score(row, company_data), axis=1
-            )
+        s1s2s3 = data[self.c.COLS.SCOPE] == EScope.S1S2S3
+        scopes = data.loc[s1s2s3, key_columns].join(
+            company_data.xs(EScope.S1S2, level=self.c.COLS.SCOPE).add_suffix("_s1s2"),
+            on=key_columns,
+        )
+        scopes = scopes.join(
+            company_data.xs(EScope.S3, level=self.c.COLS.SCOPE).add_suffix("_s3"),
+            on=key_columns,
+        )
+        s1s2_emissions = scopes[self.c.COLS.GHG_SCOPE12 + "_s1s2"].values[:, None]
+        s3_emissions = scopes[self.c.COLS.GHG_SCOPE3 + "_s3"].values[:, None]
+        company_emissions = s1s2_emissions + s3_emissions
+
+        # If the s3 emissions are less than 40 percent, we'll ignore them altogether, if not, we'll weigh them
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ignore_s3 = s3_emissions / company_emissions < 0.4
+        # Return the default score if the ghg scope12 or 3 is empty
+        missing_emissions = (
+            data.loc[s1s2s3, self.c.COLS.GHG_SCOPE12].isna()
+            | data.loc[s1s2s3, self.c.COLS.GHG_SCOPE3].isna()
+        ).values[:, None]
+        s1s2_scores = scopes[[column + "_s1s2" for column in score_columns]].values
+        s3_scores = scopes[[column + "_s3" for column in score_columns]].values
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weighted_scores = (
+                s1s2_scores * s1s2_emissions + s3_scores * s3_emissions
+            ) / company_emissions
+        data[score_columns] = data[score_columns].astype(float)
+        data.loc[s1s2s3, score_columns] = np.where(
+            missing_emissions,
+            TemperatureScoreConfig.FALLBACK_SCORE,
+            np.where(ignore_s3, s1s2_scores, weighted_scores),
         )
         return data
 
@@ -485,6 +906,255 @@ class TemperatureScore(PortfolioAggregation):
         :param portfolio: A list of PortfolioCompany models. Optional, only required if data is empty.
         :return: A data frame containing all relevant information for the targets and companies
         """
+        data = self._get_data(data, data_providers, portfolio)
+        if self.cache is None:
+            return self._combine_scores(self._prepare_data(data))
+        return self.cache.cached(
+            self._get_cache_key("calculate", data),
+            lambda: self._combine_scores(self._prepare_data(data)),
+        )
+
+    def calculate_scenarios(
+        self,
+        scenarios: List[Optional[Scenario]],
+        data: Optional[pd.DataFrame] = None,
+        data_providers: Optional[List[data.DataProvider]] = None,
+        portfolio: Optional[List[PortfolioCompany]] = None,
+        aggregate: bool = True,
+    ) -> Dict[
+        Tuple[Optional[ScenarioType], Optional[EngagementType]],
+        Tuple[pd.DataFrame, Optional[ScoreAggregations]],
+    ]:
+        """
+        Calculate the temperature scores for several scenarios at once. The targets are only prepared once, because the
+        scenarios only differ in the fallback score and the way the scores are capped. The scenario of this temperature
+        score is ignored.
+
+        :param scenarios: The scenarios to play (None to calculate the scores without a scenario)
+        :param data: The data set (or None if the data should be retrieved)
+        :param data_providers: A list of DataProvider instances. Optional, only required if data is empty.
+        :param portfolio: A list of PortfolioCompany models. Optional, only required if data is empty.
+        :param aggregate: Whether to aggregate the scores or not
+        :return: The scores and aggregations (if aggregate is True) of each scenario, keyed by the scenario type and the
+        engagement type of the scenario ((None, None) for the scores without a scenario)
+        """
+        data = self._prepare_targets(
+            self._get_data(data, data_providers, portfolio)
+        )
+
+        results = {}
+        for scenario in scenarios:
+            temperature_score = copy.copy(self)
+            temperature_score.scenario = scenario
+            temperature_score.fallback_score = (
+                scenario.get_fallback_score(self._fallback_score)
+                if scenario is not None
+                else self._fallback_score
+            )
+            scores = temperature_score._combine_scores(
+                temperature_score._score_targets(data.copy())
+            )
+            aggregations = None
+            if aggregate:
+                aggregations = temperature_score.aggregate_scores(scores)
+
+            if scenario is not None:
+                label = (scenario.scenario_type, scenario.engagement_type)
+            else:
+                label = (None, None)
+            results[label] = (scores, aggregations)
+        return results
+
+    def calculate_cube(
+        self,
+        scenarios: Optional[List[Optional[Scenario]]] = None,
+        data: Optional[pd.DataFrame] = None,
+        data_providers: Optional[List[data.DataProvider]] = None,
+        portfolio: Optional[List[PortfolioCompany]] = None,
+    ) -> ScoreCube:
+        """
+        Calculate the temperature scores as a dense cube, with the axes company, time frame, scope and scenario. The
+        scenarios are calculated at once, like calculate_scenarios does.
+
+        :param scenarios: The scenarios to play (None to only use the scenario of this temperature score)
+        :param data: The data set (or None if the data should be retrieved)
+        :param data_providers: A list of DataProvider instances. Optional, only required if data is empty.
+        :param portfolio: A list of PortfolioCompany models. Optional, only required if data is empty.
+        :return: The score cube, with the scenarios labelled like the results of calculate_scenarios
+        """
+        if scenarios is None:
+            label = NO_SCENARIO
+            if self.scenario is not None:
+                label = (self.scenario.scenario_type, self.scenario.engagement_type)
+            scores = {label: self.calculate(data, data_providers, portfolio)}
+        else:
+            scores = {
+                label: scenario_scores
+                for label, (scenario_scores, _) in self.calculate_scenarios(
+                    scenarios, data, data_providers, portfolio, aggregate=False
+                ).items()
+            }
+        return ScoreCube.from_scores(scores, self.time_frames, self.scopes, self.c)
+
+    def calculate_models(
+        self,
+        models: List[int],
+        data: Optional[pd.DataFrame] = None,
+        data_providers: Optional[List[data.DataProvider]] = None,
+        portfolio: Optional[List[PortfolioCompany]] = None,
+    ) -> pd.DataFrame:
+        """
+        Calculate the temperature scores for several regression models at once. The targets are only mapped once and
+        the regression parameters of all models are merged in a single join, so all scores are calculated in one pass.
+
+        :param models: The regression models to use
+        :param data: The data set (or None if the data should be retrieved)
+        :param data_providers: A list of DataProvider instances. Optional, only required if data is empty.
+        :param portfolio: A list of PortfolioCompany models. Optional, only required if data is empty.
+        :return: A data frame like the one of the calculate method, with the scores of each model (and the model in the
+        model column)
+        """
+        data = self._prepare_targets(
+            self._get_data(data, data_providers, portfolio), models
+        )
+        (
+            data[self.c.COLS.TEMPERATURE_SCORE],
+            data[self.c.TEMPERATURE_RESULTS],
+        ) = self.get_scores(data)
+        data = self._fill_sparse_grid(data, [self.c.COLS.MODEL])
+        if self.scenario is not None:
+            # The scores of each model are capped separately, e.g. each model has its own highest contributors
+            data = pd.concat(
+                [
+                    self.cap_scores(model_data.copy())
+                    for _, model_data in data.groupby(self.c.COLS.MODEL, sort=False)
+                ]
+            ).sort_index()
+        return self._combine_scores(data, [self.c.COLS.MODEL])
+
+    def sweep_aggregated_scores(
+        self,
+        fallback_scores: Iterable[float],
+        sbti_factors: Iterable[float],
+        data: Optional[pd.DataFrame] = None,
+        data_providers: Optional[List[data.DataProvider]] = None,
+        portfolio: Optional[List[PortfolioCompany]] = None,
+    ) -> np.ndarray:
+        """
+        Calculate the aggregated portfolio scores for a grid of fallback scores and SBTi factors. These only enter the
+        scores of the targets, so the targets are only prepared once. The scores of all grid points are calculated as
+        one array, which is combined, rounded and aggregated in the same way as the results of the calculate method.
+
+        :param fallback_scores: The fallback scores to use
+        :param sbti_factors: The SBTi factors to use
+        :param data: The data set (or None if the data should be retrieved)
+        :param data_providers: A list of DataProvider instances. Optional, only required if data is empty.
+        :param portfolio: A list of PortfolioCompany models. Optional, only required if data is empty.
+        :return: The aggregated scores, an array with the dimensions fallback score, SBTi factor, time frame and scope
+        (NaN if there's no data for a time frame and scope)
+        """
+        if self.scenario is not None:
+            raise ValueError("The scores can't be swept in combination with a scenario")
+
+        data = self._prepare_targets(self._get_data(data, data_providers, portfolio))
+        fallback_scores = np.asarray(fallback_scores, dtype=float)
+        sbti_factors = np.asarray(sbti_factors, dtype=float)
+
+        # Blend the scores with every combination of fallback score and SBTi factor, like get_scores does for one
+        ts, missing = self._get_target_scores(data)
+        ts = ts.values[:, np.newaxis, np.newaxis]
+        sbti_validated = data[self.c.COLS.SBTI_VALIDATED].astype(bool).values
+        fallback_score = fallback_scores[np.newaxis, :, np.newaxis]
+        sbti_factor = sbti_factors[np.newaxis, np.newaxis, :]
+        scores = np.where(
+            sbti_validated[:, np.newaxis, np.newaxis],
+            ts,
+            ts * sbti_factor + fallback_score * (1 - sbti_factor),
+        )
+        scores = np.where(
+            missing.values[:, np.newaxis, np.newaxis], fallback_score, scores
+        ).reshape(len(data), -1)
+        score_columns = ["score_{}".format(i) for i in range(scores.shape[1])]
+        data = pd.concat(
+            [data, pd.DataFrame(scores, index=data.index, columns=score_columns)],
+            axis=1,
+        )
+        data = self._fill_sparse_grid(data)
+
+        if EScope.S1S2S3 in self.scopes:
+            data = self._calculate_company_score(data, score_columns)
+        data = data[data[self.c.COLS.SCOPE].isin(self.scopes)].reset_index(drop=True)
+
+        # The portfolio weight of each company doesn't depend on its score, so all grid points are aggregated at once
+        subsets = self._get_subsets(data)
+        portfolio_weights = self._weigh_scores(
+            self._calculate_weights(data, [self.aggregation_method]),
+            pd.Series(1.0, index=data.index),
+            self.aggregation_method,
+            subsets,
+        )
+        aggregated_scores = (
+            data[score_columns]
+            .round(2)
+            .multiply(portfolio_weights, axis=0)
+            .groupby(subsets)
+            .sum()
+        )
+        result = np.full(
+            (len(self.time_frames) * len(self.scopes), len(score_columns)), np.nan
+        )
+        result[aggregated_scores.index.values] = aggregated_scores.values
+        return result.reshape(
+            len(self.time_frames),
+            len(self.scopes),
+            len(fallback_scores),
+            len(sbti_factors),
+        ).transpose(2, 3, 0, 1)
+
+    def _get_cache_key(self, method: str, data: pd.DataFrame, *settings) -> str:
+        """
+        Get the key of a result in the cache, based on the input data, the settings and reference data of this
+        temperature score and the version of the package.
+
+        :param method: The name of the method that calculates the result
+        :param data: The input data of the method
+        :param settings: Additional settings that the result depends on
+        :return: The key of the result
+        """
+        scenario = None
+        if self.scenario is not None:
+            scenario = (self.scenario.scenario_type, self.scenario.engagement_type)
+        return cache.get_key(
+            cache.get_package_version(),
+            method,
+            data,
+            self.c,
+            self.regression_model,
+            # The SR15 mapping is only loaded when it's used, so it's keyed by the version of its file
+            reference_data.get_table_version(self.c.FILE_SR15_MAPPING),
+            self.model,
+            self.time_frames,
+            self.scopes,
+            scenario,
+            self.fallback_score,
+            self.aggregation_method,
+            *settings,
+        )
+
+    def _get_data(
+        self,
+        data: Optional[pd.DataFrame],
+        data_providers: Optional[List[data.DataProvider]],
+        portfolio: Optional[List[PortfolioCompany]],
+    ) -> pd.DataFrame:
+        """
+        Get the data set, retrieving it from the data providers if it isn't passed.
+
+        :param data: The data set (or None if the data should be retrieved)
+        :param data_providers: A list of DataProvider instances. Optional, only required if data is empty.
+        :param portfolio: A list of PortfolioCompany models. Optional, only required if data is empty.
+        :return: The data set
+        """
         if data is None:
             if data_providers is not None and portfolio is not None:
                 data = utils.get_data(data_providers, portfolio)
@@ -492,125 +1162,366 @@ class TemperatureScore(PortfolioAggregation):
                 raise ValueError(
                     "You need to pass and either a data set or a list of data providers and companies"
                 )
+        return data
 
-        data = self._prepare_data(data)
+    def _combine_scores(
+        self, data: pd.DataFrame, key_columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Combine the scores of the targets into the scores of the requested scopes.
 
+        :param data: The scored targets, see _prepare_data
+        :param key_columns: Additional columns that the scores of a company depend on (e.g. the regression model)
+        :return: A data frame containing all relevant information for the targets and companies
+        """
         if EScope.S1S2S3 in self.scopes:
             # self._check_column(data, self.c.COLS.GHG_SCOPE12)
             # self._check_column(data, self.c.COLS.GHG_SCOPE3)
-            data = self._calculate_company_score(data)
+            data = self._calculate_company_score(data, key_columns=key_columns)
 
         # We need to filter the scopes again, because we might have had to add a scope in te preparation step
         data = data[data[self.c.COLS.SCOPE].isin(self.scopes)]
         data[self.c.COLS.TEMPERATURE_SCORE] = data[self.c.COLS.TEMPERATURE_SCORE].round(
             2
         )
+        # The time frames and scopes are only encoded during the calculation, the results hold the enum members
+        data[self.c.COLS.TIME_FRAME] = data[self.c.COLS.TIME_FRAME].astype(object)
+        data[self.c.COLS.SCOPE] = data[self.c.COLS.SCOPE].astype(object)
         return data
 
     def _get_aggregations(
-        self, data: pd.DataFrame, total_companies: int
-    ) -> Tuple[Aggregation, pd.Series, pd.Series]:
+        self,
+        data: pd.DataFrame,
+        groups: pd.Series,
+        total_companies: pd.Series,
+        weighted_scores: pd.Series,
+        top_n: Optional[int] = None,
+    ) -> Dict[int, Aggregation]:
         """
-        Get the aggregated score over a certain data set. Also calculate the (relative) contribution of each company
+        Get the aggregated score of each group of companies. Also calculate the (relative) contribution of each company
+        to the score of its group.
 
         :param data: A data set, containing one row per company
-        :return: An aggregated score and the relative and absolute contribution of each company
+        :param groups: The (integer) group of each company
+        :param total_companies: The number of companies in the time frame and scope of each company
+        :param weighted_scores: The weighted scores of the companies, where each group is weighed on its own
+        :param top_n: Only keep the contributions of the n highest contributors (None to keep all contributions)
+        :return: The aggregated score of each group
         """
-        data = data.copy()
-        weighted_scores = self._calculate_aggregate_score(
-            data, self.c.COLS.TEMPERATURE_SCORE, self.aggregation_method
+        if data.empty:
+            return {}
+
+        scores = weighted_scores.groupby(groups).sum()
+        contributions = pd.DataFrame(
+            {
+                self.c.COLS.COMPANY_NAME: data[self.c.COLS.COMPANY_NAME],
+                self.c.COLS.COMPANY_ID: data[self.c.COLS.COMPANY_ID],
+                self.c.COLS.TEMPERATURE_SCORE: data[self.c.COLS.TEMPERATURE_SCORE],
+                self.c.COLS.CONTRIBUTION_RELATIVE: weighted_scores
+                / (groups.map(scores) / 100),
+                self.c.COLS.CONTRIBUTION: weighted_scores,
+            }
         )
-        data[self.c.COLS.CONTRIBUTION_RELATIVE] = weighted_scores / (
-            weighted_scores.sum() / 100
-        )
-        data[self.c.COLS.CONTRIBUTION] = weighted_scores
-        contributions = (
-            data.sort_values(self.c.COLS.CONTRIBUTION_RELATIVE, ascending=False)
-            .where(pd.notnull(data), None)
-            .to_dict(orient="records")
+
+        # Sort the companies by group in a single, stable sort, so each group is a consecutive slice of the
+        # contributions. The contributions within a group are only sorted when they're accessed.
+        order = np.argsort(groups.values, kind="stable")
+        contributions = contributions.iloc[order]
+        sorted_groups = groups.values[order]
+        sorted_total_companies = total_companies.values[order]
+
+        boundaries = np.flatnonzero(np.diff(sorted_groups)) + 1
+        aggregations = {}
+        for start, end in zip(
+            np.r_[0, boundaries], np.r_[boundaries, len(sorted_groups)]
+        ):
+            group = sorted_groups[start]
+            aggregations[group] = Aggregation.from_frame(
+                score=scores[group],
+                proportion=(end - start) / (sorted_total_companies[start] / 100.0),
+                contributions=contributions.iloc[start:end],
+                top_n=top_n,
+            )
+        return aggregations
+
+    def _get_subsets(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Get the time frame and scope of each company as a single integer, so the companies can be grouped by their time
+        frame and scope at once.
+
+        :param data: The data set, containing only the time frames and scopes of this temperature score
+        :return: The time frame and scope of each company
+        """
+        time_frames = (
+            data[self.c.COLS.TIME_FRAME]
+            .astype(pd.CategoricalDtype(self.time_frames))
+            .cat.codes.astype(np.int64)
         )
-        return (
-            Aggregation(
-                score=weighted_scores.sum(),
-                proportion=len(weighted_scores) / (total_companies / 100.0),
-                contributions=[
-                    AggregationContribution.parse_obj(contribution)
-                    for contribution in contributions
-                ],
-            ),
-            data[self.c.COLS.CONTRIBUTION_RELATIVE],
-            data[self.c.COLS.CONTRIBUTION],
+        scopes = (
+            data[self.c.COLS.SCOPE]
+            .astype(pd.CategoricalDtype(self.scopes))
+            .cat.codes.astype(np.int64)
         )
+        return time_frames * len(self.scopes) + scopes
+
+    def _get_top_contributors(self, scores: pd.DataFrame) -> np.ndarray:
+        """
+        Find the highest contributors to the portfolio score of each time frame and scope. These are the companies that
+        aggregate_scores would list first in its contributions, so companies with the same contribution are ranked by
+        their company id, but only the contributions are calculated. A company is engaged as a whole, so all of its rows
+        in the time frame and scope are selected (e.g. when the portfolio holds it twice).
 
-    def _get_score_aggregation(
-        self, data: pd.DataFrame, time_frame: ETimeFrames, scope: EScope
-    ) -> Optional[ScoreAggregation]:
+        :param scores: The data set with the temperature scores
+        :return: A boolean mask, which is True for the rows of the highest contributors
         """
-        Get a score aggregation for a certain time frame and scope, for the data set as a whole and for the different
-        groupings.
+        data = self._select_grid(
+            scores.reset_index(drop=True), self.time_frames, self.scopes
+        )
+        subsets = self._get_subsets(data)
+        weighted_scores = self._weigh_scores(
+            self._calculate_weights(data, [self.aggregation_method]),
+            data[self.c.COLS.TEMPERATURE_SCORE],
+            self.aggregation_method,
+            subsets,
+        )
+        contributions = weighted_scores / (
+            weighted_scores.groupby(subsets).transform("sum") / 100
+        )
+        ranked = pd.DataFrame(
+            {
+                "subset": subsets,
+                self.c.COLS.CONTRIBUTION_RELATIVE: contributions,
+                self.c.COLS.COMPANY_ID: data[self.c.COLS.COMPANY_ID],
+            }
+        ).sort_values(
+            ["subset", self.c.COLS.CONTRIBUTION_RELATIVE, self.c.COLS.COMPANY_ID],
+            ascending=[True, False, True],
+        )
+        top_contributors = ranked.index[
+            ranked.groupby("subset").cumcount().values < self.c.NUMBER_TOP_CONTRIBUTORS
+        ]
+        is_top_contributor = (
+            pd.Series(data.index.isin(top_contributors), index=data.index)
+            .groupby([subsets, data[self.c.COLS.COMPANY_NAME]])
+            .transform("any")
+        )
+        mask = np.zeros(len(scores), dtype=bool)
+        mask[data.index[is_top_contributor.values]] = True
+        return mask
 
-        :param data: The whole data set
-        :param time_frame: A time frame
-        :param scope: A scope
-        :return: A score aggregation, containing the aggregations for the whole data set and each individual group
+    def _get_score_aggregations(
+        self,
+        data: pd.DataFrame,
+        weights: pd.DataFrame,
+        aggregation_method: PortfolioAggregationMethod,
+        top_n: Optional[int] = None,
+    ) -> Dict[Tuple[ETimeFrames, EScope], ScoreAggregation]:
         """
-        filtered_data = data[
-            (data[self.c.COLS.TIME_FRAME] == time_frame)
-            & (data[self.c.COLS.SCOPE] == scope)
-        ].copy()
-        filtered_data[self.grouping] = filtered_data[self.grouping].fillna("unknown")
-        total_companies = len(filtered_data)
-        if not filtered_data.empty:
+        Get the score aggregations of all time frames and scopes, for the data set as a whole and for the different
+        groupings. Rather than filtering the data set for every time frame, scope and group, every company is assigned
+        an integer group, so all aggregations can be calculated with a single groupby.
+
+        :param data: The whole data set, containing only the time frames and scopes of this temperature score
+        :param weights: The weights of the companies in the data set, see _calculate_weights
+        :param aggregation_method: The aggregation method to use
+        :param top_n: Only keep the contributions of the n highest contributors (None to keep all contributions)
+        :return: A score aggregation for each time frame and scope that has data, containing the aggregations for the
+        whole data set and each individual group
+        """
+        if data.empty:
+            return {}
+
+        subsets = self._get_subsets(data)
+        total_companies = subsets.groupby(subsets).transform("size")
+        aggregations_all = self._get_aggregations(
+            data,
+            subsets,
+            total_companies,
+            self._weigh_scores(
+                weights,
+                data[self.c.COLS.TEMPERATURE_SCORE],
+                aggregation_method,
+                subsets,
+            ),
+            top_n,
+        )
+        influence_percentages = (
+            self._weigh_scores(
+                weights, data[self.c.TEMPERATURE_RESULTS], aggregation_method, subsets
+            )
+            .groupby(subsets)
+            .sum()
+            * 100
+        )
+
+        # If there are grouping column(s), each group within a time frame and scope gets its own integer as well
+        grouped: Dict[int, Dict[str, Aggregation]] = {
+            subset: {} for subset in aggregations_all
+        }
+        if len(self.grouping) > 0:
+            grouping = data[self.grouping].fillna("unknown")
+            group_codes = grouping.groupby(self.grouping).ngroup()
+            group_names = (
+                grouping.groupby(group_codes)
+                .first()
+                .astype(str)
+                .agg("-".join, axis=1)
+            )
+            groups = subsets * len(group_names) + group_codes
+            aggregations_grouped = self._get_aggregations(
+                data,
+                groups,
+                total_companies,
+                self._weigh_scores(
+                    weights,
+                    data[self.c.COLS.TEMPERATURE_SCORE],
+                    aggregation_method,
+                    groups,
+                ),
+                top_n,
+            )
+            for group, aggregation in aggregations_grouped.items():
+                subset, group_code = divmod(group, len(group_names))
+                grouped[subset][group_names[group_code]] = aggregation
+
+        return {
             (
-                score_aggregation_all,
-                filtered_data[self.c.COLS.CONTRIBUTION_RELATIVE],
-                filtered_data[self.c.COLS.CONTRIBUTION],
-            ) = self._get_aggregations(filtered_data, total_companies)
-            score_aggregation = ScoreAggregation(
-                grouped={},
-                all=score_aggregation_all,
-                influence_percentage=self._calculate_aggregate_score(
-                    filtered_data, self.c.TEMPERATURE_RESULTS, self.aggregation_method
-                ).sum()
-                * 100,
-            )
-
-            # If there are grouping column(s) we'll group in pandas and pass the results to the aggregation
-            if len(self.grouping) > 0:
-                grouped_data = filtered_data.groupby(self.grouping)
-                for group_names, group in grouped_data:
-                    group_name_joined = (
-                        group_names
-                        if type(group_names) == str
-                        else "-".join([str(group_name) for group_name in group_names])
-                    )
-                    (
-                        score_aggregation.grouped[group_name_joined],
-                        _,
-                        _,
-                    ) = self._get_aggregations(group.copy(), total_companies)
-            return score_aggregation
-        else:
-            return None
+                self.time_frames[subset // len(self.scopes)],
+                self.scopes[subset % len(self.scopes)],
+            ): ScoreAggregation(
+                all=aggregation,
+                influence_percentage=influence_percentages[subset],
+                grouped=grouped[subset],
+            )
+            for subset, aggregation in aggregations_all.items()
+        }
 
-    def aggregate_scores(self, data: pd.DataFrame) -> ScoreAggregations:
+    def aggregate_scores(
+        self, data: pd.DataFrame, top_n: Optional[int] = None
+    ) -> ScoreAggregations:
         """
         Aggregate scores to create a portfolio score per time_frame (short, mid, long).
 
         :param data: The results of the calculate method
+        :param top_n: Only keep the contributions of the n highest contributors of each aggregation (None to keep all
+        contributions)
+        :return: A weighted temperature score for the portfolio
+        """
+        if self.cache is None:
+            return self.aggregate_scores_by_method(
+                data, [self.aggregation_method], top_n
+            )[self.aggregation_method]
+        return self.cache.cached(
+            self._get_cache_key("aggregate_scores", data, self.grouping, top_n),
+            lambda: self.aggregate_scores_by_method(
+                data, [self.aggregation_method], top_n
+            )[self.aggregation_method],
+        )
+
+    def reaggregate_scores(
+        self,
+        scores: pd.DataFrame,
+        holdings: Union[pd.DataFrame, List[PortfolioCompany]],
+        top_n: Optional[int] = None,
+    ) -> ScoreAggregations:
+        """
+        Aggregate the results of the calculate method again for new holdings, e.g. when the investment values are
+        updated daily while the targets and fundamentals aren't. The scores of a company don't depend on its investment
+        value, so the data isn't retrieved and the targets aren't scored again, only the aggregation is recalculated.
+        This isn't possible in the highest contributors scenario, because the capped scores depend on the holdings.
+
+        :param scores: The results of the calculate method
+        :param holdings: The new holdings, either a list of PortfolioCompany models or a data frame with a company ID and
+        an investment value column. The investment values of the same company are added up, also when the scores were
+        calculated for a portfolio that held the company more than once. Companies that don't have scores are left out,
+        like they are by the calculate method.
+        :param top_n: Only keep the contributions of the n highest contributors of each aggregation (None to keep all
+        contributions)
         :return: A weighted temperature score for the portfolio
         """
+        if (
+            self.scenario is not None
+            and self.scenario.scenario_type == ScenarioType.HIGHEST_CONTRIBUTORS
+        ):
+            raise ValueError(
+                "The scores can't be reaggregated in combination with the highest contributors scenario"
+            )
+        if not isinstance(holdings, pd.DataFrame):
+            holdings = pd.DataFrame.from_records(
+                [company.dict() for company in holdings],
+                columns=[self.c.COLS.COMPANY_ID, self.c.COLS.INVESTMENT_VALUE],
+            )
+        investment_values = holdings.groupby(self.c.COLS.COMPANY_ID)[
+            self.c.COLS.INVESTMENT_VALUE
+        ].sum()
+        # The scores hold a row per holding, so a company that was held more than once only keeps one row per time
+        # frame and scope, which gets the total investment value of the company
+        scores = scores[
+            scores[self.c.COLS.COMPANY_ID].isin(investment_values.index)
+        ].drop_duplicates(
+            [self.c.COLS.COMPANY_ID, self.c.COLS.TIME_FRAME, self.c.COLS.SCOPE]
+        )
+        scores = scores.assign(
+            **{
+                self.c.COLS.INVESTMENT_VALUE: scores[self.c.COLS.COMPANY_ID].map(
+                    investment_values
+                )
+            }
+        )
+        return self.aggregate_scores(scores, top_n)
+
+    def aggregate_scores_by_method(
+        self,
+        data: pd.DataFrame,
+        aggregation_methods: List[PortfolioAggregationMethod],
+        top_n: Optional[int] = None,
+    ) -> Dict[PortfolioAggregationMethod, ScoreAggregations]:
+        """
+        Aggregate scores to create a portfolio score per time_frame (short, mid, long) for several aggregation methods
+        at once. The scores only need to be calculated once for all methods and the weights of the companies are
+        calculated in one pass. In the highest contributors scenario, the scores are capped for the highest contributors
+        of the aggregation method of this temperature score, so they can't be aggregated with other methods.
+
+        :param data: The results of the calculate method
+        :param aggregation_methods: The aggregation methods to use
+        :param top_n: Only keep the contributions of the n highest contributors of each aggregation (None to keep all
+        contributions)
+        :return: A weighted temperature score for the portfolio, for each of the aggregation methods
+        """
+        if (
+            self.scenario is not None
+            and self.scenario.scenario_type == ScenarioType.HIGHEST_CONTRIBUTORS
+            and any(
+                aggregation_method != self.aggregation_method
+                for aggregation_method in aggregation_methods
+            )
+        ):
+            raise ValueError(
+                "The highest contributors scenario can only be aggregated with its own aggregation method"
+            )
+        data = self._select_grid(data, self.time_frames, self.scopes).reset_index(
+            drop=True
+        )
+        weights = self._calculate_weights(data, aggregation_methods)
 
-        score_aggregations = ScoreAggregations()
-        for time_frame in self.time_frames:
-            score_aggregation_scopes = ScoreAggregationScopes()
-            for scope in self.scopes:
-                score_aggregation_scopes.__setattr__(
-                    scope.name, self._get_score_aggregation(data, time_frame, scope)
+        results = {}
+        for aggregation_method in aggregation_methods:
+            score_aggregation = self._get_score_aggregations(
+                data, weights, aggregation_method, top_n
+            )
+            score_aggregations = ScoreAggregations()
+            for time_frame in self.time_frames:
+                score_aggregation_scopes = ScoreAggregationScopes()
+                for scope in self.scopes:
+                    score_aggregation_scopes.__setattr__(
+                        scope.name, score_aggregation.get((time_frame, scope))
+                    )
+                score_aggregations.__setattr__(
+                    time_frame.value, score_aggregation_scopes
                 )
-            score_aggregations.__setattr__(time_frame.value, score_aggregation_scopes)
+            results[aggregation_method] = score_aggregations
 
-        return score_aggregations
+        return results
 
     def cap_scores(self, scores: pd.DataFrame) -> pd.DataFrame:
         """
@@ -632,33 +1543,12 @@ class TemperatureScore(PortfolioAggregation):
                 lambda x: min(x, self.scenario.get_score_cap())
             )
         elif self.scenario.scenario_type == ScenarioType.HIGHEST_CONTRIBUTORS:
-            # Cap scores of 10 highest contributors per time frame-scope combination
+            # Cap scores of the highest contributors per time frame-scope combination
             # TODO: Should this actually be per time-frame/scope combi? Aren't you engaging the company as a whole?
-            aggregations = self.aggregate_scores(scores)
-            for time_frame in self.time_frames:
-                for scope in self.scopes:
-                    number_top_contributors = min(
-                        10,
-                        len(
-                            aggregations[time_frame.value][scope.name].all.contributions
-                        ),
-                    )
-                    for contributor in range(number_top_contributors):
-                        company_name = aggregations[time_frame.value][
-                            scope.name
-                        ].all.contributions[contributor][self.c.COLS.COMPANY_NAME]
-                        company_mask = (
-                            (scores[self.c.COLS.COMPANY_NAME] == company_name)
-                            & (scores[self.c.COLS.SCOPE] == scope)
-                            & (scores[self.c.COLS.TIME_FRAME] == time_frame)
-                        )
-                        scores.loc[
-                            company_mask, self.c.COLS.TEMPERATURE_SCORE
-                        ] = scores.loc[
-                            company_mask, self.c.COLS.TEMPERATURE_SCORE
-                        ].apply(
-                            lambda x: min(x, self.scenario.get_score_cap())
-                        )
+            top_contributors = self._get_top_contributors(scores)
+            scores.loc[top_contributors, self.c.COLS.TEMPERATURE_SCORE] = scores.loc[
+                top_contributors, self.c.COLS.TEMPERATURE_SCORE
+            ].clip(upper=self.scenario.get_score_cap())
         elif self.scenario.scenario_type == ScenarioType.HIGHEST_CONTRIBUTORS_APPROVED:
             score_based_on_target = scores[self.c.COLS.ENGAGEMENT_TARGET]
             scores.loc[
@@ -668,19 +1558,30 @@ class TemperatureScore(PortfolioAggregation):
             )
         return scores
 
-    def anonymize_data_dump(self, scores: pd.DataFrame) -> pd.DataFrame:
+    def anonymize_data_dump(
+        self, scores: pd.DataFrame, salt: Optional[str] = None
+    ) -> pd.DataFrame:
         """
-        Anonymize the scores by deleting the company IDs, ISIN and renaming the companies.
+        Anonymize the scores by deleting the company IDs, ISIN and renaming the companies. By default, the companies are
+        numbered in the order in which they appear. With a salt, each company is named after a salted hash of its name
+        instead, so a company gets the same name in every data dump that uses the same salt.
 
         :param scores: The data set with the temperature scores
-        :return: The input data frame, anonymized
+        :param salt: The salt to hash the company names with (None to number the companies)
+        :return: A copy of the data frame, anonymized
         """
-        scores.drop(
-            columns=[self.c.COLS.COMPANY_ID, self.c.COLS.COMPANY_ISIN], inplace=True
-        )
-        for index, company_name in enumerate(scores[self.c.COLS.COMPANY_NAME].unique()):
-            scores.loc[
-                scores[self.c.COLS.COMPANY_NAME] == company_name,
-                self.c.COLS.COMPANY_NAME,
-            ] = "Company" + str(index + 1)
+        scores = scores.drop(columns=[self.c.COLS.COMPANY_ID, self.c.COLS.COMPANY_ISIN])
+        # Every company only has to be named once, the rows get the name of their company by its code
+        codes, company_names = pd.factorize(scores[self.c.COLS.COMPANY_NAME])
+        if salt is None:
+            names = ["Company" + str(index + 1) for index in range(len(company_names))]
+        else:
+            hashes = [
+                hashlib.sha256((salt + str(company_name)).encode("utf-8")).hexdigest()
+                for company_name in company_names
+            ]
+            names = ["Company" + h[: self.c.ANONYMIZED_HASH_LENGTH] for h in hashes]
+        scores[self.c.COLS.COMPANY_NAME] = np.append(
+            np.array(names, dtype=object), np.nan
+        )[codes]
         return scores
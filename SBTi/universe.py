@@ -0,0 +1,170 @@
+"""
+This module scores a universe of companies once, so the portfolios that are drawn from it (e.g. all funds of an asset
+manager) only have to be aggregated. The scores of a company don't depend on the portfolios that hold it, so the data is
+only retrieved, validated and scored once for the whole universe, instead of once for every portfolio.
+
+The scores are stored with the version of everything they were calculated from: the data versions of the providers
+(see DataProvider.get_data_version), the SBTi targets file, the current year (the time frames of the targets depend on
+it), the universe and the settings of the temperature score. Whenever any of these changes, the scores are calculated
+again. A data provider that doesn't know the version of its data is never assumed to be unchanged, so its scores are
+calculated again on every refresh and they aren't persisted.
+
+    universe = UniverseScores(temperature_score, data_providers, companies, path="/var/lib/sbti/universe.pkl")
+    universe.refresh()  # E.g. once a day, before the portfolios are aggregated
+    for holdings in funds:
+        aggregations = universe.aggregate(holdings)
+"""
+import datetime
+import logging
+import os
+import pickle
+import tempfile
+from typing import List, Optional, Tuple, Union
+
+import pandas as pd
+
+from . import reference_data
+from .data import DataProvider
+from .interfaces import PortfolioCompany, ScoreAggregations
+from .temperature_score import TemperatureScore
+
+
+class UniverseScores:
+    """
+    The scores of a universe of companies, which are calculated once and shared by all portfolios that are drawn from
+    the universe. The portfolios are aggregated with the settings of the temperature score (see
+    TemperatureScore.reaggregate_scores), so the highest contributors scenario isn't supported.
+
+    :param temperature_score: The temperature score to calculate the scores and aggregate the portfolios with
+    :param data_providers: A list of DataProvider instances
+    :param universe: The companies in the universe, as PortfolioCompany models (their investment values aren't used)
+    :param path: The file to persist the scores in (None to only keep them in memory)
+    """
+
+    def __init__(
+        self,
+        temperature_score: TemperatureScore,
+        data_providers: List[DataProvider],
+        universe: List[PortfolioCompany],
+        path: Optional[str] = None,
+    ):
+        self.temperature_score = temperature_score
+        self.data_providers = data_providers
+        self.universe = universe
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._version: Optional[str] = None
+        self._scores: Optional[pd.DataFrame] = None
+
+    def get_version(self) -> Optional[str]:
+        """
+        Get the version of everything the scores of the universe are calculated from.
+
+        :return: The version of the scores (None if one of the data providers doesn't know the version of its data)
+        """
+        data_versions = [
+            data_provider.get_data_version() for data_provider in self.data_providers
+        ]
+        if any(data_version is None for data_version in data_versions):
+            return None
+        return self.temperature_score._get_cache_key(
+            "universe",
+            pd.DataFrame.from_records(
+                [
+                    company.dict(exclude={"investment_value", "user_fields"})
+                    for company in self.universe
+                ]
+            ),
+            [company.user_fields for company in self.universe],
+            data_versions,
+            reference_data.get_sbti_validated().to_frame(),
+            datetime.datetime.now().year,
+        )
+
+    def get_scores(self) -> pd.DataFrame:
+        """
+        Get the scores of the universe, which are loaded or calculated on first use. After that, the scores are only
+        checked for changes in the data when the universe is refreshed.
+
+        :return: The results of TemperatureScore.calculate for the universe
+        """
+        if self._scores is None:
+            self.refresh()
+        return self._scores
+
+    def refresh(self) -> bool:
+        """
+        Check whether the version of the scores changed and, if it did, load the stored scores of the new version or
+        calculate them again.
+
+        :return: Whether the scores were calculated again
+        """
+        version = self.get_version()
+        if version is not None and version == self._version:
+            return False
+        if version is not None and self.path is not None:
+            stored = self._read()
+            if stored is not None and stored[0] == version:
+                self._version, self._scores = stored
+                return False
+
+        self._scores = self.temperature_score.calculate(
+            data_providers=self.data_providers, portfolio=self.universe
+        )
+        self._version = version
+        if version is not None and self.path is not None:
+            self._write()
+        return True
+
+    def aggregate(
+        self,
+        holdings: Union[pd.DataFrame, List[PortfolioCompany]],
+        top_n: Optional[int] = None,
+    ) -> ScoreAggregations:
+        """
+        Aggregate the scores of a portfolio that's drawn from the universe.
+
+        :param holdings: The holdings of the portfolio, either a list of PortfolioCompany models or a data frame with a
+        company ID and an investment value column. Companies that aren't in the universe are left out.
+        :param top_n: Only keep the contributions of the n highest contributors of each aggregation (None to keep all
+        contributions)
+        :return: A weighted temperature score for the portfolio
+        """
+        return self.temperature_score.reaggregate_scores(
+            self.get_scores(), holdings, top_n
+        )
+
+    def _read(self) -> Optional[Tuple[str, pd.DataFrame]]:
+        """
+        Read the stored scores.
+
+        :return: The version and the scores (None if there are no stored scores or they can't be read)
+        """
+        if not os.path.isfile(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            # E.g. scores that were stored by another version of the package
+            self.logger.warning(
+                "Couldn't read the stored scores {}: {}".format(self.path, e)
+            )
+            return None
+
+    def _write(self):
+        """
+        Store the scores. They're written to a temporary file first, so other processes never read partially written
+        scores.
+        """
+        try:
+            handle, temporary_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.path))
+            )
+            with os.fdopen(handle, "wb") as f:
+                pickle.dump(
+                    (self._version, self._scores), f, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(temporary_path, self.path)
+        except OSError as e:
+            self.logger.warning("Couldn't store the scores {}: {}".format(self.path, e))
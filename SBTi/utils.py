@@ -183,13 +183,16 @@ def dataframe_to_portfolio(df_portfolio: pd.DataFrame) -> List[PortfolioCompany]
 
 
 def get_data(
-    data_providers: List[data.DataProvider], portfolio: List[PortfolioCompany]
+    data_providers: List[data.DataProvider],
+    portfolio: List[PortfolioCompany],
+    sparse: bool = False,
 ) -> pd.DataFrame:
     """
     Get the required data from the data provider(s), validate the targets and return a 9-box grid for each company.
 
     :param data_providers: A list of DataProvider instances
     :param portfolio: A list of PortfolioCompany models
+    :param sparse: Whether to return a sparse grid, which only contains the cells with a target and one row per company
     :return: A data frame containing the relevant company-target data
     """
     df_portfolio = pd.DataFrame.from_records(
@@ -205,7 +208,7 @@ def get_data(
     company_data = SBTi().get_sbti_targets(company_data, _make_isin_map(df_portfolio))
 
     # Prepare the data
-    portfolio_data = TargetProtocol().process(target_data, company_data)
+    portfolio_data = TargetProtocol(sparse=sparse).process(target_data, company_data)
     portfolio_data = pd.merge(
         left=portfolio_data,
         right=df_portfolio.drop("company_name", axis=1),
@@ -231,6 +234,8 @@ def calculate(
     scopes: List[EScope],
     anonymize: bool,
     aggregate: bool = True,
+    top_n: Optional[int] = None,
+    anonymize_salt: Optional[str] = None,
 ) -> Tuple[pd.DataFrame, Optional[ScoreAggregations]]:
     """
     Calculate the different parts of the temperature score (actual scores, aggregations, column distribution).
@@ -244,6 +249,8 @@ def calculate(
     :param scenario: The scenario to play
     :param anonymize: Whether to anonymize the resulting data set or not
     :param aggregate: Whether to aggregate the scores or not
+    :param top_n: Only keep the contributions of the n highest contributors of each aggregation (None to keep all)
+    :param anonymize_salt: The salt to hash the company names with when anonymizing (None to number the companies)
     :return: The scores, the aggregations and the column distribution (if a
     """
     ts = TemperatureScore(
@@ -258,9 +265,9 @@ def calculate(
     scores = ts.calculate(portfolio_data)
     aggregations = None
     if aggregate:
-        aggregations = ts.aggregate_scores(scores)
+        aggregations = ts.aggregate_scores(scores, top_n)
 
     if anonymize:
-        scores = ts.anonymize_data_dump(scores)
+        scores = ts.anonymize_data_dump(scores, anonymize_salt)
 
     return scores, aggregations
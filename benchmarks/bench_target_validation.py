@@ -0,0 +1,210 @@
+"""
+Benchmark the target protocol on a synthetic universe.
+
+Usage: python -m benchmarks.bench_target_validation [nr_companies]
+"""
+import copy
+import sys
+import time
+import warnings
+from typing import List
+
+import pandas as pd
+
+from SBTi.configs import ColumnsConfig
+from SBTi.interfaces import EScope, ETimeFrames, IDataProviderTarget
+from SBTi.target_validation import TargetProtocol
+from SBTi.temperature_score import TemperatureScore
+from benchmarks.universe import make_universe
+
+
+def bench_group_targets(nr_companies: int):
+    """
+    Compare the vectorized target selection with the row by row selection of the 9-box grid.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, _ = make_universe(nr_companies)
+    results = {}
+    for vectorized in [False, True]:
+        protocol = TargetProtocol(vectorized=vectorized)
+        protocol.target_data = pd.DataFrame.from_records(
+            [
+                target.dict()
+                for target in protocol.prepare_targets(copy.deepcopy(targets))
+            ]
+        )
+        if not vectorized:
+            protocol.target_data.index = protocol.target_data.set_index(
+                ["company_id", "time_frame", "scope"]
+            ).index
+            protocol.target_data = protocol.target_data.sort_index()
+        protocol.company_data = pd.DataFrame.from_records(
+            [company.dict() for company in companies]
+        )
+
+        start = time.perf_counter()
+        protocol.group_targets()
+        results[vectorized] = (time.perf_counter() - start, protocol.data)
+
+    pd.testing.assert_frame_equal(results[False][1], results[True][1])
+    print(
+        "group_targets, {} companies: apply {:.3f}s, vectorized {:.3f}s ({:.0f}x)".format(
+            nr_companies,
+            results[False][0],
+            results[True][0],
+            results[False][0] / results[True][0],
+        )
+    )
+
+
+def bench_prepare_targets(nr_companies: int):
+    """
+    Compare the column-wise target preparation with the target by target preparation.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    _, targets, _ = make_universe(nr_companies)
+
+    start = time.perf_counter()
+    expected = TargetProtocol(vectorized=False).prepare_targets(copy.deepcopy(targets))
+    duration_objects = time.perf_counter() - start
+
+    start = time.perf_counter()
+    target_data = pd.DataFrame.from_records(
+        [target.dict() for target in targets],
+        columns=list(IDataProviderTarget.__fields__),
+    )
+    duration_records = time.perf_counter() - start
+    result = TargetProtocol().prepare_targets_vectorized(target_data)
+    duration_vectorized = time.perf_counter() - start - duration_records
+
+    pd.testing.assert_frame_equal(
+        result,
+        pd.DataFrame.from_records([target.dict() for target in expected]),
+        check_dtype=False,
+    )
+    print(
+        "prepare_targets, {} targets: objects {:.3f}s, vectorized {:.3f}s (+{:.3f}s to create the data frame)".format(
+            len(targets), duration_objects, duration_vectorized, duration_records
+        )
+    )
+
+
+def bench_process_frames(nr_companies: int):
+    """
+    Compare processing the models of a universe with processing the same data as data frames.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, _ = make_universe(nr_companies)
+    target_data = pd.DataFrame.from_records(
+        [target.dict() for target in targets],
+        columns=list(IDataProviderTarget.__fields__),
+    )
+    # Providers hold their data in their own format, e.g. the scopes as strings
+    target_data["scope"] = target_data["scope"].map(lambda scope: scope.value)
+    company_data = pd.DataFrame.from_records([company.dict() for company in companies])
+
+    start = time.perf_counter()
+    expected = TargetProtocol().process(targets, companies)
+    duration_models = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = TargetProtocol().process_frames(target_data, company_data)
+    duration_frames = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    print(
+        "process, {} targets: models {:.3f}s, data frames {:.3f}s".format(
+            len(targets), duration_models, duration_frames
+        )
+    )
+
+
+def bench_sparse_grid(nr_companies: int):
+    """
+    Compare the size of the full 9-box grid with the sparse grid for a universe in which most companies have no targets,
+    and the time it takes to calculate the temperature scores of both.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, _ = make_universe(nr_companies, targets_per_company=0.3)
+    ts = TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    )
+    results = {}
+    for sparse in [False, True]:
+        data = TargetProtocol(sparse=sparse).process(copy.deepcopy(targets), companies)
+        start = time.perf_counter()
+        scores = ts.calculate(data)
+        results[sparse] = (
+            len(data),
+            data.memory_usage(deep=True).sum() / 1e6,
+            time.perf_counter() - start,
+            scores,
+        )
+
+    # The cells without a target aren't mapped onto the regression model in a sparse grid
+    target_columns = [
+        ColumnsConfig.SR15,
+        ColumnsConfig.SLOPE,
+    ] + ts.regression_model.columns.tolist()
+    pd.testing.assert_frame_equal(
+        results[False][3].drop(columns=target_columns),
+        results[True][3].drop(columns=target_columns),
+    )
+    print(
+        "sparse grid, {} companies: {} rows ({:.1f}MB) instead of {} rows ({:.1f}MB), "
+        "calculate {:.3f}s instead of {:.3f}s".format(
+            nr_companies,
+            results[True][0],
+            results[True][1],
+            results[False][0],
+            results[False][1],
+            results[True][2],
+            results[False][2],
+        )
+    )
+
+
+def bench_combine_scaling(sizes: List[int]):
+    """
+    Time the S1/S2 combination step of the target by target preparation for a growing number of targets. With the S2
+    index the time per target should stay (roughly) constant, i.e. the total time grows linearly.
+
+    :param sizes: The numbers of companies in the universes
+    """
+    for nr_companies in sizes:
+        _, targets, _ = make_universe(nr_companies)
+        protocol = TargetProtocol(vectorized=False)
+        combine = protocol._combine_s1_s2
+        duration = 0.0
+
+        def timed_combine(target):
+            nonlocal duration
+            start = time.perf_counter()
+            result = combine(target)
+            duration += time.perf_counter() - start
+            return result
+
+        protocol._combine_s1_s2 = timed_combine
+        protocol.prepare_targets(copy.deepcopy(targets))
+        print(
+            "_combine_s1_s2, {} targets ({} S2): {:.3f}s, {:.2f}us per target".format(
+                len(targets),
+                len(protocol.s2_targets),
+                duration,
+                duration / len(targets) * 1e6,
+            )
+        )
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    bench_group_targets(size)
+    bench_prepare_targets(size * 10)
+    bench_process_frames(size * 10)
+    bench_sparse_grid(size)
+    bench_combine_scaling([size, size * 2, size * 4, size * 8])
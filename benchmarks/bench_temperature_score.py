@@ -0,0 +1,716 @@
+"""
+Benchmark the temperature score on a synthetic universe.
+
+Usage: python -m benchmarks.bench_temperature_score [nr_companies]
+"""
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from SBTi.cache import ResultCache
+from SBTi.configs import TemperatureScoreConfig
+from SBTi.interfaces import EScope, ETimeFrames
+from SBTi.portfolio_aggregation import PortfolioAggregationMethod
+from SBTi.target_validation import TargetProtocol
+from SBTi.temperature_score import (
+    EngagementType,
+    Scenario,
+    ScenarioType,
+    TemperatureScore,
+)
+from benchmarks.universe import make_universe
+
+
+def bench_scoring_kernel(nr_companies: int):
+    """
+    Compare the vectorized scoring kernel with applying the scoring functions to every row of the data set.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, _ = make_universe(nr_companies)
+    data = TargetProtocol().process(targets, companies)
+    ts = TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    )
+    data[ts.c.COLS.TARGET_REFERENCE_NUMBER] = data[
+        ts.c.COLS.TARGET_REFERENCE_NUMBER
+    ].fillna(ts.c.VALUE_TARGET_REFERENCE_ABSOLUTE)
+
+    start = time.perf_counter()
+    expected = data.copy()
+    expected[ts.c.COLS.SR15] = expected.apply(ts.get_target_mapping, axis=1)
+    expected[ts.c.COLS.ANNUAL_REDUCTION_RATE] = expected.apply(
+        ts.get_annual_reduction_rate, axis=1
+    )
+    expected = ts._merge_regression(expected)
+    (
+        expected[ts.c.COLS.TEMPERATURE_SCORE],
+        expected[ts.c.TEMPERATURE_RESULTS],
+    ) = zip(*expected.apply(ts.get_score, axis=1))
+    duration_rows = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = data.copy()
+    result[ts.c.COLS.SR15] = ts.get_target_mappings(result)
+    result[ts.c.COLS.ANNUAL_REDUCTION_RATE] = ts.get_annual_reduction_rates(result)
+    result = ts._merge_regression(result)
+    (
+        result[ts.c.COLS.TEMPERATURE_SCORE],
+        result[ts.c.TEMPERATURE_RESULTS],
+    ) = ts.get_scores(result)
+    duration_vectorized = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(result, expected)
+    print(
+        "scoring kernel, {} rows: apply {:.3f}s, vectorized {:.3f}s ({:.0f}x)".format(
+            len(data),
+            duration_rows,
+            duration_vectorized,
+            duration_rows / duration_vectorized,
+        )
+    )
+
+
+def bench_company_score(nr_companies: int):
+    """
+    Compare the column-wise combination of the S1S2 and S3 scores with combining them row by row.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, _ = make_universe(nr_companies)
+    ts = TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    )
+    data = ts._prepare_data(TargetProtocol().process(targets, companies))
+
+    start = time.perf_counter()
+    company_data = (
+        data[
+            [
+                ts.c.COLS.COMPANY_ID,
+                ts.c.COLS.TIME_FRAME,
+                ts.c.COLS.SCOPE,
+                ts.c.COLS.GHG_SCOPE12,
+                ts.c.COLS.GHG_SCOPE3,
+                ts.c.COLS.TEMPERATURE_SCORE,
+                ts.c.TEMPERATURE_RESULTS,
+            ]
+        ]
+        .groupby([ts.c.COLS.COMPANY_ID, ts.c.COLS.TIME_FRAME, ts.c.COLS.SCOPE])
+        .mean()
+    )
+    expected = data.copy()
+    expected[ts.c.COLS.TEMPERATURE_SCORE], expected[ts.c.TEMPERATURE_RESULTS] = zip(
+        *expected.apply(
+            lambda row: ts.get_ghc_temperature_score(row, company_data), axis=1
+        )
+    )
+    duration_rows = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = ts._calculate_company_score(data.copy())
+    duration_vectorized = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(result, expected)
+    print(
+        "company score, {} rows: apply {:.3f}s, vectorized {:.3f}s ({:.0f}x)".format(
+            len(data),
+            duration_rows,
+            duration_vectorized,
+            duration_rows / duration_vectorized,
+        )
+    )
+
+
+def bench_aggregations_by_method(nr_companies: int):
+    """
+    Compare aggregating the scores with all aggregation methods at once with running a temperature score for each of
+    them.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, portfolio = make_universe(nr_companies)
+    data = pd.merge(
+        left=TargetProtocol().process(targets, companies),
+        right=pd.DataFrame.from_records([company.dict() for company in portfolio]).drop(
+            columns=["company_name", "user_fields"]
+        ),
+        how="left",
+        on="company_id",
+    )
+    methods = list(PortfolioAggregationMethod)
+
+    start = time.perf_counter()
+    expected = {}
+    for method in methods:
+        ts = TemperatureScore(
+            time_frames=list(ETimeFrames),
+            scopes=EScope.get_result_scopes(),
+            aggregation_method=method,
+        )
+        expected[method] = ts.aggregate_scores(ts.calculate(data))
+    duration_separate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ts = TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    )
+    result = ts.aggregate_scores_by_method(ts.calculate(data), methods)
+    duration_combined = time.perf_counter() - start
+
+    assert result == expected
+    print(
+        "{} aggregation methods, {} companies: separately {:.3f}s, at once {:.3f}s".format(
+            len(methods), nr_companies, duration_separate, duration_combined
+        )
+    )
+
+
+def bench_grouped_aggregation(nr_companies: int):
+    """
+    Compare the time it takes to aggregate the scores per sector and region with the time it takes to calculate them.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, portfolio = make_universe(nr_companies)
+    data = pd.merge(
+        left=TargetProtocol().process(targets, companies),
+        right=pd.DataFrame.from_records([company.dict() for company in portfolio]).drop(
+            columns=["company_name", "user_fields"]
+        ),
+        how="left",
+        on="company_id",
+    )
+    ts = TemperatureScore(
+        time_frames=list(ETimeFrames),
+        scopes=EScope.get_result_scopes(),
+        grouping=["sector", "region"],
+    )
+
+    start = time.perf_counter()
+    scores = ts.calculate(data)
+    duration_calculate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    aggregations = ts.aggregate_scores(scores)
+    duration_aggregate = time.perf_counter() - start
+
+    print(
+        "{} groups, {} companies: calculate {:.3f}s, aggregate {:.3f}s".format(
+            len(aggregations.long.S1S2S3.grouped),
+            nr_companies,
+            duration_calculate,
+            duration_aggregate,
+        )
+    )
+
+
+def bench_highest_contributors_scenario(nr_companies: int):
+    """
+    Compare the time it takes to calculate the scores in the highest contributors scenario with the time it takes to
+    calculate them without a scenario.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, portfolio = make_universe(nr_companies)
+    data = pd.merge(
+        left=TargetProtocol().process(targets, companies),
+        right=pd.DataFrame.from_records([company.dict() for company in portfolio]).drop(
+            columns=["company_name", "user_fields"]
+        ),
+        how="left",
+        on="company_id",
+    )
+    scenario = Scenario()
+    scenario.scenario_type = ScenarioType.HIGHEST_CONTRIBUTORS
+    scenario.engagement_type = EngagementType.SET_TARGETS
+
+    durations = []
+    for ts_scenario in [None, scenario]:
+        ts = TemperatureScore(
+            time_frames=list(ETimeFrames),
+            scopes=EScope.get_result_scopes(),
+            scenario=ts_scenario,
+        )
+        start = time.perf_counter()
+        ts.calculate(data)
+        durations.append(time.perf_counter() - start)
+
+    print(
+        "highest contributors scenario, {} companies: no scenario {:.3f}s, scenario {:.3f}s".format(
+            nr_companies, *durations
+        )
+    )
+
+
+def bench_calculate_scenarios(nr_companies: int):
+    """
+    Compare calculating and aggregating the scores of all scenarios at once with doing so for each scenario separately.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, portfolio = make_universe(nr_companies)
+    data = pd.merge(
+        left=TargetProtocol().process(targets, companies),
+        right=pd.DataFrame.from_records([company.dict() for company in portfolio]).drop(
+            columns=["company_name", "user_fields"]
+        ),
+        how="left",
+        on="company_id",
+    )
+    scenarios = [None]
+    for scenario_type in ScenarioType:
+        for engagement_type in EngagementType:
+            scenario = Scenario()
+            scenario.scenario_type = scenario_type
+            scenario.engagement_type = engagement_type
+            scenarios.append(scenario)
+
+    start = time.perf_counter()
+    for scenario in scenarios:
+        ts = TemperatureScore(
+            time_frames=list(ETimeFrames),
+            scopes=EScope.get_result_scopes(),
+            scenario=scenario,
+        )
+        ts.aggregate_scores(ts.calculate(data))
+    duration_separate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    ).calculate_scenarios(scenarios, data)
+    duration_batch = time.perf_counter() - start
+
+    print(
+        "{} scenarios, {} companies: separately {:.3f}s, at once {:.3f}s".format(
+            len(scenarios), nr_companies, duration_separate, duration_batch
+        )
+    )
+
+
+def bench_sweep(nr_companies: int):
+    """
+    Compare sweeping the fallback score and SBTi factor with calculating and aggregating the scores for each
+    combination separately.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, portfolio = make_universe(nr_companies)
+    data = pd.merge(
+        left=TargetProtocol().process(targets, companies),
+        right=pd.DataFrame.from_records([company.dict() for company in portfolio]).drop(
+            columns=["company_name", "user_fields"]
+        ),
+        how="left",
+        on="company_id",
+    )
+    fallback_scores = np.arange(2.5, 4.0 + 1e-9, 0.05)
+    sbti_factors = [0.5, 1.0]
+
+    start = time.perf_counter()
+    expected = np.empty((len(fallback_scores), len(sbti_factors), 3, 3))
+    for i, fallback_score in enumerate(fallback_scores):
+        for j, sbti_factor in enumerate(sbti_factors):
+            config = type(
+                "SweepConfig", (TemperatureScoreConfig,), {"SBTI_FACTOR": sbti_factor}
+            )
+            ts = TemperatureScore(
+                time_frames=list(ETimeFrames),
+                scopes=EScope.get_result_scopes(),
+                fallback_score=fallback_score,
+                config=config,
+            )
+            aggregations = ts.aggregate_scores(ts.calculate(data))
+            for k, time_frame in enumerate(ETimeFrames):
+                for l, scope in enumerate(EScope.get_result_scopes()):
+                    expected[i, j, k, l] = aggregations[time_frame.value][
+                        scope.name
+                    ].all.score
+    duration_separate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    ).sweep_aggregated_scores(fallback_scores, sbti_factors, data)
+    duration_sweep = time.perf_counter() - start
+
+    assert np.allclose(result, expected)
+    print(
+        "{} grid points, {} companies: separately {:.3f}s, sweep {:.3f}s".format(
+            len(fallback_scores) * len(sbti_factors),
+            nr_companies,
+            duration_separate,
+            duration_sweep,
+        )
+    )
+
+
+def bench_calculate_models(nr_companies: int):
+    """
+    Compare calculating the scores for several regression models at once with calculating them for each model
+    separately.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, portfolio = make_universe(nr_companies)
+    data = pd.merge(
+        left=TargetProtocol().process(targets, companies),
+        right=pd.DataFrame.from_records([company.dict() for company in portfolio]).drop(
+            columns=["company_name", "user_fields"]
+        ),
+        how="left",
+        on="company_id",
+    )
+    models = [1, 2, 3, 4, 5]
+
+    start = time.perf_counter()
+    for model in models:
+        TemperatureScore(
+            time_frames=list(ETimeFrames),
+            scopes=EScope.get_result_scopes(),
+            model=model,
+        ).calculate(data)
+    duration_separate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    ).calculate_models(models, data)
+    duration_combined = time.perf_counter() - start
+
+    print(
+        "{} regression models, {} companies: separately {:.3f}s, at once {:.3f}s".format(
+            len(models), nr_companies, duration_separate, duration_combined
+        )
+    )
+
+
+def bench_regression_lookup(nr_companies: int):
+    """
+    Compare looking up the regression parameters in the compiled lookup table with merging the regression model.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, _ = make_universe(nr_companies)
+    ts = TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    )
+    data = ts._prepare_targets(TargetProtocol().process(targets, companies))
+    data = data.drop(columns=ts.regression_model.columns.drop(ts.c.COLS.SLOPE))
+
+    start = time.perf_counter()
+    expected = pd.merge(
+        left=data,
+        right=ts.regression_model,
+        left_on=[ts.c.COLS.SLOPE, ts.c.COLS.SR15],
+        right_on=[ts.c.COLS.SLOPE, ts.c.COLS.VARIABLE],
+        how="left",
+    )
+    duration_merge = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = ts._merge_regression(data)
+    duration_lookup = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(result, expected)
+    targets = data.head(1000)
+    start = time.perf_counter()
+    for _, target in targets.iterrows():
+        ts.get_regression(target)
+    duration_single = (time.perf_counter() - start) / len(targets)
+    print(
+        "regression lookup, {} rows: merge {:.3f}s, lookup {:.3f}s, single target {:.0f}us".format(
+            len(data), duration_merge, duration_lookup, duration_single * 1e6
+        )
+    )
+
+
+def bench_encoded_grid(nr_companies: int):
+    """
+    Compare filtering, grouping and comparing the time frames and scopes as enum members with doing so on the codes of
+    categoricals.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, _ = make_universe(nr_companies)
+    ts = TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    )
+    data = TargetProtocol().process(targets, companies)
+
+    start = time.perf_counter()
+    expected = data[
+        data[ts.c.COLS.SCOPE].isin(ts.scopes)
+        & data[ts.c.COLS.TIME_FRAME].isin(ts.time_frames)
+    ]
+    expected_subsets = expected[ts.c.COLS.TIME_FRAME].map(
+        {time_frame: i for i, time_frame in enumerate(ts.time_frames)}
+    ) * len(ts.scopes) + expected[ts.c.COLS.SCOPE].map(
+        {scope: i for i, scope in enumerate(ts.scopes)}
+    )
+    expected_s1s2s3 = expected[ts.c.COLS.SCOPE] == EScope.S1S2S3
+    duration_enums = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = ts._select_grid(data, ts.time_frames, ts.scopes)
+    subsets = ts._get_subsets(result)
+    s1s2s3 = result[ts.c.COLS.SCOPE] == EScope.S1S2S3
+    duration_codes = time.perf_counter() - start
+
+    pd.testing.assert_series_equal(subsets, expected_subsets)
+    pd.testing.assert_series_equal(s1s2s3, expected_s1s2s3)
+    print(
+        "time frames and scopes, {} rows: enums {:.3f}s, categoricals {:.3f}s".format(
+            len(data), duration_enums, duration_codes
+        )
+    )
+
+
+def bench_anonymize(nr_companies: int):
+    """
+    Compare anonymizing the scores by factorizing the company names with renaming the companies one by one.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, portfolio = make_universe(nr_companies)
+    ts = TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    )
+    scores = ts.calculate(
+        pd.merge(
+            left=TargetProtocol().process(targets, companies),
+            right=pd.DataFrame.from_records(
+                [company.dict() for company in portfolio]
+            ).drop(columns=["company_name", "user_fields"]),
+            how="left",
+            on="company_id",
+        )
+    )
+
+    start = time.perf_counter()
+    expected = scores.drop(columns=[ts.c.COLS.COMPANY_ID, ts.c.COLS.COMPANY_ISIN])
+    for index, company_name in enumerate(expected[ts.c.COLS.COMPANY_NAME].unique()):
+        expected.loc[
+            expected[ts.c.COLS.COMPANY_NAME] == company_name,
+            ts.c.COLS.COMPANY_NAME,
+        ] = "Company" + str(index + 1)
+    duration_loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = ts.anonymize_data_dump(scores)
+    duration_factorized = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(result, expected)
+    print(
+        "anonymize, {} companies: one by one {:.3f}s, factorized {:.3f}s".format(
+            nr_companies, duration_loop, duration_factorized
+        )
+    )
+
+
+def bench_result_cache(nr_companies: int):
+    """
+    Compare calculating and aggregating the scores with getting them from the result cache.
+
+    :param nr_companies: The number of companies in the universe
+    """
+    companies, targets, portfolio = make_universe(nr_companies)
+    data = pd.merge(
+        left=TargetProtocol().process(targets, companies),
+        right=pd.DataFrame.from_records([company.dict() for company in portfolio]).drop(
+            columns=["company_name", "user_fields"]
+        ),
+        how="left",
+        on="company_id",
+    )
+    ts = TemperatureScore(
+        time_frames=list(ETimeFrames),
+        scopes=EScope.get_result_scopes(),
+        cache=ResultCache(),
+    )
+
+    start = time.perf_counter()
+    expected = ts.aggregate_scores(ts.calculate(data))
+    duration_calculated = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = ts.aggregate_scores(ts.calculate(data))
+    duration_cached = time.perf_counter() - start
+
+    assert result == expected
+    print(
+        "result cache, {} companies: calculated {:.3f}s, cached {:.3f}s".format(
+            nr_companies, duration_calculated, duration_cached
+        )
+    )
+
+
+def bench_reaggregate(nr_companies: int, nr_funds: int = 20):
+    """
+    Compare reaggregating the scores for the daily holdings of several funds with calculating the scores of each fund.
+
+    :param nr_companies: The number of companies in the universe
+    :param nr_funds: The number of funds, each holding a random tenth of the universe
+    """
+    companies, targets, portfolio = make_universe(nr_companies)
+    data = pd.merge(
+        left=TargetProtocol().process(targets, companies),
+        right=pd.DataFrame.from_records([company.dict() for company in portfolio]).drop(
+            columns=["company_name", "user_fields"]
+        ),
+        how="left",
+        on="company_id",
+    )
+    ts = TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    )
+    rng = np.random.default_rng(0)
+    company_ids = data[ts.c.COLS.COMPANY_ID].unique()
+    funds = [
+        pd.DataFrame(
+            {
+                ts.c.COLS.COMPANY_ID: rng.choice(
+                    company_ids, len(company_ids) // 10, replace=False
+                ),
+                ts.c.COLS.INVESTMENT_VALUE: rng.uniform(
+                    1e6, 1e8, len(company_ids) // 10
+                ),
+            }
+        )
+        for _ in range(nr_funds)
+    ]
+
+    start = time.perf_counter()
+    expected = []
+    for holdings in funds:
+        fund_data = data.drop(columns=[ts.c.COLS.INVESTMENT_VALUE]).merge(
+            holdings, how="inner", on=ts.c.COLS.COMPANY_ID
+        )
+        expected.append(ts.aggregate_scores(ts.calculate(fund_data)))
+    duration_calculated = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = ts.calculate(data)
+    result = [ts.reaggregate_scores(scores, holdings) for holdings in funds]
+    duration_reaggregated = time.perf_counter() - start
+
+    for aggregations, expected_aggregations in zip(result, expected):
+        assert aggregations.dict() == expected_aggregations.dict()
+    print(
+        "reaggregate, {} companies, {} funds: calculated {:.3f}s, reaggregated {:.3f}s".format(
+            nr_companies, nr_funds, duration_calculated, duration_reaggregated
+        )
+    )
+
+
+def bench_score_cube(nr_companies: int, nr_funds: int = 20):
+    """
+    Compare slicing and aggregating the scores of several scenarios in a score cube with doing so on the data frames.
+
+    :param nr_companies: The number of companies in the universe
+    :param nr_funds: The number of funds to aggregate, each holding a random tenth of the universe
+    """
+    companies, targets, portfolio = make_universe(nr_companies)
+    data = pd.merge(
+        left=TargetProtocol().process(targets, companies),
+        right=pd.DataFrame.from_records([company.dict() for company in portfolio]).drop(
+            columns=["company_name", "user_fields"]
+        ),
+        how="left",
+        on="company_id",
+    )
+    ts = TemperatureScore(
+        time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+    )
+    scenarios = [
+        None,
+        Scenario.from_dict({"number": 1}),
+        Scenario.from_dict({"number": 2}),
+    ]
+    results = ts.calculate_scenarios(scenarios, data, aggregate=False)
+    cube = ts.calculate_cube(scenarios, data)
+    rng = np.random.default_rng(0)
+    company_ids = data[ts.c.COLS.COMPANY_ID].unique()
+    funds = [
+        pd.Series(
+            rng.uniform(1e6, 1e8, len(company_ids) // 10),
+            index=rng.choice(company_ids, len(company_ids) // 10, replace=False),
+        )
+        for _ in range(nr_funds)
+    ]
+
+    start = time.perf_counter()
+    for scores, _ in results.values():
+        for time_frame in ts.time_frames:
+            for scope in ts.scopes:
+                scores[
+                    (scores[ts.c.COLS.TIME_FRAME] == time_frame)
+                    & (scores[ts.c.COLS.SCOPE] == scope)
+                ].set_index(ts.c.COLS.COMPANY_ID)[ts.c.COLS.TEMPERATURE_SCORE]
+    duration_sliced_frames = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for label in cube.scenarios:
+        for time_frame in ts.time_frames:
+            for scope in ts.scopes:
+                cube.get_scores(time_frame, scope, label)
+    duration_sliced_cube = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = []
+    for investment_values in funds:
+        holdings = investment_values.rename_axis(ts.c.COLS.COMPANY_ID).reset_index(
+            name=ts.c.COLS.INVESTMENT_VALUE
+        )
+        expected.append(
+            [ts.reaggregate_scores(scores, holdings) for scores, _ in results.values()]
+        )
+    duration_aggregated_frames = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = [cube.aggregate(investment_values) for investment_values in funds]
+    duration_aggregated_cube = time.perf_counter() - start
+
+    for aggregated, expected_aggregations in zip(result, expected):
+        for scenario, aggregations in enumerate(expected_aggregations):
+            for time_frame_index, time_frame in enumerate(ts.time_frames):
+                for scope_index, scope in enumerate(ts.scopes):
+                    np.testing.assert_allclose(
+                        aggregated[time_frame_index, scope_index, scenario],
+                        aggregations[time_frame.value][scope.name].all.score,
+                    )
+    print(
+        "score cube, {} companies, {} scenarios: sliced frames {:.3f}s, sliced cube {:.3f}s, {} funds aggregated "
+        "frames {:.3f}s, aggregated cube {:.3f}s".format(
+            nr_companies,
+            len(scenarios),
+            duration_sliced_frames,
+            duration_sliced_cube,
+            nr_funds,
+            duration_aggregated_frames,
+            duration_aggregated_cube,
+        )
+    )
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    bench_scoring_kernel(size)
+    bench_company_score(size)
+    bench_aggregations_by_method(size)
+    bench_grouped_aggregation(size)
+    bench_highest_contributors_scenario(size)
+    bench_calculate_scenarios(size)
+    bench_sweep(size)
+    bench_calculate_models(size)
+    bench_regression_lookup(size)
+    bench_encoded_grid(size)
+    bench_anonymize(size)
+    bench_result_cache(size)
+    bench_reaggregate(size)
+    bench_score_cube(size)
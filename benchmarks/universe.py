@@ -0,0 +1,98 @@
+"""
+Synthetic company universes for the benchmarks. The generated targets are spread over all scopes, time frames and
+target types, so that every branch of the target protocol and the temperature score is exercised.
+"""
+import datetime
+from typing import List, Tuple
+
+import numpy as np
+
+from SBTi.interfaces import (
+    EScope,
+    IDataProviderCompany,
+    IDataProviderTarget,
+    PortfolioCompany,
+)
+
+SCOPES = [EScope.S1, EScope.S2, EScope.S1S2, EScope.S3, EScope.S1S2S3]
+TARGET_TYPES = ["abs", "Absolute", "int", "Intensity"]
+INTENSITY_METRICS = ["Revenue", "Product", "Cement", "Oil", "Power", "Other", None]
+ISICS = ["A12", "B06", "C23", "C24", "D35", "H49", "H53"]
+
+
+def make_universe(
+    nr_companies: int, targets_per_company: float = 3.0, seed: int = 42
+) -> Tuple[
+    List[IDataProviderCompany], List[IDataProviderTarget], List[PortfolioCompany]
+]:
+    """
+    Create a random universe of companies, their targets and a portfolio that holds all of them.
+
+    :param nr_companies: The number of companies in the universe
+    :param targets_per_company: The average number of targets per company
+    :param seed: The seed of the random generator, so runs can be compared
+    :return: The companies, the targets and the portfolio
+    """
+    rng = np.random.default_rng(seed)
+    current_year = datetime.datetime.now().year
+
+    companies: List[IDataProviderCompany] = []
+    portfolio: List[PortfolioCompany] = []
+    for i in range(nr_companies):
+        company_id = "Company {}".format(i)
+        companies.append(
+            IDataProviderCompany(
+                company_name=company_id,
+                company_id=company_id,
+                isic=ISICS[rng.integers(len(ISICS))],
+                ghg_s1s2=float(rng.uniform(10, 1000)),
+                ghg_s3=float(rng.uniform(0, 1000)),
+                company_revenue=float(rng.uniform(100, 1000)),
+                company_market_cap=float(rng.uniform(100, 1000)),
+                company_enterprise_value=float(rng.uniform(100, 1000)),
+                company_total_assets=float(rng.uniform(100, 1000)),
+                company_cash_equivalents=float(rng.uniform(10, 100)),
+                sector="Sector {}".format(i % 7),
+                region="Region {}".format(i % 3),
+                sbti_validated=bool(rng.random() < 0.3),
+            )
+        )
+        portfolio.append(
+            PortfolioCompany(
+                company_name=company_id,
+                company_id=company_id,
+                company_isin=company_id,
+                investment_value=float(rng.uniform(1, 100)),
+                engagement_target=bool(rng.random() < 0.1),
+            )
+        )
+
+    targets: List[IDataProviderTarget] = []
+    nr_targets = int(nr_companies * targets_per_company)
+    for _ in range(nr_targets):
+        company_id = "Company {}".format(rng.integers(nr_companies))
+        base_year = int(rng.integers(current_year - 10, current_year))
+        # Round the coverages, so that there are ties that need to be broken in the target selection
+        coverage = float(np.round(rng.uniform(0.5, 1.0), 1))
+        targets.append(
+            IDataProviderTarget(
+                company_id=company_id,
+                target_type=TARGET_TYPES[rng.integers(len(TARGET_TYPES))],
+                intensity_metric=INTENSITY_METRICS[
+                    rng.integers(len(INTENSITY_METRICS))
+                ],
+                scope=SCOPES[rng.integers(len(SCOPES))],
+                coverage_s1=coverage,
+                coverage_s2=float(np.round(rng.uniform(0.5, 1.0), 1)),
+                coverage_s3=float(np.round(rng.uniform(0.3, 1.0), 1)),
+                reduction_ambition=float(rng.uniform(0.1, 0.9)),
+                base_year=base_year,
+                base_year_ghg_s1=float(rng.uniform(0, 100)),
+                base_year_ghg_s2=float(rng.uniform(0, 100)),
+                base_year_ghg_s3=float(rng.uniform(0, 100)),
+                end_year=int(current_year + rng.integers(1, 35)),
+                achieved_reduction=float(rng.uniform(0, 1.1)),
+            )
+        )
+
+    return companies, targets, portfolio
@@ -0,0 +1,176 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from SBTi import cache
+from SBTi.cache import ResultCache
+from SBTi.configs import ColumnsConfig, TemperatureScoreConfig
+from SBTi.interfaces import EScope, ETimeFrames
+from SBTi.temperature_score import TemperatureScore
+
+
+class TestResultCache(unittest.TestCase):
+    """
+    Test the cache of the results of the temperature score.
+    """
+
+    def setUp(self) -> None:
+        """
+        Read the test data of the temperature score.
+        """
+        self.data = pd.read_csv(
+            os.path.join(
+                os.path.dirname(os.path.realpath(__file__)),
+                "inputs",
+                "data_test_temperature_score.csv",
+            )
+        )
+        self.data[ColumnsConfig.SCOPE] = self.data[ColumnsConfig.SCOPE].map(
+            {"S1+S2": EScope.S1S2, "S3": EScope.S3, "S1+S2+S3": EScope.S1S2S3}
+        )
+        self.data[ColumnsConfig.TIME_FRAME] = self.data[ColumnsConfig.TIME_FRAME].map(
+            {
+                "short": ETimeFrames.SHORT,
+                "mid": ETimeFrames.MID,
+                "long": ETimeFrames.LONG,
+            }
+        )
+
+    def create_temperature_score(self, result_cache: ResultCache, **kwargs):
+        return TemperatureScore(
+            time_frames=list(ETimeFrames),
+            scopes=EScope.get_result_scopes(),
+            cache=result_cache,
+            **kwargs
+        )
+
+    def test_cached_results(self) -> None:
+        """
+        Test whether the results are only calculated once and whether they're the same as the uncached results.
+        """
+        result_cache = ResultCache()
+        temperature_score = self.create_temperature_score(result_cache)
+        scores = temperature_score.calculate(self.data.copy())
+        aggregations = temperature_score.aggregate_scores(scores)
+        self.assertEqual(result_cache.misses, 2)
+
+        # The cached scores are a copy, so changing them doesn't change the cache
+        scores[ColumnsConfig.TEMPERATURE_SCORE] = 0.0
+        cached_scores = temperature_score.calculate(self.data.copy())
+        cached_aggregations = temperature_score.aggregate_scores(cached_scores)
+        self.assertEqual(result_cache.hits, 2)
+
+        expected = self.create_temperature_score(None)
+        pd.testing.assert_frame_equal(
+            cached_scores, expected.calculate(self.data.copy())
+        )
+        self.assertEqual(cached_aggregations.dict(), aggregations.dict())
+
+    def test_key(self) -> None:
+        """
+        Test whether a different data set or a different setting gives a different key.
+        """
+        temperature_score = self.create_temperature_score(None)
+        key = temperature_score._get_cache_key("calculate", self.data)
+        self.assertEqual(
+            key, temperature_score._get_cache_key("calculate", self.data.copy())
+        )
+
+        data = self.data.copy()
+        data.loc[1, ColumnsConfig.REDUCTION_AMBITION] = 0.99
+        self.assertNotEqual(key, temperature_score._get_cache_key("calculate", data))
+
+        config = type("Config", (TemperatureScoreConfig,), {"SBTI_FACTOR": 0.5})
+        for other in [
+            self.create_temperature_score(None, fallback_score=3.0),
+            self.create_temperature_score(None, model=1),
+            self.create_temperature_score(None, config=config),
+            TemperatureScore(time_frames=[ETimeFrames.MID], scopes=[EScope.S1S2]),
+        ]:
+            self.assertNotEqual(key, other._get_cache_key("calculate", self.data))
+
+        # The key doesn't load the SR15 mapping, but it changes with the mapping file
+        self.assertIsNone(temperature_score._mapping)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "sr15_mapping.xlsx")
+            shutil.copy(TemperatureScoreConfig.FILE_SR15_MAPPING, path)
+            other = self.create_temperature_score(
+                None,
+                config=type(
+                    "Config", (TemperatureScoreConfig,), {"FILE_SR15_MAPPING": path}
+                ),
+            )
+            other_key = other._get_cache_key("calculate", self.data)
+            other.mapping.head(5).to_excel(path, index=False)
+            mtime = os.path.getmtime(path)
+            os.utime(path, (mtime + 10, mtime + 10))
+            self.assertNotEqual(other_key, other._get_cache_key("calculate", self.data))
+        finally:
+            shutil.rmtree(directory)
+
+        with mock.patch.object(cache, "get_package_version", return_value="0.0.0"):
+            self.assertNotEqual(
+                key, temperature_score._get_cache_key("calculate", self.data)
+            )
+
+    def test_eviction(self) -> None:
+        """
+        Test whether the least recently used results are evicted once the results don't fit anymore.
+        """
+        result_cache = ResultCache(max_size=250)
+        for key in ["a", "b", "c"]:
+            result_cache.put(key, key * 100)
+        self.assertLessEqual(result_cache.size, 250)
+        self.assertIsNone(result_cache.get("a"))
+        self.assertEqual(result_cache.get("c"), "c" * 100)
+
+        # Using b makes c the least recently used result
+        result_cache.get("b")
+        result_cache.put("d", "d" * 100)
+        self.assertIsNone(result_cache.get("c"))
+        self.assertEqual(result_cache.get("b"), "b" * 100)
+
+        result_cache.put("e", "e" * 1000)
+        self.assertIsNone(result_cache.get("e"))
+        self.assertEqual(len(result_cache), 2)
+
+    def test_directory(self) -> None:
+        """
+        Test whether the results in the directory are used by another cache and whether unreadable results are
+        calculated again.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            self.create_temperature_score(ResultCache(directory=directory)).calculate(
+                self.data.copy()
+            )
+
+            result_cache = ResultCache(directory=directory)
+            temperature_score = self.create_temperature_score(result_cache)
+            temperature_score.calculate(self.data.copy())
+            self.assertEqual(result_cache.hits, 1)
+            self.assertEqual(result_cache.misses, 0)
+
+            key = temperature_score._get_cache_key("calculate", self.data)
+            with open(os.path.join(directory, key + cache.CACHE_EXTENSION), "wb") as f:
+                f.write(b"Not a pickle")
+            result_cache = ResultCache(directory=directory)
+            with self.assertLogs(cache.__name__, level="WARNING"):
+                self.create_temperature_score(result_cache).calculate(self.data.copy())
+            self.assertEqual(result_cache.misses, 1)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    test = TestResultCache()
+    test.setUp()
+    test.test_cached_results()
+    test.test_key()
+    test.test_eviction()
+    test.test_directory()
@@ -0,0 +1,108 @@
+import unittest
+
+import pandas as pd
+
+from SBTi.configs import ColumnsConfig, PortfolioAggregationConfig
+from SBTi.interfaces import EScope
+from SBTi.portfolio_aggregation import PortfolioAggregation, PortfolioAggregationMethod
+
+
+class TestPortfolioAggregation(unittest.TestCase):
+    """
+    Test the portfolio aggregation methods.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a small portfolio, for which the aggregations can be calculated by hand.
+        :return:
+        """
+        self.portfolio_aggregation = PortfolioAggregation(PortfolioAggregationConfig)
+        self.data = pd.DataFrame(
+            {
+                ColumnsConfig.COMPANY_NAME: ["A", "B", "C"],
+                ColumnsConfig.SCOPE: [EScope.S1S2, EScope.S3, EScope.S1S2S3],
+                ColumnsConfig.TEMPERATURE_SCORE: [1.5, 2.0, 3.0],
+                ColumnsConfig.INVESTMENT_VALUE: [100.0, 300.0, 600.0],
+                ColumnsConfig.MARKET_CAP: [1000.0, 1000.0, 2000.0],
+                ColumnsConfig.COMPANY_ENTERPRISE_VALUE: [500.0, 1000.0, 1000.0],
+                ColumnsConfig.CASH_EQUIVALENTS: [500.0, 0.0, 1000.0],
+                ColumnsConfig.GHG_SCOPE12: [10.0, 20.0, 30.0],
+                ColumnsConfig.GHG_SCOPE3: [100.0, 200.0, 300.0],
+            }
+        )
+
+    def test_aggregations(self) -> None:
+        """
+        Test whether the aggregated scores are calculated as expected.
+
+        :return:
+        """
+        expected = {
+            PortfolioAggregationMethod.WATS: [0.15, 0.6, 1.8],
+            # The emissions in scope are 10, 200 and 330
+            PortfolioAggregationMethod.TETS: [
+                1.5 * 10 / 540,
+                2.0 * 200 / 540,
+                3.0 * 330 / 540,
+            ],
+            # The owned emissions are 1, 60 and 99
+            PortfolioAggregationMethod.MOTS: [
+                1.5 / 160,
+                2.0 * 60 / 160,
+                3.0 * 99 / 160,
+            ],
+            # The enterprise values plus cash equal the market caps, so ECOTS equals MOTS
+            PortfolioAggregationMethod.ECOTS: [
+                1.5 / 160,
+                2.0 * 60 / 160,
+                3.0 * 99 / 160,
+            ],
+        }
+        for method, scores in expected.items():
+            result = self.portfolio_aggregation._calculate_aggregate_score(
+                self.data.copy(), ColumnsConfig.TEMPERATURE_SCORE, method
+            )
+            for score, expected_score in zip(result, scores):
+                self.assertAlmostEqual(score, expected_score, msg=method.value)
+
+    def test_missing_values(self) -> None:
+        """
+        Test whether all missing values are reported at once.
+
+        :return:
+        """
+        data = self.data.copy()
+        data.loc[0, ColumnsConfig.MARKET_CAP] = None
+        data.loc[1, ColumnsConfig.GHG_SCOPE3] = None
+        with self.assertRaises(ValueError) as context:
+            self.portfolio_aggregation._calculate_aggregate_score(
+                data, ColumnsConfig.TEMPERATURE_SCORE, PortfolioAggregationMethod.MOTS
+            )
+        self.assertIn(ColumnsConfig.MARKET_CAP, str(context.exception))
+        self.assertIn(ColumnsConfig.GHG_SCOPE3, str(context.exception))
+
+    def test_zero_weights(self) -> None:
+        """
+        Test whether a portfolio without weight gets NaN scores, as the totals it's divided by are zero.
+
+        :return:
+        """
+        data = self.data.copy()
+        data[ColumnsConfig.INVESTMENT_VALUE] = 0.0
+        for method in [
+            PortfolioAggregationMethod.WATS,
+            PortfolioAggregationMethod.MOTS,
+        ]:
+            result = self.portfolio_aggregation._calculate_aggregate_score(
+                data.copy(), ColumnsConfig.TEMPERATURE_SCORE, method
+            )
+            self.assertTrue(result.isnull().all(), msg=method.value)
+
+
+if __name__ == "__main__":
+    test = TestPortfolioAggregation()
+    test.setUp()
+    test.test_aggregations()
+    test.test_missing_values()
+    test.test_zero_weights()
@@ -0,0 +1,154 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from SBTi import reference_data
+from SBTi.configs import PortfolioCoverageTVPConfig, TemperatureScoreConfig
+from SBTi.interfaces import EScope, ETimeFrames
+from SBTi.temperature_score import TemperatureScore
+
+
+class TestReferenceData(unittest.TestCase):
+    """
+    Test the process-wide cache of the reference data.
+    """
+
+    def setUp(self) -> None:
+        """
+        Start every test with an empty cache.
+        """
+        reference_data.clear()
+
+    def test_cached(self) -> None:
+        """
+        Test whether the reference data is only read once and whether the callers can't change the cached tables.
+        """
+        TemperatureScore(
+            time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+        )
+        temperature_score = TemperatureScore(
+            time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+        )
+        self.assertEqual(reference_data._read_regression_model.cache_info().misses, 1)
+        self.assertEqual(reference_data._read_regression_model.cache_info().hits, 1)
+        self.assertEqual(
+            reference_data._read_table.cache_info().currsize,
+            1,
+            "The SR15 mapping should only be read when it's used",
+        )
+
+        temperature_score.regression_model.drop(
+            temperature_score.regression_model.index, inplace=True
+        )
+        regression_model = reference_data.get_regression_model(
+            TemperatureScoreConfig.FILE_REGRESSION_MODEL_SUMMARY, 4
+        )
+        self.assertGreater(len(regression_model), 0)
+        self.assertTrue(
+            (regression_model[TemperatureScoreConfig.COLS.MODEL] == 4).all()
+        )
+
+        self.assertGreater(len(temperature_score.mapping), 0)
+        self.assertEqual(reference_data._read_table.cache_info().currsize, 2)
+
+    def test_changed_file(self) -> None:
+        """
+        Test whether a table is read again once its file changes.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "sr15_mapping.xlsx")
+            shutil.copy(TemperatureScoreConfig.FILE_SR15_MAPPING, path)
+            reference_data.get_table(path)
+            reference_data.get_table(path)
+            self.assertEqual(reference_data._read_table.cache_info().misses, 1)
+
+            mtime = os.path.getmtime(path)
+            os.utime(path, (mtime + 10, mtime + 10))
+            reference_data.get_table(path)
+            self.assertEqual(reference_data._read_table.cache_info().misses, 2)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_compiled_tables(self) -> None:
+        """
+        Test whether the compiled tables are read instead of the Excel files, unless the Excel files changed since they
+        were compiled or the compiled files can't be read.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            paths = {}
+            for name, path in [
+                (
+                    "FILE_REGRESSION_MODEL_SUMMARY",
+                    TemperatureScoreConfig.FILE_REGRESSION_MODEL_SUMMARY,
+                ),
+                ("FILE_SR15_MAPPING", TemperatureScoreConfig.FILE_SR15_MAPPING),
+                ("FILE_TARGETS", PortfolioCoverageTVPConfig.FILE_TARGETS),
+            ]:
+                paths[name] = os.path.join(directory, os.path.basename(path))
+                shutil.copy(path, paths[name])
+            config = type("Config", (TemperatureScoreConfig,), paths)
+            tvp_config = type("TVPConfig", (PortfolioCoverageTVPConfig,), paths)
+
+            compiled_paths = reference_data.compile_tables(config, tvp_config)
+            self.assertEqual(len(compiled_paths), 3)
+            path = paths["FILE_SR15_MAPPING"]
+            expected = pd.read_excel(path)
+
+            with mock.patch("pandas.read_excel", wraps=pd.read_excel) as read_excel:
+                pd.testing.assert_frame_equal(reference_data.get_table(path), expected)
+                read_excel.assert_not_called()
+
+                # The Excel file is more recent than the compiled file, but its content didn't change
+                mtime = os.path.getmtime(path)
+                os.utime(path, (mtime + 10, mtime + 10))
+                pd.testing.assert_frame_equal(reference_data.get_table(path), expected)
+                read_excel.assert_not_called()
+
+                # The content of the Excel file changed, but the compiled file is more recent
+                expected = expected.head(5)
+                expected.to_excel(path, index=False)
+                os.utime(path, (mtime - 10, mtime - 10))
+                pd.testing.assert_frame_equal(reference_data.get_table(path), expected)
+                self.assertEqual(read_excel.call_count, 1)
+
+                # The compiled file is more recent, but it can't be read
+                compiled_path = reference_data.get_compiled_path(path)
+                with open(compiled_path, "w") as f:
+                    f.write("Not a pickle")
+                os.utime(compiled_path, (mtime + 20, mtime + 20))
+                with self.assertLogs(reference_data.__name__, level="WARNING"):
+                    pd.testing.assert_frame_equal(
+                        reference_data.get_table(path), expected
+                    )
+                self.assertEqual(read_excel.call_count, 2)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_preload(self) -> None:
+        """
+        Test whether all reference data is in the cache after preloading it.
+        """
+        reference_data.preload()
+        TemperatureScore(
+            time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+        ).mapping
+        self.assertEqual(reference_data._read_regression_model.cache_info().misses, 1)
+        self.assertEqual(reference_data._read_table.cache_info().misses, 3)
+
+
+if __name__ == "__main__":
+    test = TestReferenceData()
+    test.setUp()
+    test.test_cached()
+    test.setUp()
+    test.test_changed_file()
+    test.setUp()
+    test.test_compiled_tables()
+    test.setUp()
+    test.test_preload()
@@ -0,0 +1,87 @@
+import unittest
+
+from SBTi.configs import PortfolioCoverageTVPConfig
+from SBTi.data.sbti import SBTi
+from SBTi.interfaces import IDataProviderCompany
+
+
+class TestSBTi(unittest.TestCase):
+    """
+    Test the lookup of the SBTi target status.
+    """
+
+    def setUp(self) -> None:
+        """
+        Find an ISIN with a validated target and one with only a commitment in the SBTi targets file.
+        """
+        self.sbti = SBTi()
+        targets = self.sbti.targets
+        status = targets.groupby(PortfolioCoverageTVPConfig.COL_COMPANY_ISIN)[
+            PortfolioCoverageTVPConfig.COL_TARGET_STATUS
+        ].agg(set)
+        self.isin_validated = status[
+            status.apply(lambda s: PortfolioCoverageTVPConfig.VALUE_TARGET_SET in s)
+        ].index[0]
+        self.isin_committed = status[
+            status.apply(
+                lambda s: s == {PortfolioCoverageTVPConfig.VALUE_TARGET_COMMITTED}
+            )
+        ].index[0]
+
+    def create_company(self, company_id: str) -> IDataProviderCompany:
+        return IDataProviderCompany(
+            company_name=company_id,
+            company_id=company_id,
+            isic="A12",
+            sbti_validated=True,
+        )
+
+    def test_get_sbti_targets(self) -> None:
+        """
+        Test whether the companies get the status of their ISIN and whether unknown companies keep their status.
+        """
+        companies = [
+            self.create_company(company_id)
+            for company_id in ["validated", "committed", "unknown", "no_isin"]
+        ]
+        isin_map = {
+            "validated": self.isin_validated,
+            "committed": self.isin_committed,
+            "unknown": "XX0000000000",
+        }
+        companies = self.sbti.get_sbti_targets(companies, isin_map)
+        self.assertListEqual(
+            [company.sbti_validated for company in companies],
+            [True, False, True, True],
+        )
+
+    def test_targets(self) -> None:
+        """
+        Test whether the targets are only copied once and whether they can be replaced, which changes the status of
+        the companies.
+        """
+        self.assertIs(self.sbti.targets, self.sbti.targets)
+        targets = self.sbti.targets.iloc[0:0]
+        self.sbti.targets = targets
+        self.assertIs(self.sbti.targets, targets)
+        self.assertGreater(len(SBTi().targets), 1)
+
+        # Once its target is only a commitment, the validated company loses its status
+        targets = SBTi().targets
+        targets.loc[
+            targets[PortfolioCoverageTVPConfig.COL_COMPANY_ISIN] == self.isin_validated,
+            PortfolioCoverageTVPConfig.COL_TARGET_STATUS,
+        ] = PortfolioCoverageTVPConfig.VALUE_TARGET_COMMITTED
+        self.sbti.targets = targets
+        companies = self.sbti.get_sbti_targets(
+            [self.create_company("validated")], {"validated": self.isin_validated}
+        )
+        self.assertFalse(companies[0].sbti_validated)
+
+
+if __name__ == "__main__":
+    test = TestSBTi()
+    test.setUp()
+    test.test_get_sbti_targets()
+    test.setUp()
+    test.test_targets()
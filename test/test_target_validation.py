@@ -0,0 +1,240 @@
+import copy
+import datetime
+import os
+import unittest
+import warnings
+from typing import List
+
+import pandas as pd
+
+from SBTi.configs import ColumnsConfig
+from SBTi.data.csv import CSVProvider
+from SBTi.interfaces import (
+    EScope,
+    ETimeFrames,
+    IDataProviderCompany,
+    IDataProviderTarget,
+)
+from SBTi.target_validation import TargetProtocol
+from SBTi.temperature_score import TemperatureScore
+
+
+class TestTargetProtocol(unittest.TestCase):
+    """
+    Test the target protocol. The vectorized implementation is compared against the original row by row implementation.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a base company and a base target which we'll use later on.
+        """
+        # Use end years relative to the current year, so that the time frames don't depend on the day the tests run
+        self.current_year = datetime.datetime.now().year
+        self.company_base = IDataProviderCompany(
+            company_name="Company",
+            company_id="Company",
+            ghg_s1s2=100,
+            ghg_s3=50,
+            company_revenue=100,
+            company_market_cap=100,
+            company_enterprise_value=100,
+            company_total_assets=100,
+            company_cash_equivalents=100,
+            isic="A12",
+        )
+        self.target_base = IDataProviderTarget(
+            company_id="Company",
+            target_type="abs",
+            scope=EScope.S1S2,
+            coverage_s1=0.95,
+            coverage_s2=0.95,
+            coverage_s3=0.5,
+            reduction_ambition=0.8,
+            base_year=self.current_year - 3,
+            base_year_ghg_s1=100,
+            base_year_ghg_s2=50,
+            base_year_ghg_s3=20,
+            end_year=self.current_year + 10,
+        )
+
+    def create_targets(self) -> List[IDataProviderTarget]:
+        """
+        Create a set of targets that covers the different scopes and the preferences for selecting targets.
+        """
+        variations = [
+            {},
+            {"coverage_s1": 0.99},
+            {"coverage_s1": 0.99, "end_year": self.current_year + 12},
+            {"coverage_s1": 0.99, "target_type": "int", "intensity_metric": "Revenue"},
+            {"scope": EScope.S3, "coverage_s3": 0.8},
+            {"scope": EScope.S3, "coverage_s3": 0.8, "reduction_ambition": 0.5},
+            {"scope": EScope.S1S2S3, "end_year": self.current_year + 2},
+            {"scope": EScope.S1, "end_year": self.current_year + 20},
+            {"scope": EScope.S2, "end_year": self.current_year + 20},
+            {"end_year": self.current_year + 40},
+            {"achieved_reduction": 1.0},
+        ]
+        targets = []
+        for company_id in ["A", "B"]:
+            for variation in variations:
+                target = self.target_base.copy(update=variation)
+                target.company_id = company_id
+                targets.append(target)
+        return targets
+
+    def create_companies(self, company_ids: List[str]) -> List[IDataProviderCompany]:
+        companies = []
+        for company_id in company_ids:
+            company = copy.deepcopy(self.company_base)
+            company.company_id = company_id
+            company.company_name = company_id
+            companies.append(company)
+        return companies
+
+    def test_vectorized_grid(self) -> None:
+        """
+        Test whether the vectorized target selection creates the same 9-box grid as the row by row selection.
+        """
+        companies = self.create_companies(["A", "B", "C"])
+        targets = self.create_targets()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = TargetProtocol(vectorized=False).process(
+                copy.deepcopy(targets), companies
+            )
+        result = TargetProtocol().process(copy.deepcopy(targets), companies)
+
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual(len(result), 27, "There should be 9 rows per company")
+
+    def test_vectorized_preparation(self) -> None:
+        """
+        Test whether the column-wise preparation of the targets gives the same targets as the target by target
+        preparation. The S2 target is put both before and after the S1 target it's combined with.
+        """
+        targets = self.create_targets()
+        s2_target = self.target_base.copy(
+            update={"scope": EScope.S2, "coverage_s2": 0.5, "company_id": "A"}
+        )
+        s1_target = self.target_base.copy(
+            update={"scope": EScope.S1, "coverage_s1": 0.9, "company_id": "A"}
+        )
+        targets = [s2_target] + targets + [s1_target, s2_target.copy()]
+
+        expected = pd.DataFrame.from_records(
+            [
+                target.dict()
+                for target in TargetProtocol(vectorized=False).prepare_targets(
+                    copy.deepcopy(targets)
+                )
+            ]
+        )
+        result = TargetProtocol().prepare_targets_vectorized(
+            pd.DataFrame.from_records([target.dict() for target in targets])
+        )
+
+        # The records of the prepared targets infer integer columns where only the (integer) defaults are left
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_process_frames(self) -> None:
+        """
+        Test whether processing the data frames of a provider gives the same result as processing its models.
+        """
+        path = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            "inputs",
+            "data_test_waterfall_a.csv",
+        )
+        provider = CSVProvider(path=path, path_targets=path, encoding="iso-8859-1")
+        company_ids = provider.data["company_id"].tolist()
+
+        expected = TargetProtocol().process(
+            provider.get_targets(company_ids), provider.get_company_data(company_ids)
+        )
+        result = TargetProtocol().process_frames(
+            provider.get_targets_frame(company_ids),
+            provider.get_company_data_frame(company_ids),
+        )
+        pd.testing.assert_frame_equal(result, expected)
+
+        with self.assertRaises(ValueError):
+            TargetProtocol().process_frames(
+                provider.get_targets_frame(company_ids).drop(columns=["scope"]),
+                provider.get_company_data_frame(company_ids),
+            )
+
+    def test_sparse_grid(self) -> None:
+        """
+        Test whether the temperature scores of a sparse grid are the same as the ones of the full 9-box grid.
+        """
+        companies = self.create_companies(["A", "B", "C"])
+        targets = self.create_targets()
+        dense = TargetProtocol().process(copy.deepcopy(targets), companies)
+        sparse = TargetProtocol(sparse=True).process(copy.deepcopy(targets), companies)
+        self.assertLess(len(sparse), len(dense))
+        self.assertEqual(
+            sparse[ColumnsConfig.TIME_FRAME].isnull().sum(),
+            3,
+            "There should be one row without a time frame per company",
+        )
+
+        for time_frames, scopes in [
+            (list(ETimeFrames), EScope.get_result_scopes()),
+            ([ETimeFrames.LONG], [EScope.S1S2S3]),
+        ]:
+            temperature_score = TemperatureScore(time_frames=time_frames, scopes=scopes)
+            expected = temperature_score.calculate(dense)
+            result = temperature_score.calculate(sparse)
+            # The cells without a target aren't mapped onto the regression model in a sparse grid
+            target_columns = [
+                ColumnsConfig.SR15,
+                ColumnsConfig.SLOPE,
+            ] + temperature_score.regression_model.columns.tolist()
+            pd.testing.assert_frame_equal(
+                result.drop(columns=target_columns),
+                expected.drop(columns=target_columns),
+            )
+            has_target = result[ColumnsConfig.REDUCTION_AMBITION].notnull()
+            pd.testing.assert_frame_equal(
+                result.loc[has_target, target_columns],
+                expected.loc[has_target, target_columns],
+            )
+            self.assertTrue(result.loc[~has_target, ColumnsConfig.SR15].isnull().all())
+
+            # The empty cells are filled for every regression model
+            score_columns = [
+                ColumnsConfig.COMPANY_ID,
+                ColumnsConfig.TIME_FRAME,
+                ColumnsConfig.SCOPE,
+                ColumnsConfig.MODEL,
+                ColumnsConfig.TEMPERATURE_SCORE,
+            ]
+            pd.testing.assert_frame_equal(
+                temperature_score.calculate_models([1, 4], sparse)[score_columns],
+                temperature_score.calculate_models([1, 4], dense)[score_columns],
+            )
+
+    def test_target_preference(self) -> None:
+        """
+        Test whether the target with the highest coverage and the latest end year is selected.
+        """
+        companies = self.create_companies(["A", "B"])
+        data = TargetProtocol().process(self.create_targets(), companies)
+        selected = data[
+            (data["company_id"] == "A")
+            & (data["time_frame"] == ETimeFrames.MID)
+            & (data["scope"] == EScope.S1S2)
+        ].iloc[0]
+        self.assertEqual(selected["coverage_s1"], 0.99)
+        self.assertEqual(selected["end_year"], self.current_year + 12)
+        self.assertEqual(selected["target_type"], "abs")
+
+
+if __name__ == "__main__":
+    test = TestTargetProtocol()
+    test.setUp()
+    test.test_vectorized_grid()
+    test.test_vectorized_preparation()
+    test.test_process_frames()
+    test.test_sparse_grid()
+    test.test_target_preference()
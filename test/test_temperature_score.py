@@ -1,11 +1,23 @@
 import os
+import pickle
 import unittest
 
 import pandas as pd
 
-from SBTi.configs import ColumnsConfig
-from SBTi.interfaces import ETimeFrames, EScope
-from SBTi.temperature_score import TemperatureScore
+from SBTi.configs import ColumnsConfig, TemperatureScoreConfig
+from SBTi.interfaces import (
+    AggregationContributions,
+    ETimeFrames,
+    EScope,
+    PortfolioCompany,
+    ScoreAggregations,
+)
+from SBTi.temperature_score import (
+    EngagementType,
+    Scenario,
+    ScenarioType,
+    TemperatureScore,
+)
 from SBTi.portfolio_aggregation import PortfolioAggregationMethod
 
 
@@ -209,9 +221,799 @@ class TestTemperatureScore(unittest.TestCase):
             msg="Long AOTS aggregation failed",
         )
 
+    def test_aggregations_by_method(self):
+        """
+        Test whether aggregating with several methods at once gives the same results as aggregating with each method
+        separately.
+
+        :return:
+        """
+        scores = self.temperature_score.calculate(self.data)
+        methods = [
+            PortfolioAggregationMethod.WATS,
+            PortfolioAggregationMethod.TETS,
+            PortfolioAggregationMethod.MOTS,
+            PortfolioAggregationMethod.EOTS,
+            PortfolioAggregationMethod.ECOTS,
+            # The test data has no revenue, so ROTS can't be used
+            PortfolioAggregationMethod.AOTS,
+        ]
+        aggregations = self.temperature_score.aggregate_scores_by_method(
+            scores, methods
+        )
+        self.assertListEqual(list(aggregations.keys()), methods)
+        for method in methods:
+            self.temperature_score.aggregation_method = method
+            self.assertEqual(
+                aggregations[method],
+                self.temperature_score.aggregate_scores(scores),
+                msg="{} aggregation failed".format(method.value),
+            )
+
+    def test_aggregations_by_method_highest_contributors(self):
+        """
+        Test whether the highest contributors scenario is aggregated like a temperature score with the same aggregation
+        method and whether it can't be aggregated with the other methods, whose highest contributors weren't capped.
+
+        :return:
+        """
+        methods = [
+            PortfolioAggregationMethod.WATS,
+            PortfolioAggregationMethod.TETS,
+            PortfolioAggregationMethod.MOTS,
+            PortfolioAggregationMethod.EOTS,
+            PortfolioAggregationMethod.ECOTS,
+            PortfolioAggregationMethod.AOTS,
+        ]
+        for method in methods:
+            temperature_score = TemperatureScore(
+                time_frames=list(ETimeFrames),
+                scopes=EScope.get_result_scopes(),
+                scenario=Scenario.from_dict({"number": 3}),
+                aggregation_method=method,
+            )
+            scores = temperature_score.calculate(self.data.copy())
+            expected = TemperatureScore(
+                time_frames=list(ETimeFrames),
+                scopes=EScope.get_result_scopes(),
+                scenario=Scenario.from_dict({"number": 3}),
+                aggregation_method=method,
+            )
+            self.assertEqual(
+                temperature_score.aggregate_scores_by_method(scores, [method])[method],
+                expected.aggregate_scores(expected.calculate(self.data.copy())),
+                msg="{} aggregation failed".format(method.value),
+            )
+            with self.assertRaises(ValueError):
+                temperature_score.aggregate_scores_by_method(scores, methods)
+
+    def test_grouped_aggregations(self):
+        """
+        Test whether the aggregations of the groups are the same as the ones that are calculated group by group.
+
+        :return:
+        """
+        temperature_score = TemperatureScore(
+            time_frames=list(ETimeFrames),
+            scopes=EScope.get_result_scopes(),
+            grouping=["industry"],
+        )
+        data = self.data.copy()
+        companies = data[ColumnsConfig.COMPANY_ID].unique()
+        data["industry"] = data[ColumnsConfig.COMPANY_ID].map(
+            dict(zip(companies, ["A", "B", None] * len(companies)))
+        )
+        scores = temperature_score.calculate(data)
+        aggregations = temperature_score.aggregate_scores(scores)
+
+        for time_frame in ETimeFrames:
+            for scope in EScope.get_result_scopes():
+                filtered_scores = scores[
+                    (scores[ColumnsConfig.TIME_FRAME] == time_frame)
+                    & (scores[ColumnsConfig.SCOPE] == scope)
+                ]
+                score_aggregation = aggregations[time_frame.value][scope.name]
+                self.assertListEqual(
+                    list(score_aggregation.grouped.keys()), ["A", "B", "unknown"]
+                )
+                for industry, group in filtered_scores.fillna(
+                    {"industry": "unknown"}
+                ).groupby("industry"):
+                    aggregation = score_aggregation.grouped[industry]
+                    self.assertAlmostEqual(
+                        aggregation.score,
+                        (
+                            group[ColumnsConfig.INVESTMENT_VALUE]
+                            * group[ColumnsConfig.TEMPERATURE_SCORE]
+                        ).sum()
+                        / group[ColumnsConfig.INVESTMENT_VALUE].sum(),
+                    )
+                    self.assertAlmostEqual(
+                        aggregation.proportion,
+                        len(group) / len(filtered_scores) * 100,
+                    )
+                    self.assertCountEqual(
+                        [
+                            contribution.company_id
+                            for contribution in aggregation.contributions
+                        ],
+                        group[ColumnsConfig.COMPANY_ID].tolist(),
+                    )
+                    contributions = [
+                        contribution.contribution_relative
+                        for contribution in aggregation.contributions
+                    ]
+                    self.assertListEqual(
+                        contributions, sorted(contributions, reverse=True)
+                    )
+                    self.assertAlmostEqual(sum(contributions), 100)
+
+    def test_top_n_contributions(self):
+        """
+        Test whether the contributions are only parsed when they're accessed and whether the top n contributions are the
+        same as the first n of all contributions.
+
+        :return:
+        """
+        scores = self.temperature_score.calculate(self.data)
+        aggregations = self.temperature_score.aggregate_scores(scores)
+        aggregations_top_n = self.temperature_score.aggregate_scores(scores, top_n=3)
+        for time_frame in ETimeFrames:
+            for scope in EScope.get_result_scopes():
+                aggregation = aggregations[time_frame.value][scope.name].all
+                aggregation_top_n = aggregations_top_n[time_frame.value][scope.name].all
+                # The contributions stay a data frame until they're used
+                self.assertIsInstance(
+                    aggregation_top_n.contributions, AggregationContributions
+                )
+                self.assertIsNotNone(aggregation_top_n.contributions._frame)
+                self.assertEqual(aggregation_top_n.score, aggregation.score)
+                self.assertListEqual(
+                    list(aggregation_top_n.contributions),
+                    aggregation.contributions[:3],
+                )
+                self.assertEqual(len(aggregation_top_n.contributions), 3)
+        self.assertEqual(
+            len(aggregations_top_n.dict()["long"]["S1S2S3"]["all"]["contributions"]),
+            3,
+        )
+        # Slicing and concatenating unparsed contributions gives regular lists
+        contributions = self.temperature_score.aggregate_scores(
+            scores
+        ).long.S1S2S3.all.contributions
+        expected = list(aggregations.long.S1S2S3.all.contributions)
+        self.assertGreater(len(expected), 3)
+        self.assertListEqual(
+            self.temperature_score.aggregate_scores(
+                scores
+            ).long.S1S2S3.all.contributions[1:3],
+            expected[1:3],
+        )
+        self.assertListEqual([] + contributions, expected)
+        self.assertListEqual(
+            self.temperature_score.aggregate_scores(
+                scores
+            ).long.S1S2S3.all.contributions
+            + expected[:1],
+            expected + expected[:1],
+        )
+
+        aggregations = self.temperature_score.aggregate_scores(scores)
+        self.assertEqual(ScoreAggregations.parse_raw(aggregations.json()), aggregations)
+        self.assertEqual(pickle.loads(pickle.dumps(aggregations)), aggregations)
+
+    def test_highest_contributors_scenario(self):
+        """
+        Test whether the highest contributors scenario only caps the scores of the (configurable number of) companies
+        that contribute most to the portfolio score. A company that's held twice is capped as a whole, even if one of
+        its holdings isn't among the highest contributors.
+
+        :return:
+        """
+        config = type(
+            "TopContributorsConfig",
+            (TemperatureScoreConfig,),
+            {"NUMBER_TOP_CONTRIBUTORS": 3},
+        )
+        scenario = Scenario()
+        scenario.scenario_type = ScenarioType.HIGHEST_CONTRIBUTORS
+        scenario.engagement_type = EngagementType.SET_TARGETS
+        scopes = [EScope.S1S2, EScope.S3]
+        duplicate = self.data[self.data[ColumnsConfig.COMPANY_NAME] == "Company B"]
+        data = pd.concat(
+            [
+                self.data,
+                duplicate.assign(
+                    **{
+                        ColumnsConfig.INVESTMENT_VALUE: duplicate[
+                            ColumnsConfig.INVESTMENT_VALUE
+                        ]
+                        / 50
+                    }
+                ),
+            ],
+            ignore_index=True,
+        )
+        scores = TemperatureScore(
+            time_frames=list(ETimeFrames), scopes=scopes, config=config
+        ).calculate(data.copy())
+        scores_scenario = TemperatureScore(
+            time_frames=list(ETimeFrames),
+            scopes=scopes,
+            scenario=scenario,
+            config=config,
+        ).calculate(data.copy())
+
+        # The highest contributors of the baseline implementation, which capped the companies in the contributions of
+        # the aggregated scores by their name
+        top_contributors = {
+            (ETimeFrames.SHORT, EScope.S1S2): ["Company B", "Company V", "Company F"],
+            (ETimeFrames.SHORT, EScope.S3): ["Company B", "Company V", "Company AA"],
+            (ETimeFrames.MID, EScope.S1S2): ["Company B", "Company V", "Company F"],
+            (ETimeFrames.MID, EScope.S3): ["Company B", "Company V", "Company F"],
+            (ETimeFrames.LONG, EScope.S1S2): ["Company B", "Company V", "Company F"],
+            (ETimeFrames.LONG, EScope.S3): ["Company B", "Company V", "Company F"],
+        }
+        for (time_frame, scope), company_names in top_contributors.items():
+            mask = (scores[ColumnsConfig.TIME_FRAME] == time_frame) & (
+                scores[ColumnsConfig.SCOPE] == scope
+            )
+            capped = scores[ColumnsConfig.COMPANY_NAME].isin(company_names)
+            self.assertEqual((mask & capped).sum(), 4)
+            self.assertListEqual(
+                scores_scenario.loc[
+                    mask & capped, ColumnsConfig.TEMPERATURE_SCORE
+                ].tolist(),
+                [2.0] * 4,
+            )
+            self.assertListEqual(
+                scores_scenario.loc[
+                    mask & ~capped, ColumnsConfig.TEMPERATURE_SCORE
+                ].tolist(),
+                scores.loc[mask & ~capped, ColumnsConfig.TEMPERATURE_SCORE].tolist(),
+            )
+
+    def test_tied_contributors(self):
+        """
+        Test whether companies with the same contribution are ranked by their company id, so the top n contributions and
+        the highest contributors scenario pick the same companies at the n-th place, whatever the order of the data.
+
+        :return:
+        """
+        config = type(
+            "TopContributorsConfig",
+            (TemperatureScoreConfig,),
+            {"NUMBER_TOP_CONTRIBUTORS": 3},
+        )
+        scenario = Scenario()
+        scenario.scenario_type = ScenarioType.HIGHEST_CONTRIBUTORS
+        scenario.engagement_type = EngagementType.SET_TARGETS
+        # With equal investments, all companies have the same contribution to the long term S1+S2 score
+        data = self.data.assign(**{ColumnsConfig.INVESTMENT_VALUE: 1000.0})
+        company_ids = sorted(data[ColumnsConfig.COMPANY_ID].unique())
+        for ordered_data in [data, data.iloc[::-1]]:
+            temperature_score = TemperatureScore(
+                time_frames=[ETimeFrames.LONG], scopes=[EScope.S1S2], config=config
+            )
+            scores = temperature_score.calculate(ordered_data.copy())
+            self.assertEqual(scores[ColumnsConfig.TEMPERATURE_SCORE].nunique(), 1)
+            aggregation = temperature_score.aggregate_scores(scores).long.S1S2.all
+            self.assertListEqual(
+                [contribution.company_id for contribution in aggregation.contributions],
+                company_ids,
+            )
+            aggregation_top_n = temperature_score.aggregate_scores(
+                scores, top_n=3
+            ).long.S1S2.all
+            self.assertListEqual(
+                [
+                    contribution.company_id
+                    for contribution in aggregation_top_n.contributions
+                ],
+                company_ids[:3],
+            )
+
+            scores_scenario = TemperatureScore(
+                time_frames=[ETimeFrames.LONG],
+                scopes=[EScope.S1S2],
+                scenario=scenario,
+                config=config,
+            ).calculate(ordered_data.copy())
+            capped = scores_scenario[ColumnsConfig.TEMPERATURE_SCORE] == 2.0
+            self.assertListEqual(
+                sorted(scores_scenario.loc[capped, ColumnsConfig.COMPANY_ID]),
+                company_ids[:3],
+            )
+
+    def test_calculate_scenarios(self):
+        """
+        Test whether calculating several scenarios at once gives the same results as calculating each scenario
+        separately.
+
+        :return:
+        """
+        data = self.data.copy()
+        data[ColumnsConfig.ENGAGEMENT_TARGET] = data.index % 2 == 0
+        scenarios = [None]
+        for scenario_type in ScenarioType:
+            for engagement_type in EngagementType:
+                scenario = Scenario()
+                scenario.scenario_type = scenario_type
+                scenario.engagement_type = engagement_type
+                scenarios.append(scenario)
+
+        results = self.temperature_score.calculate_scenarios(scenarios, data)
+        self.assertEqual(len(results), len(scenarios))
+        for scenario in scenarios:
+            temperature_score = TemperatureScore(
+                time_frames=list(ETimeFrames),
+                scopes=EScope.get_result_scopes(),
+                scenario=scenario,
+            )
+            expected_scores = temperature_score.calculate(data)
+            label = (
+                (scenario.scenario_type, scenario.engagement_type)
+                if scenario is not None
+                else (None, None)
+            )
+            scores, aggregations = results[label]
+            pd.testing.assert_frame_equal(scores, expected_scores)
+            self.assertEqual(
+                aggregations, temperature_score.aggregate_scores(expected_scores)
+            )
+
+    def test_sweep_aggregated_scores(self):
+        """
+        Test whether sweeping the fallback score and SBTi factor gives the same aggregated scores as calculating and
+        aggregating the scores for each combination separately.
+
+        :return:
+        """
+        fallback_scores = [2.5, 3.2, 4.0]
+        sbti_factors = [0.5, 1.0]
+        for aggregation_method in [
+            PortfolioAggregationMethod.WATS,
+            PortfolioAggregationMethod.MOTS,
+        ]:
+            self.temperature_score.aggregation_method = aggregation_method
+            sweep = self.temperature_score.sweep_aggregated_scores(
+                fallback_scores, sbti_factors, self.data
+            )
+            self.assertEqual(sweep.shape, (3, 2, 3, 3))
+            for i, fallback_score in enumerate(fallback_scores):
+                for j, sbti_factor in enumerate(sbti_factors):
+                    temperature_score = TemperatureScore(
+                        time_frames=list(ETimeFrames),
+                        scopes=EScope.get_result_scopes(),
+                        fallback_score=fallback_score,
+                        aggregation_method=aggregation_method,
+                        config=type(
+                            "SweepConfig",
+                            (TemperatureScoreConfig,),
+                            {"SBTI_FACTOR": sbti_factor},
+                        ),
+                    )
+                    aggregations = temperature_score.aggregate_scores(
+                        temperature_score.calculate(self.data)
+                    )
+                    for k, time_frame in enumerate(ETimeFrames):
+                        for l, scope in enumerate(EScope.get_result_scopes()):
+                            self.assertAlmostEqual(
+                                sweep[i, j, k, l],
+                                aggregations[time_frame.value][scope.name].all.score,
+                            )
+
+        scenario = Scenario()
+        scenario.scenario_type = ScenarioType.TARGETS
+        scenario.engagement_type = EngagementType.SET_TARGETS
+        self.temperature_score.scenario = scenario
+        with self.assertRaises(ValueError):
+            self.temperature_score.sweep_aggregated_scores(
+                fallback_scores, sbti_factors, self.data
+            )
+
+    def test_calculate_models(self):
+        """
+        Test whether calculating the scores for several regression models at once gives the same results as calculating
+        them for each model separately.
+
+        :return:
+        """
+        models = [1, 4, 50]
+        scores = self.temperature_score.calculate_models(models, self.data)
+        columns = [
+            ColumnsConfig.COMPANY_ID,
+            ColumnsConfig.TIME_FRAME,
+            ColumnsConfig.SCOPE,
+            ColumnsConfig.TEMPERATURE_SCORE,
+            TemperatureScoreConfig.TEMPERATURE_RESULTS,
+        ]
+        for model in models:
+            expected = TemperatureScore(
+                time_frames=list(ETimeFrames),
+                scopes=EScope.get_result_scopes(),
+                model=model,
+            ).calculate(self.data)
+            pd.testing.assert_frame_equal(
+                scores.loc[scores[ColumnsConfig.MODEL] == model, columns].reset_index(
+                    drop=True
+                ),
+                expected[columns].reset_index(drop=True),
+            )
+
+    def test_regression_lookup(self):
+        """
+        Test whether the regression parameters in the lookup table are the ones in the regression model and whether
+        ambiguous parameters raise an error.
+
+        :return:
+        """
+        regression_model = self.temperature_score.regression_model
+        for time_frame, slope in TemperatureScoreConfig.SLOPE_MAP.items():
+            for variable in regression_model[
+                ColumnsConfig.VARIABLE
+            ].unique().tolist() + ["unknown"]:
+                expected = regression_model[
+                    (regression_model[ColumnsConfig.VARIABLE] == variable)
+                    & (regression_model[ColumnsConfig.SLOPE] == slope)
+                ]
+                param, intercept = self.temperature_score.get_regression(
+                    pd.Series(
+                        {
+                            ColumnsConfig.SR15: variable,
+                            ColumnsConfig.TIME_FRAME: time_frame,
+                        }
+                    )
+                )
+                if expected.empty:
+                    self.assertIsNone(param)
+                    self.assertIsNone(intercept)
+                else:
+                    self.assertEqual(param, expected[ColumnsConfig.PARAM].iloc[0])
+                    self.assertEqual(
+                        intercept, expected[ColumnsConfig.INTERCEPT].iloc[0]
+                    )
+
+        temperature_score = TemperatureScore(
+            time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+        )
+        duplicate = regression_model[
+            regression_model[ColumnsConfig.SLOPE]
+            == TemperatureScoreConfig.SLOPE_MAP[ETimeFrames.SHORT]
+        ].head(1)
+        temperature_score.regression_model = pd.concat([regression_model, duplicate])
+        target = pd.Series(
+            {
+                ColumnsConfig.SR15: duplicate[ColumnsConfig.VARIABLE].iloc[0],
+                ColumnsConfig.TIME_FRAME: ETimeFrames.SHORT,
+            }
+        )
+        with self.assertRaises(ValueError):
+            temperature_score.get_regression(target)
+
+    def test_encoded_grid(self):
+        """
+        Test whether the time frames and scopes are encoded as categoricals during the calculation, while the results
+        hold the enum members.
+
+        :return:
+        """
+        self.assertLess(EScope.S1, EScope.S1S2S3)
+        self.assertGreater(ETimeFrames.LONG, ETimeFrames.SHORT)
+        self.assertEqual(
+            sorted([EScope.S1S2S3, EScope.S3, EScope.S1]),
+            [EScope.S1, EScope.S3, EScope.S1S2S3],
+        )
+
+        selected = self.temperature_score._select_grid(
+            self.data, [ETimeFrames.MID], [EScope.S3, EScope.S1S2]
+        )
+        expected = self.data[
+            (self.data[ColumnsConfig.TIME_FRAME] == ETimeFrames.MID)
+            & self.data[ColumnsConfig.SCOPE].isin([EScope.S3, EScope.S1S2])
+        ]
+        self.assertEqual(selected.index.tolist(), expected.index.tolist())
+        self.assertEqual(selected[ColumnsConfig.SCOPE].dtype, EScope.get_dtype())
+        self.assertEqual(
+            selected[ColumnsConfig.TIME_FRAME].dtype, ETimeFrames.get_dtype()
+        )
+        self.assertEqual(
+            selected[ColumnsConfig.SCOPE].tolist(),
+            expected[ColumnsConfig.SCOPE].tolist(),
+        )
+
+        scores = self.temperature_score.calculate(self.data.copy())
+        for column in [ColumnsConfig.TIME_FRAME, ColumnsConfig.SCOPE]:
+            self.assertEqual(scores[column].dtype, object)
+        self.assertTrue(
+            scores[ColumnsConfig.SCOPE]
+            .apply(lambda scope: isinstance(scope, EScope))
+            .all()
+        )
+
+    def test_anonymize_data_dump(self):
+        """
+        Test whether the companies are numbered in the order in which they appear, whether the data set of the caller
+        is left alone and whether the salted names are the same for the same salt.
+
+        :return:
+        """
+        data = self.data.copy()
+        data[ColumnsConfig.COMPANY_ISIN] = data[ColumnsConfig.COMPANY_ID]
+        scores = self.temperature_score.calculate(data)
+        columns = scores.columns.tolist()
+        anonymized = self.temperature_score.anonymize_data_dump(scores)
+        self.assertListEqual(scores.columns.tolist(), columns)
+        self.assertNotIn(ColumnsConfig.COMPANY_ID, anonymized.columns)
+        self.assertNotIn(ColumnsConfig.COMPANY_ISIN, anonymized.columns)
+        numbers = {
+            company_name: "Company" + str(index + 1)
+            for index, company_name in enumerate(
+                scores[ColumnsConfig.COMPANY_NAME].unique()
+            )
+        }
+        self.assertListEqual(
+            anonymized[ColumnsConfig.COMPANY_NAME].tolist(),
+            scores[ColumnsConfig.COMPANY_NAME].map(numbers).tolist(),
+        )
+
+        salted = self.temperature_score.anonymize_data_dump(scores, "salt")
+        self.assertListEqual(
+            salted[ColumnsConfig.COMPANY_NAME].tolist(),
+            self.temperature_score.anonymize_data_dump(scores.iloc[::-1], "salt")[
+                ColumnsConfig.COMPANY_NAME
+            ].tolist()[::-1],
+        )
+        self.assertEqual(
+            salted[ColumnsConfig.COMPANY_NAME].nunique(),
+            scores[ColumnsConfig.COMPANY_NAME].nunique(),
+        )
+        self.assertNotEqual(
+            salted[ColumnsConfig.COMPANY_NAME].tolist(),
+            self.temperature_score.anonymize_data_dump(scores, "pepper")[
+                ColumnsConfig.COMPANY_NAME
+            ].tolist(),
+        )
+
+    def test_reaggregate_scores(self):
+        """
+        Test whether reaggregating the scores for new holdings gives the same aggregations as calculating the scores
+        with the new holdings.
+
+        :return:
+        """
+        company_ids = self.data[ColumnsConfig.COMPANY_ID].unique()
+        holdings = pd.DataFrame(
+            {
+                ColumnsConfig.COMPANY_ID: list(company_ids[1:]) + [company_ids[1]],
+                ColumnsConfig.INVESTMENT_VALUE: [
+                    1000.0 * (index + 1) for index in range(len(company_ids))
+                ],
+            }
+        )
+        data = self.data[self.data[ColumnsConfig.COMPANY_ID] != company_ids[0]].copy()
+        data[ColumnsConfig.INVESTMENT_VALUE] = data[ColumnsConfig.COMPANY_ID].map(
+            holdings.groupby(ColumnsConfig.COMPANY_ID)[
+                ColumnsConfig.INVESTMENT_VALUE
+            ].sum()
+        )
+
+        for scenario in [None, Scenario.from_dict({"number": 2})]:
+            temperature_score = TemperatureScore(
+                time_frames=list(ETimeFrames),
+                scopes=EScope.get_result_scopes(),
+                scenario=scenario,
+                grouping=["industry"],
+            )
+            scores = temperature_score.calculate(self.data.copy())
+            expected = temperature_score.aggregate_scores(
+                temperature_score.calculate(data)
+            )
+            self.assertEqual(
+                temperature_score.reaggregate_scores(scores, holdings).dict(),
+                expected.dict(),
+            )
+        self.assertEqual(
+            self.temperature_score.reaggregate_scores(
+                self.temperature_score.calculate(self.data.copy()),
+                [
+                    PortfolioCompany(
+                        company_name=company_id,
+                        company_id=company_id,
+                        investment_value=investment_value,
+                    )
+                    for company_id, investment_value in holdings.values
+                ],
+            ).dict(),
+            self.temperature_score.aggregate_scores(
+                self.temperature_score.calculate(data)
+            ).dict(),
+        )
+
+        # Scores that were calculated for a portfolio that held a company twice
+        duplicate = self.data[self.data[ColumnsConfig.COMPANY_ID] == company_ids[1]]
+        scores = self.temperature_score.calculate(
+            pd.concat([self.data, duplicate], ignore_index=True)
+        )
+        aggregations = self.temperature_score.reaggregate_scores(scores, holdings)
+        self.assertEqual(
+            aggregations.dict(),
+            self.temperature_score.aggregate_scores(
+                self.temperature_score.calculate(data)
+            ).dict(),
+        )
+        self.assertAlmostEqual(aggregations.short.S1S2.all.score, 2.57, places=2)
+
+        temperature_score = TemperatureScore(
+            time_frames=list(ETimeFrames),
+            scopes=EScope.get_result_scopes(),
+            scenario=Scenario.from_dict({"number": 3}),
+        )
+        with self.assertRaises(ValueError):
+            temperature_score.reaggregate_scores(
+                temperature_score.calculate(self.data.copy()), holdings
+            )
+
+    def test_score_cube(self):
+        """
+        Test whether the slices of the score cube are the scores of the calculate method and whether aggregating the
+        cube gives the same scores as aggregating the scores of each scenario.
+
+        :return:
+        """
+        scenarios = [
+            None,
+            Scenario.from_dict({"number": 1}),
+            Scenario.from_dict({"number": 2}),
+        ]
+        # The cube is aggregated with a single weight per company
+        data = self.data.copy()
+        data[ColumnsConfig.INVESTMENT_VALUE] = data.groupby(ColumnsConfig.COMPANY_ID)[
+            ColumnsConfig.INVESTMENT_VALUE
+        ].transform("first")
+        cube = self.temperature_score.calculate_cube(scenarios, data.copy())
+        results = self.temperature_score.calculate_scenarios(scenarios, data.copy())
+        self.assertListEqual(cube.scenarios, list(results))
+        investment_values = data.groupby(ColumnsConfig.COMPANY_ID)[
+            ColumnsConfig.INVESTMENT_VALUE
+        ].first()
+        aggregated_scores = cube.aggregate(investment_values)
+        aggregated_results = cube.aggregate(investment_values, results=True)
+        for label, (scores, aggregations) in results.items():
+            for time_frame in self.temperature_score.time_frames:
+                for scope in self.temperature_score.scopes:
+                    expected = scores[
+                        (scores[ColumnsConfig.TIME_FRAME] == time_frame)
+                        & (scores[ColumnsConfig.SCOPE] == scope)
+                    ].set_index(ColumnsConfig.COMPANY_ID)[
+                        ColumnsConfig.TEMPERATURE_SCORE
+                    ]
+                    pd.testing.assert_series_equal(
+                        cube.get_scores(time_frame, scope, label),
+                        expected,
+                        check_names=False,
+                        check_index_type=False,
+                    )
+                    position = cube.get_position(time_frame, scope, label)
+                    aggregation = aggregations[time_frame.value][scope.name]
+                    self.assertAlmostEqual(
+                        aggregated_scores[position], aggregation.all.score
+                    )
+                    self.assertAlmostEqual(
+                        aggregated_results[position] * 100,
+                        aggregation.influence_percentage,
+                    )
+
+    def test_vectorized_kernel(self):
+        """
+        Test whether the vectorized mappings, reduction rates and scores are the same as the ones for a single target.
+
+        :return:
+        """
+        data = self.data.copy()
+        data[ColumnsConfig.TARGET_REFERENCE_NUMBER] = data[
+            ColumnsConfig.TARGET_REFERENCE_NUMBER
+        ].fillna(TemperatureScoreConfig.VALUE_TARGET_REFERENCE_ABSOLUTE)
+        # Mix validated, not validated and missing statuses
+        data[ColumnsConfig.SBTI_VALIDATED] = [True, False, None] * (len(data) // 3) + [
+            True
+        ] * (len(data) % 3)
+
+        data[ColumnsConfig.SR15] = self.temperature_score.get_target_mappings(data)
+        expected = data.apply(self.temperature_score.get_target_mapping, axis=1)
+        self.assertListEqual(
+            data[ColumnsConfig.SR15].fillna("").tolist(), expected.fillna("").tolist()
+        )
+
+        data[ColumnsConfig.ANNUAL_REDUCTION_RATE] = (
+            self.temperature_score.get_annual_reduction_rates(data)
+        )
+        pd.testing.assert_series_equal(
+            data[ColumnsConfig.ANNUAL_REDUCTION_RATE],
+            data.apply(self.temperature_score.get_annual_reduction_rate, axis=1),
+            check_names=False,
+        )
+
+        data = self.temperature_score._merge_regression(data)
+        scores, results = self.temperature_score.get_scores(data)
+        expected_scores, expected_results = zip(
+            *data.apply(self.temperature_score.get_score, axis=1)
+        )
+        self.assertListEqual(scores.tolist(), list(expected_scores))
+        self.assertListEqual(results.tolist(), list(expected_results))
+
+        target = data[ColumnsConfig.BASE_YEAR].notnull().idxmax()
+        data.loc[target, ColumnsConfig.END_YEAR] = data.loc[
+            target, ColumnsConfig.BASE_YEAR
+        ]
+        data.loc[target, ColumnsConfig.REDUCTION_AMBITION] = 0.5
+        with self.assertRaises(ValueError):
+            self.temperature_score.get_annual_reduction_rates(data)
+
+    def test_company_score(self):
+        """
+        Test whether the combined s1s2s3 scores are the same as the ones that are calculated row by row.
+
+        :return:
+        """
+        data = self.temperature_score._prepare_data(self.data)
+        company_data = (
+            data[
+                [
+                    ColumnsConfig.COMPANY_ID,
+                    ColumnsConfig.TIME_FRAME,
+                    ColumnsConfig.SCOPE,
+                    ColumnsConfig.GHG_SCOPE12,
+                    ColumnsConfig.GHG_SCOPE3,
+                    ColumnsConfig.TEMPERATURE_SCORE,
+                    TemperatureScoreConfig.TEMPERATURE_RESULTS,
+                ]
+            ]
+            .groupby(
+                [
+                    ColumnsConfig.COMPANY_ID,
+                    ColumnsConfig.TIME_FRAME,
+                    ColumnsConfig.SCOPE,
+                ]
+            )
+            .mean()
+        )
+        expected_scores, expected_results = zip(
+            *data.apply(
+                lambda row: self.temperature_score.get_ghc_temperature_score(
+                    row, company_data
+                ),
+                axis=1,
+            )
+        )
+
+        data = self.temperature_score._calculate_company_score(data)
+        self.assertListEqual(
+            data[ColumnsConfig.TEMPERATURE_SCORE].tolist(), list(expected_scores)
+        )
+        self.assertListEqual(
+            data[TemperatureScoreConfig.TEMPERATURE_RESULTS].tolist(),
+            list(expected_results),
+        )
+
 
 if __name__ == "__main__":
     test = TestTemperatureScore()
     test.setUp()
     test.test_temp_score()
     test.test_portfolio_aggregations()
+    test.test_aggregations_by_method()
+    test.test_aggregations_by_method_highest_contributors()
+    test.test_grouped_aggregations()
+    test.test_top_n_contributions()
+    test.test_highest_contributors_scenario()
+    test.test_calculate_scenarios()
+    test.test_sweep_aggregated_scores()
+    test.test_calculate_models()
+    test.test_regression_lookup()
+    test.test_encoded_grid()
+    test.test_anonymize_data_dump()
+    test.test_reaggregate_scores()
+    test.test_score_cube()
+    test.test_vectorized_kernel()
+    test.test_company_score()
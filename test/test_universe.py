@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from SBTi import utils
+from SBTi.configs import ColumnsConfig
+from SBTi.data.csv import CSVProvider
+from SBTi.interfaces import EScope, ETimeFrames, PortfolioCompany
+from SBTi.temperature_score import TemperatureScore
+from SBTi.universe import UniverseScores
+
+
+class TestUniverseScores(unittest.TestCase):
+    """
+    Test whether the portfolios of a scored universe get the same aggregations as when they're calculated one by one.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create the provider and the universe, in which every company has an investment value of 0.
+        """
+        self.path = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            "inputs",
+            "data_test_waterfall_a.csv",
+        )
+        self.data_provider = CSVProvider(
+            path=self.path, path_targets=self.path, encoding="iso-8859-1"
+        )
+        # The test file holds a row per target, a company should only have one row with its company data, otherwise its
+        # scores are duplicated
+        self.data_provider.data = self.data_provider.data.drop_duplicates(
+            ColumnsConfig.COMPANY_ID
+        )
+        self.universe = [
+            PortfolioCompany(
+                company_name=company[ColumnsConfig.COMPANY_NAME],
+                company_id=company[ColumnsConfig.COMPANY_ID],
+                company_isin=company[ColumnsConfig.COMPANY_ID],
+                investment_value=0.0,
+            )
+            for company in self.data_provider.data.to_dict(orient="records")
+        ]
+        self.portfolio = [
+            company.copy(update={"investment_value": 1000.0 * (index + 1)})
+            for index, company in enumerate(self.universe[::2])
+        ]
+
+    def create_temperature_score(self) -> TemperatureScore:
+        return TemperatureScore(
+            time_frames=list(ETimeFrames), scopes=EScope.get_result_scopes()
+        )
+
+    def test_aggregate(self) -> None:
+        """
+        Test whether the aggregations of a portfolio are the same as the ones that are calculated for the portfolio. The
+        aggregations are compared as JSON, because the scores of the companies without emissions are NaN.
+        """
+        universe = UniverseScores(
+            self.create_temperature_score(), [self.data_provider], self.universe
+        )
+        temperature_score = self.create_temperature_score()
+        expected = temperature_score.aggregate_scores(
+            temperature_score.calculate(
+                utils.get_data([self.data_provider], self.portfolio)
+            )
+        )
+        self.assertEqual(universe.aggregate(self.portfolio).json(), expected.json())
+        self.assertFalse(universe.refresh())
+
+    def test_version(self) -> None:
+        """
+        Test whether the scores are stored and only calculated again once the data changes.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "universe.pkl")
+            universe = UniverseScores(
+                self.create_temperature_score(),
+                [self.data_provider],
+                self.universe,
+                path,
+            )
+            self.assertTrue(universe.refresh())
+            self.assertTrue(os.path.isfile(path))
+
+            stored = UniverseScores(
+                self.create_temperature_score(),
+                [self.data_provider],
+                self.universe,
+                path,
+            )
+            self.assertFalse(stored.refresh())
+            pd.testing.assert_frame_equal(stored.get_scores(), universe.get_scores())
+
+            # The investment values of the universe aren't used, so they don't change the version
+            invested = UniverseScores(
+                self.create_temperature_score(),
+                [self.data_provider],
+                [
+                    company.copy(update={"investment_value": 1000.0})
+                    for company in self.universe
+                ],
+                path,
+            )
+            self.assertEqual(invested.get_version(), universe.get_version())
+
+            # The data version is a hash of the files, so a provider that reads a changed file has a new version
+            data = pd.read_csv(self.path, encoding="iso-8859-1")
+            data.loc[0, ColumnsConfig.GHG_SCOPE12] *= 2
+            changed_path = os.path.join(directory, "data.csv")
+            data.to_csv(changed_path, index=False, encoding="iso-8859-1")
+            data_provider = CSVProvider(
+                path=changed_path, path_targets=self.path, encoding="iso-8859-1"
+            )
+            changed = UniverseScores(
+                self.create_temperature_score(), [data_provider], self.universe, path
+            )
+            self.assertNotEqual(changed.get_version(), universe.get_version())
+            self.assertTrue(changed.refresh())
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    test = TestUniverseScores()
+    test.setUp()
+    test.test_aggregate()
+    test.test_version()